@@ -1,9 +1,16 @@
 from django.contrib import admin
 
-from .models import Client
+from .models import CityClientCounter, Client
 
 
 @admin.register(Client)
 class ClientAdmin(admin.ModelAdmin):
     list_display = ('passport_number', 'last_name', 'first_name', 'city')
     search_fields = ('passport_number', 'last_name', 'first_name', 'city')
+
+
+@admin.register(CityClientCounter)
+class CityClientCounterAdmin(admin.ModelAdmin):
+    list_display = ('display_name', 'city', 'client_count', 'updated_at')
+    search_fields = ('city', 'display_name')
+    readonly_fields = ('city', 'display_name', 'client_count', 'updated_at')
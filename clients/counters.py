@@ -0,0 +1,33 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min
+
+from .models import CityClientCounter, Client
+
+
+def adjust_city_counter(city: str, display_name: str, delta: int) -> None:
+    if not city:
+        return
+    updated = CityClientCounter.objects.filter(city=city).update(client_count=F('client_count') + delta)
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            CityClientCounter.objects.create(city=city, display_name=display_name.strip(), client_count=delta)
+    except IntegrityError:
+        CityClientCounter.objects.filter(city=city).update(client_count=F('client_count') + delta)
+
+
+@transaction.atomic
+def rebuild_city_counters() -> int:
+    rows = (
+        Client.objects.exclude(search_city='')
+        .order_by()
+        .values('search_city')
+        .annotate(client_count=Count('id'), display_name=Min('city'))
+    )
+    CityClientCounter.objects.all().delete()
+    counters = CityClientCounter.objects.bulk_create(
+        CityClientCounter(city=row['search_city'], display_name=row['display_name'].strip(), client_count=row['client_count'])
+        for row in rows
+    )
+    return len(counters)
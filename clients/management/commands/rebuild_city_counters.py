@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from clients.counters import rebuild_city_counters
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики клиентов по городам с нуля.'
+
+    def handle(self, *args, **options):
+        count = rebuild_city_counters()
+        self.stdout.write(self.style.SUCCESS(f'Пересчитано городов: {count}.'))
@@ -0,0 +1,86 @@
+# Generated by Django 5.1.1 on 2026-10-18 14:04
+
+from django.db import migrations, models
+
+TRIGRAM_COLUMNS = ['search_name', 'search_passport', 'search_city']
+
+
+# Копии clients.models.normalize_*: миграция не должна меняться вместе с кодом модели.
+def normalize_search_text(value: str) -> str:
+    return ' '.join(value.casefold().replace('ё', 'е').split())
+
+
+def normalize_passport(value: str) -> str:
+    return ''.join(normalize_search_text(value).split())
+
+
+def fill_search_fields(apps, schema_editor):
+    clients = apps.get_model('clients', 'Client').objects.using(schema_editor.connection.alias)
+    batch = []
+    for client in clients.iterator(chunk_size=2000):
+        client.search_name = normalize_search_text(
+            ' '.join(filter(None, [client.last_name, client.first_name, client.middle_name]))
+        )
+        client.search_passport = normalize_passport(client.passport_number)
+        client.search_city = normalize_search_text(client.city)
+        batch.append(client)
+        if len(batch) >= 2000:
+            clients.bulk_update(batch, ['search_name', 'search_passport', 'search_city'])
+            batch = []
+    clients.bulk_update(batch, ['search_name', 'search_passport', 'search_city'])
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS client_{column}_trgm ON clients_client USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS client_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='search_city',
+            field=models.CharField(blank=True, editable=False, max_length=128),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='search_name',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='search_passport',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['search_name'], name='client_search_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['search_passport'], name='client_search_passport_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['search_city'], name='client_search_city_idx'),
+        ),
+        migrations.RunPython(fill_search_fields, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-18 14:05
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def fill_city_counters(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Client = apps.get_model('clients', 'Client')
+    CityClientCounter = apps.get_model('clients', 'CityClientCounter')
+    rows = (
+        Client.objects.using(alias)
+        .exclude(search_city='')
+        .order_by()
+        .values('search_city')
+        .annotate(client_count=Count('id'), display_name=Min('city'))
+    )
+    CityClientCounter.objects.using(alias).bulk_create(
+        CityClientCounter(city=row['search_city'], display_name=row['display_name'].strip(), client_count=row['client_count'])
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_client_search_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CityClientCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city', models.CharField(max_length=128, unique=True)),
+                ('display_name', models.CharField(max_length=128)),
+                ('client_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Счётчик клиентов по городу',
+                'verbose_name_plural': 'Счётчики клиентов по городам',
+                'ordering': ['-client_count', 'city'],
+            },
+        ),
+        migrations.RunPython(fill_city_counters, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+
+
+def normalize_search_text(value: str) -> str:
+    return ' '.join(value.casefold().replace('ё', 'е').split())
+
+
+def normalize_passport(value: str) -> str:
+    return ''.join(normalize_search_text(value).split())
 
 
 class Client(models.Model):
@@ -10,6 +18,9 @@ class Client(models.Model):
     phone = models.CharField(max_length=32, blank=True)
     email = models.EmailField(blank=True)
     notes = models.TextField(blank=True)
+    search_name = models.CharField(max_length=200, blank=True, editable=False)
+    search_passport = models.CharField(max_length=32, blank=True, editable=False)
+    search_city = models.CharField(max_length=128, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -17,6 +28,11 @@ class Client(models.Model):
         ordering = ['last_name', 'first_name']
         verbose_name = 'Клиент'
         verbose_name_plural = 'Клиенты'
+        indexes = [
+            models.Index(fields=['search_name'], name='client_search_name_idx'),
+            models.Index(fields=['search_passport'], name='client_search_passport_idx'),
+            models.Index(fields=['search_city'], name='client_search_city_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.last_name} {self.first_name}'
@@ -24,3 +40,33 @@ class Client(models.Model):
     @property
     def full_name(self) -> str:
         return ' '.join(filter(None, [self.last_name, self.first_name, self.middle_name]))
+
+    def fill_search_fields(self) -> None:
+        self.search_name = normalize_search_text(self.full_name)
+        self.search_passport = normalize_passport(self.passport_number)
+        self.search_city = normalize_search_text(self.city)
+
+    def save(self, *args, **kwargs):
+        self.fill_search_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'search_name', 'search_passport', 'search_city'}
+        # Счётчики по городам правятся в post_save (clients.signals): запись клиента и счётчика — одна транзакция.
+        # Удаление атомарно и так: post_delete шлётся внутри транзакции Collector.delete.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class CityClientCounter(models.Model):
+    city = models.CharField(max_length=128, unique=True)
+    display_name = models.CharField(max_length=128)
+    client_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-client_count', 'city']
+        verbose_name = 'Счётчик клиентов по городу'
+        verbose_name_plural = 'Счётчики клиентов по городам'
+
+    def __str__(self) -> str:
+        return f'{self.display_name}: {self.client_count}'
@@ -0,0 +1,66 @@
+from datetime import date
+
+from django.db.models import F, FilteredRelation, Q, Value
+from django.db.models.functions import Coalesce
+
+from stays.models import Stay
+from .models import Client
+
+OVERLAPS_CACHE_NAMESPACE = 'clients:overlaps'
+OVERLAP_ORDERING = ('-other_check_in', 'other_stay')
+
+
+def overlapping_stays(client_ids, start: date, end: date):
+    """Пары (проживание клиента, чужое проживание) в одном номере с пересекающимися датами внутри периода."""
+    target_stays = Stay.objects.filter(client_id__in=client_ids).in_period(start, end)
+    return (
+        target_stays.annotate(
+            other=FilteredRelation(
+                'room__stays',
+                condition=(
+                    ~Q(room__stays__client_id=F('client_id'))
+                    & Q(room__stays__check_in__lte=end)
+                    & (Q(room__stays__check_out__isnull=True) | Q(room__stays__check_out__gte=start))
+                    & Q(room__stays__check_in__lt=Coalesce(F('check_out'), Value(date.max)))
+                    & (Q(room__stays__check_out__isnull=True) | Q(room__stays__check_out__gt=F('check_in')))
+                ),
+            ),
+        )
+        .filter(other__isnull=False)
+        .values(
+            'room_id',
+            'check_in',
+            'check_out',
+            source_client=F('client_id'),
+            stay=F('id'),
+            room_number=F('room__number'),
+            other_stay=F('other__id'),
+            other_check_in=F('other__check_in'),
+            other_check_out=F('other__check_out'),
+            other_client=F('other__client_id'),
+        )
+        .order_by(*OVERLAP_ORDERING)
+    )
+
+
+def overlap_rows(rows: list[dict]) -> list[dict]:
+    clients = Client.objects.in_bulk({row['other_client'] for row in rows})
+    return [_overlap_row(row, clients[row['other_client']]) for row in rows]
+
+
+def _overlap_row(row: dict, client: Client) -> dict:
+    ends = [value for value in (row['check_out'], row['other_check_out']) if value]
+    return {
+        'source_client': row['source_client'],
+        'client': {
+            'id': client.id,
+            'full_name': client.full_name,
+            'city': client.city,
+        },
+        'room': row['room_id'],
+        'room_number': row['room_number'],
+        'stay': row['stay'],
+        'other_stay': row['other_stay'],
+        'overlap_start': max(row['check_in'], row['other_check_in']),
+        'overlap_end': min(ends) if ends else None,
+    }
@@ -0,0 +1,49 @@
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from .models import Client, normalize_passport, normalize_search_text
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+# Верхняя граница диапазона для префиксного поиска по B-tree: search >= q AND search < q + PREFIX_END.
+PREFIX_END = '\U0010ffff'
+
+
+def _prefix(field: str, value: str) -> Q:
+    return Q(**{f'{field}__gte': value, f'{field}__lt': value + PREFIX_END})
+
+
+def search_clients(query: str, limit: int = SEARCH_DEFAULT_LIMIT):
+    text = normalize_search_text(query)
+    passport = normalize_passport(query)
+    if not text:
+        return Client.objects.none()
+
+    name_prefix = _prefix('search_name', text)
+    passport_prefix = _prefix('search_passport', passport)
+    city_prefix = _prefix('search_city', text)
+    if connection.vendor == 'postgresql':
+        # На PostgreSQL LIKE '%q%' обслуживают GIN-индексы pg_trgm, так что ищем и по подстроке.
+        condition = (
+            Q(search_name__contains=text)
+            | Q(search_passport__contains=passport)
+            | Q(search_city__contains=text)
+        )
+    else:
+        condition = name_prefix | passport_prefix | city_prefix
+
+    rank = Case(
+        When(search_passport=passport, then=Value(100)),
+        When(search_name=text, then=Value(90)),
+        When(passport_prefix, then=Value(70)),
+        When(name_prefix, then=Value(60)),
+        When(search_city=text, then=Value(40)),
+        When(city_prefix, then=Value(30)),
+        default=Value(10),
+        output_field=IntegerField(),
+    )
+    return (
+        Client.objects.filter(condition)
+        .annotate(search_rank=rank)
+        .order_by('-search_rank', 'search_name', 'id')[:limit]
+    )
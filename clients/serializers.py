@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from common.values import ValuesSerializer
 from .models import Client
 
 
@@ -21,3 +22,22 @@ class ClientSerializer(serializers.ModelSerializer):
             'full_name',
         ]
 
+
+class ClientValuesSerializer(ValuesSerializer):
+    model = Client
+    fields = (
+        'id',
+        'passport_number',
+        'last_name',
+        'first_name',
+        'middle_name',
+        'city',
+        'phone',
+        'email',
+        'notes',
+        'full_name',
+    )
+
+    @staticmethod
+    def get_full_name(row: dict) -> str:
+        return ' '.join(filter(None, [row['last_name'], row['first_name'], row['middle_name']]))
@@ -0,0 +1,53 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from common.cache import bump_namespace
+from common.response_cache import CLIENTS_RESPONSES, invalidate_responses_on_commit
+from stays.models import Stay
+from stays.signals import stays_bulk_changed
+from .counters import adjust_city_counter
+from .models import Client
+from .overlaps import OVERLAPS_CACHE_NAMESPACE
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+@receiver(post_save, sender=Stay)
+@receiver(post_delete, sender=Stay)
+@receiver(stays_bulk_changed, sender=Stay)
+def reset_overlaps_cache(sender, **kwargs):
+    transaction.on_commit(partial(bump_namespace, OVERLAPS_CACHE_NAMESPACE))
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+def reset_client_responses(sender, **kwargs):
+    invalidate_responses_on_commit(CLIENTS_RESPONSES)
+
+
+@receiver(pre_save, sender=Client)
+def remember_previous_city(sender, instance, **kwargs):
+    instance._previous_city = None
+    if instance.pk:
+        # Блокировка строки до конца транзакции Client.save: параллельная смена города не прочтёт тот же старый город.
+        instance._previous_city = (
+            Client.objects.select_for_update().filter(pk=instance.pk).values_list('search_city', 'city').first()
+        )
+
+
+@receiver(post_save, sender=Client)
+def update_city_counters(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_city', None)
+    if previous and previous[0] == instance.search_city:
+        return
+    if previous:
+        adjust_city_counter(previous[0], previous[1], -1)
+    adjust_city_counter(instance.search_city, instance.city, 1)
+
+
+@receiver(post_delete, sender=Client)
+def release_city_counter(sender, instance, **kwargs):
+    adjust_city_counter(instance.search_city, instance.city, -1)
@@ -1,3 +1,47 @@
+from unittest import mock
+
+from django.db import DatabaseError
 from django.test import TestCase
 
-# Create your tests here.
+from common.testing import ResponseCacheTestMixin
+from .models import CityClientCounter, Client
+
+
+class ClientResponseInvalidationTests(ResponseCacheTestMixin, TestCase):
+    url = '/api/clients/?limit=10'
+
+    def setUp(self):
+        super().setUp()
+        self.guest = Client.objects.create(passport_number='P1', last_name='Иванов', first_name='Иван', city='Тверь')
+
+    def test_client_save(self):
+        def change():
+            self.guest.city = 'Москва'
+            self.guest.save()
+
+        self.assertInvalidatedBy(change, self.url)
+
+    def test_client_delete(self):
+        self.assertInvalidatedBy(self.guest.delete, self.url)
+
+
+class CityCounterAtomicityTests(TestCase):
+    def setUp(self):
+        self.guest = Client.objects.create(passport_number='P1', last_name='Иванов', first_name='Иван', city='Тверь')
+
+    def counters(self):
+        return dict(CityClientCounter.objects.values_list('city', 'client_count'))
+
+    def test_failed_counter_update_rolls_back_client(self):
+        self.guest.city = 'Москва'
+        with mock.patch('clients.signals.adjust_city_counter', side_effect=DatabaseError), \
+                self.assertRaises(DatabaseError):
+            self.guest.save()
+        self.guest.refresh_from_db()
+        self.assertEqual(self.guest.city, 'Тверь')
+        self.assertEqual(self.counters(), {'тверь': 1})
+
+    def test_city_change_moves_counter(self):
+        response = self.client.patch(f'/api/clients/{self.guest.pk}/', {'city': 'Москва'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counters(), {'тверь': 0, 'москва': 1})
@@ -1,9 +1,13 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import ClientViewSet
+from .views import AsyncClientReadView, ClientViewSet
 
 router = DefaultRouter()
 router.register(r'clients', ClientViewSet, basename='client')
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path('async/clients/', AsyncClientReadView.as_view(), name='client-list-async'),
+    path('async/clients/<int:pk>/', AsyncClientReadView.as_view(), name='client-detail-async'),
+]
 
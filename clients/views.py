@@ -1,29 +1,103 @@
-from django.db.models import Count, Q
+from django.conf import settings
+from django.db.models import Count, Min
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from common.cache import cached_in_namespace
+from common.aio import AsyncReadView
+from common.conditional import ConditionalGetMixin
+from common.exports import EXPORT_CHUNK_SIZE, parse_export_format, streaming_export
+from common.response_cache import CLIENTS_RESPONSES, CachedReadMixin
 from common.utils import ensure_period
+from common.values import ValuesReadMixin
 from stays.models import Stay
 from stays.serializers import StaySerializer
-from .models import Client
-from .serializers import ClientSerializer
+from .models import CityClientCounter, Client, normalize_search_text
+from .overlaps import OVERLAP_ORDERING, OVERLAPS_CACHE_NAMESPACE, overlap_rows, overlapping_stays
+from .search import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT, search_clients
+from .serializers import ClientSerializer, ClientValuesSerializer
 
+OVERLAPS_MAX_CLIENTS = 500
 
-class ClientViewSet(viewsets.ModelViewSet):
+
+class ClientViewSet(CachedReadMixin, ConditionalGetMixin, ValuesReadMixin, viewsets.ModelViewSet):
     queryset = Client.objects.all()
     serializer_class = ClientSerializer
+    values_serializer_class = ClientValuesSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['city']
+    pagination_ordering = ['last_name', 'first_name', 'id']
+    response_cache_namespaces = (CLIENTS_RESPONSES,)
+
+    EXPORT_FIELDS = ['id', 'passport_number', 'last_name', 'first_name', 'middle_name', 'city', 'phone', 'email', 'notes']
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        try:
+            export_format = parse_export_format(request.query_params.get('export_format'))
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .order_by(*self.pagination_ordering)
+            .values_list(*self.EXPORT_FIELDS)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        return streaming_export(self.EXPORT_FIELDS, rows, export_format, 'clients')
+
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'detail': 'Необходимо указать параметр q.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', SEARCH_DEFAULT_LIMIT)), SEARCH_MAX_LIMIT)
+        except ValueError:
+            return Response({'detail': 'limit должен быть числом.'}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = ClientSerializer(search_clients(query, max(limit, 1)), many=True)
+        return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='count-by-city')
     def count_by_city(self, request):
         city = request.query_params.get('city')
         if not city:
             return Response({'detail': 'Необходимо указать параметр city.'}, status=status.HTTP_400_BAD_REQUEST)
-        count = Client.objects.filter(city__iexact=city).count()
-        return Response({'city': city, 'count': count})
+        count = (
+            CityClientCounter.objects.filter(city=normalize_search_text(city))
+            .values_list('client_count', flat=True)
+            .first()
+        )
+        return Response({'city': city, 'count': count or 0})
+
+    @action(detail=False, methods=['get'], url_path='by-city')
+    def by_city(self, request):
+        start = request.query_params.get('start')
+        end = request.query_params.get('end')
+        if not start and not end:
+            counters = CityClientCounter.objects.filter(client_count__gt=0).values_list('display_name', 'city', 'client_count')
+            return Response([
+                {'city': display_name, 'normalized': city, 'count': count}
+                for display_name, city, count in counters
+            ])
+        try:
+            start_date, end_date = ensure_period(start, end)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        guests = Stay.objects.in_period(start_date, end_date)
+        rows = (
+            Client.objects.filter(id__in=guests.values('client_id'))
+            .order_by()
+            .values('search_city')
+            .annotate(count=Count('id'), city=Min('city'))
+            .order_by('-count', 'search_city')
+        )
+        return Response([
+            {'city': row['city'], 'normalized': row['search_city'], 'count': row['count']}
+            for row in rows
+        ])
 
     @action(detail=True, methods=['get'])
     def stays(self, request, pk=None):
@@ -34,26 +108,39 @@ class ClientViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='overlaps')
     def overlapping_clients(self, request, pk=None):
         client = self.get_object()
-        start = request.query_params.get('start')
-        end = request.query_params.get('end')
+        return self._overlaps_response(request, [client.id])
+
+    @action(detail=False, methods=['get'], url_path='overlaps')
+    def batch_overlapping_clients(self, request):
+        raw_ids = request.query_params.get('client_ids', '')
         try:
-            start_date, end_date = ensure_period(start, end)
+            client_ids = sorted({int(value) for value in raw_ids.split(',') if value.strip()})
+        except ValueError:
+            return Response({'detail': 'client_ids должен быть списком чисел через запятую.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not client_ids:
+            return Response({'detail': 'Необходимо указать параметр client_ids.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(client_ids) > OVERLAPS_MAX_CLIENTS:
+            return Response(
+                {'detail': f'Не больше {OVERLAPS_MAX_CLIENTS} клиентов за запрос.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return self._overlaps_response(request, client_ids)
+
+    def _overlaps_response(self, request, client_ids):
+        try:
+            start_date, end_date = ensure_period(request.query_params.get('start'), request.query_params.get('end'))
         except ValueError as exc:
             return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        target_stays = client.stays.filter(
-            Q(check_out__isnull=True) | Q(check_out__gte=start_date)
-        ).filter(check_in__lte=end_date)
+        def build():
+            self.pagination_ordering = OVERLAP_ORDERING
+            page = self.paginate_queryset(overlapping_stays(client_ids, start_date, end_date))
+            return self.get_paginated_response(overlap_rows(page)).data
 
-        if not target_stays.exists():
-            return Response([], status=status.HTTP_200_OK)
+        cache_parts = (tuple(client_ids), start_date, end_date, sorted(request.query_params.items()))
+        data = cached_in_namespace(OVERLAPS_CACHE_NAMESPACE, cache_parts, build, settings.CLIENT_OVERLAPS_CACHE_TTL)
+        return Response(data)
 
-        overlapping_clients = Client.objects.filter(
-            stays__room__in=target_stays.values('room_id'),
-            stays__check_in__lte=end_date,
-        ).filter(
-            Q(stays__check_out__isnull=True) | Q(stays__check_out__gte=start_date)
-        ).exclude(id=client.id).distinct()
 
-        serializer = ClientSerializer(overlapping_clients, many=True)
-        return Response(serializer.data)
+class AsyncClientReadView(AsyncReadView):
+    viewset_class = ClientViewSet
@@ -0,0 +1,111 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from config.instrumentation import attach_query_recorder
+from .conditional import aconditional_response, aqueryset_fingerprint
+
+json_renderer = JSONRenderer()
+
+
+def json_response(data, status: int = 200) -> HttpResponse:
+    # Тот же рендерер, что у DRF: decimal, даты и кириллица выглядят так же, как в синхронных ответах.
+    return HttpResponse(json_renderer.render(data), content_type='application/json', status=status)
+
+
+def _in_own_connection(func):
+    def run():
+        try:
+            with attach_query_recorder():
+                return func()
+        finally:
+            connections.close_all()
+
+    return run
+
+
+async def gather_isolated(*funcs) -> list:
+    """Выполняет независимые синхронные запросы параллельно: каждый в своём потоке и со своим подключением.
+
+    Обычный async ORM (thread_sensitive) выполняет запросы одного HTTP-запроса по очереди в одном потоке.
+    Данные, не зафиксированные в текущей транзакции, из рабочих потоков не видны.
+    """
+    return await asyncio.gather(*(sync_to_async(_in_own_connection(func), thread_sensitive=False)() for func in funcs))
+
+
+class AsyncReadView(View):
+    """Async-вариант list/retrieve поверх настроек ViewSet: фильтры, пагинация, ETag и ValuesSerializer те же.
+
+    ORM вызывается через async API Django (aaggregate, async for); пагинаторы DRF синхронные и
+    выполняются через sync_to_async.
+    """
+
+    viewset_class = None
+    http_method_names = ['get', 'head', 'options']
+
+    def _viewset(self, request, kwargs: dict):
+        return self.viewset_class(
+            request=Request(request),
+            args=(),
+            kwargs=kwargs,
+            format_kwarg=None,
+            action='retrieve' if kwargs else 'list',
+        )
+
+    async def get(self, request, **kwargs):
+        viewset = self._viewset(request, kwargs)
+        try:
+            queryset = await sync_to_async(viewset.filter_queryset)(viewset.get_queryset())
+            if kwargs:
+                return await self._retrieve(request, viewset, queryset, kwargs)
+            return await self._list(request, viewset, queryset)
+        except Exception as exc:
+            return self._error_response(viewset, exc)
+
+    @staticmethod
+    def _error_response(viewset, exc):
+        # Тот же обработчик исключений, что у синхронного ViewSet: тело {'detail': ...} и заголовки совпадают.
+        response = viewset.get_exception_handler()(exc, viewset.get_exception_handler_context())
+        if response is None:
+            raise exc
+        result = json_response(response.data, status=response.status_code)
+        for header, value in response.items():
+            if header != 'Content-Type':
+                result[header] = value
+        return result
+
+    async def _validators(self, viewset, queryset) -> list:
+        return [await aqueryset_fingerprint(item) for item in viewset.get_etag_querysets(queryset)]
+
+    async def _list(self, request, viewset, queryset):
+        serializer = viewset.get_values_serializer()
+        values = viewset.get_values_queryset(serializer, queryset)
+
+        def render_page():
+            page = viewset.paginate_queryset(values)
+            if page is None:
+                return serializer.serialize(values)
+            return viewset.get_paginated_response(serializer.serialize(page)).data
+
+        async def build():
+            return json_response(await sync_to_async(render_page)())
+
+        return await aconditional_response(request, await self._validators(viewset, queryset), build)
+
+    async def _retrieve(self, request, viewset, queryset, kwargs: dict):
+        serializer = viewset.get_values_serializer()
+        lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+        selected = queryset.filter(**{viewset.lookup_field: kwargs[lookup_url_kwarg]})
+
+        async def build():
+            rows = [row async for row in viewset.get_values_queryset(serializer, selected)[:1]]
+            if not rows:
+                raise Http404(f'No {serializer.model._meta.object_name} matches the given query.')
+            return json_response(serializer.serialize(rows)[0])
+
+        return await aconditional_response(request, await self._validators(viewset, selected), build)
@@ -0,0 +1,36 @@
+import hashlib
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+
+
+def _version_key(namespace: str) -> str:
+    return f'cache-version:{namespace}'
+
+
+def namespace_version(namespace: str, alias: str = DEFAULT_CACHE_ALIAS) -> int:
+    return caches[alias].get_or_set(_version_key(namespace), 1, timeout=None)
+
+
+def bump_namespace(namespace: str, alias: str = DEFAULT_CACHE_ALIAS) -> None:
+    cache = caches[alias]
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), 2, timeout=None)
+
+
+def versioned_key(namespace: str, *parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+    return f'{namespace}:{namespace_version(namespace)}:{digest}'
+
+
+def cached_in_namespace(namespace: str, parts: tuple, builder, timeout: int):
+    if not timeout:
+        return builder()
+    cache = caches[DEFAULT_CACHE_ALIAS]
+    key = versioned_key(namespace, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, timeout)
+    return value
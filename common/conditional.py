@@ -0,0 +1,98 @@
+import hashlib
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def _fingerprint_query(queryset):
+    field_names = {field.name for field in queryset.model._meta.concrete_fields}
+    marker = 'updated_at' if 'updated_at' in field_names else 'pk'
+    return queryset.order_by(), {'last': Max(marker), 'count': Count('pk')}
+
+
+def _fingerprint(result: dict) -> tuple[None, str]:
+    last = result['last']
+    if isinstance(last, datetime):
+        last = last.isoformat()
+    # Last-Modified по max(updated_at) не меняется при удалении строки: у выборок валидатор только ETag.
+    return None, f'{last}:{result["count"]}'
+
+
+def queryset_fingerprint(queryset) -> tuple[None, str]:
+    """Дешёвый валидатор выборки: max(updated_at) и число строк (без updated_at — max(pk)), без Last-Modified."""
+    queryset, aggregates = _fingerprint_query(queryset)
+    return _fingerprint(queryset.aggregate(**aggregates))
+
+
+async def aqueryset_fingerprint(queryset) -> tuple[None, str]:
+    queryset, aggregates = _fingerprint_query(queryset)
+    return _fingerprint(await queryset.aaggregate(**aggregates))
+
+
+def _validator_headers(request, validators) -> tuple[str, int | None]:
+    tokens = [request.get_full_path(), getattr(request, 'accepted_media_type', '') or '']
+    modified = [last for last, _ in validators if last is not None]
+    tokens.extend(token for _, token in validators)
+    etag = quote_etag(hashlib.md5('|'.join(tokens).encode(), usedforsecurity=False).hexdigest())
+    return etag, int(max(modified).timestamp()) if modified else None
+
+
+def _with_validators(response, etag: str, last_modified: int | None):
+    if response.status_code == 200:
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+    # Ответ всегда перепроверяется: без no-cache браузер мог бы эвристически кешировать по Last-Modified.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_response(request, validators, build):
+    """Отдаёт 304 при совпадении If-None-Match/If-Modified-Since, иначе строит ответ и ставит валидаторы.
+
+    validators — пары (last_modified | None, токен); ETag учитывает путь с параметрами и формат ответа.
+    """
+    etag, last_modified = _validator_headers(request, validators)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = build()
+    return _with_validators(response, etag, last_modified)
+
+
+async def aconditional_response(request, validators, abuild):
+    etag, last_modified = _validator_headers(request, validators)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = await abuild()
+    return _with_validators(response, etag, last_modified)
+
+
+class ConditionalGetMixin:
+    """ETag для list и retrieve: неизменившийся ответ стоит одного агрегирующего запроса."""
+
+    def get_etag_querysets(self, queryset) -> list:
+        return [queryset]
+
+    def _validators(self, queryset) -> list:
+        return [queryset_fingerprint(item) for item in self.get_etag_querysets(queryset)]
+
+    def list(self, request, *args, **kwargs):
+        validators = self._validators(self.filter_queryset(self.get_queryset()))
+        return conditional_response(
+            request, validators, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            validators = self._validators(queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]}))
+        except (TypeError, ValueError, ValidationError):
+            # Некорректный идентификатор: обычный retrieve ответит 404.
+            return super().retrieve(request, *args, **kwargs)
+        return conditional_response(
+            request, validators, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
@@ -0,0 +1,52 @@
+import csv
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+EXPORT_CHUNK_SIZE = 2000
+LINES_PER_WRITE = 500
+
+
+def parse_export_format(value: str | None) -> str:
+    export_format = (value or 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError('Параметр export_format должен быть csv или ndjson.')
+    return export_format
+
+
+class _Echo:
+    def write(self, value: str) -> str:
+        return value
+
+
+def _batched(rows: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _csv_chunks(header: Sequence[str], rows: Iterable[Sequence]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    # BOM, чтобы Excel правильно открывал кириллицу.
+    yield '\ufeff' + writer.writerow(header)
+    for batch in _batched(rows, LINES_PER_WRITE):
+        yield ''.join(writer.writerow(row) for row in batch)
+
+
+def _ndjson_chunks(header: Sequence[str], rows: Iterable[Sequence]) -> Iterator[str]:
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for batch in _batched(rows, LINES_PER_WRITE):
+        yield ''.join(encoder.encode(dict(zip(header, row))) + '\n' for row in batch)
+
+
+def streaming_export(header: Sequence[str], rows: Iterable[Sequence], export_format: str, filename: str) -> StreamingHttpResponse:
+    chunks = _csv_chunks(header, rows) if export_format == 'csv' else _ndjson_chunks(header, rows)
+    response = StreamingHttpResponse(chunks, content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
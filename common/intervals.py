@@ -0,0 +1,20 @@
+from collections.abc import Iterable
+from datetime import date
+
+
+def peak_concurrency(intervals: Iterable[tuple[date, date | None]], start: date, end: date) -> int:
+    """Максимальное число одновременно открытых интервалов [check_in, check_out) внутри [start, end)."""
+    events = []
+    for check_in, check_out in intervals:
+        left = max(check_in, start)
+        right = min(check_out or date.max, end)
+        if left < right:
+            events.append((left, 1))
+            events.append((right, -1))
+    # Выезд и заезд в один день не пересекаются: -1 сортируется раньше +1.
+    events.sort()
+    current = peak = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
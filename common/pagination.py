@@ -0,0 +1,64 @@
+from django.conf import settings
+from rest_framework.pagination import BasePagination, CursorPagination, LimitOffsetPagination
+
+
+def get_view_ordering(view, queryset) -> tuple[str, ...]:
+    ordering = getattr(view, 'pagination_ordering', None)
+    if ordering:
+        return tuple(ordering)
+    return (*queryset.model._meta.ordering, 'pk')
+
+
+class KeysetPagination(CursorPagination):
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        return get_view_ordering(view, queryset)
+
+
+class OffsetPagination(LimitOffsetPagination):
+    default_limit = settings.API_PAGE_SIZE
+    max_limit = settings.API_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = queryset.order_by(*get_view_ordering(view, queryset))
+        return super().paginate_queryset(queryset, request, view)
+
+
+class HotelPagination(BasePagination):
+    """Курсорная (keyset) пагинация по умолчанию; ?limit=/&offset= включает постраничный режим для админки."""
+
+    offset_query_params = (LimitOffsetPagination.limit_query_param, LimitOffsetPagination.offset_query_param)
+
+    def __init__(self):
+        self.keyset = KeysetPagination()
+        self.offset = OffsetPagination()
+        self.paginator = self.keyset
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if any(param in request.query_params for param in self.offset_query_params):
+            self.paginator = self.offset
+        else:
+            self.paginator = self.keyset
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *self.keyset.get_schema_operation_parameters(view),
+            *self.offset.get_schema_operation_parameters(view),
+        ]
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
+
+    def to_html(self):
+        return self.paginator.to_html()
@@ -0,0 +1,170 @@
+import hashlib
+import threading
+from collections import defaultdict
+from functools import partial, wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+from config.db_routing import built_from_replica, replica_reads_allowed
+from .cache import bump_namespace, namespace_version
+
+RESPONSE_CACHE_ALIAS = 'responses'
+
+# Пространства имён кеша ответов. Эндпоинт перечисляет, от каких данных зависит его ответ,
+# сигналы моделей сбрасывают только свои пространства.
+ROOMS_RESPONSES = 'responses:rooms'
+CLIENTS_RESPONSES = 'responses:clients'
+STAYS_RESPONSES = 'responses:stays'
+EMPLOYEES_RESPONSES = 'responses:employees'
+REPORTS_RESPONSES = 'responses:reports'
+
+# Заголовки, которые выставляет само представление (DRF, ETag из ConditionalGetMixin); остальные добавит middleware.
+CACHED_HEADERS = ('Content-Type', 'Content-Disposition', 'ETag', 'Last-Modified', 'Cache-Control')
+
+
+class ResponseCacheStats:
+    """Попадания и промахи кеша ответов по маршрутам, в памяти процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    def record(self, route: str, hit: bool) -> None:
+        with self.lock:
+            self.counters[route]['hits' if hit else 'misses'] += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            counters = {route: dict(values) for route, values in self.counters.items()}
+        for values in counters.values():
+            total = values['hits'] + values['misses']
+            values['hit_ratio'] = round(values['hits'] / total, 3) if total else 0
+        return dict(sorted(counters.items()))
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counters.clear()
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+def invalidate_responses(*namespaces: str) -> None:
+    for namespace in namespaces:
+        bump_namespace(namespace, RESPONSE_CACHE_ALIAS)
+
+
+def invalidate_responses_on_commit(*namespaces: str) -> None:
+    transaction.on_commit(partial(invalidate_responses, *namespaces))
+
+
+def response_cache_key(request, namespaces) -> str:
+    """Ключ: схема, хост, путь, параметры запроса без учёта порядка, формат ответа и текущие версии пространств имён.
+
+    Схема и хост входят в ключ, потому что next/previous в списках — абсолютные ссылки. Запросы, закреплённые
+    за основной БД, не получают ответы, собранные с реплики: у них свои ключи.
+    """
+    query = sorted((name, sorted(values)) for name, values in request.GET.lists())
+    versions = [namespace_version(namespace, RESPONSE_CACHE_ALIAS) for namespace in namespaces]
+    media_type = getattr(request, 'accepted_media_type', '') or ''
+    parts = (request.scheme, request.get_host(), request.path, query, media_type, versions, replica_reads_allowed())
+    return f'response:{hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()}'
+
+
+def _route_name(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match and match.view_name else request.path
+
+
+def _renders_html(request) -> bool:
+    renderer = getattr(request, 'accepted_renderer', None)
+    media_type = getattr(request, 'accepted_media_type', '') or ''
+    return getattr(renderer, 'format', None) == 'api' or media_type.startswith('text/html')
+
+
+def _replay(request, entry: dict):
+    response = HttpResponse(entry['content'], status=entry['status'])
+    for header, value in entry['headers'].items():
+        response[header] = value
+    response['X-Response-Cache'] = 'hit'
+    last_modified = parse_http_date_safe(response['Last-Modified']) if response.has_header('Last-Modified') else None
+    return get_conditional_response(
+        request, etag=response.get('ETag'), last_modified=last_modified, response=response,
+    )
+
+
+def cached_response(request, namespaces, build):
+    """Отдаёт сохранённый ответ без обращения к ORM и сериализаторам, иначе строит и сохраняет его.
+
+    Кешируются только GET/HEAD с кодом 200; 304 по If-None-Match считается по сохранённому ETag.
+    HTML browsable API не кешируется: в странице CSRF-токен конкретного посетителя.
+    """
+    timeout = settings.RESPONSE_CACHE_TTL
+    if not timeout or request.method not in ('GET', 'HEAD') or _renders_html(request):
+        return build()
+    key = response_cache_key(request, namespaces)
+    backend = caches[RESPONSE_CACHE_ALIAS]
+    entry = backend.get(key)
+    route = _route_name(request)
+    response_cache_stats.record(route, hit=entry is not None)
+    if entry is not None:
+        return _replay(request, entry)
+
+    response = build()
+    if response.status_code != 200 or response.streaming:
+        return response
+    response['X-Response-Cache'] = 'miss'
+
+    def store(rendered):
+        entry = {
+            'content': rendered.content,
+            'status': rendered.status_code,
+            'headers': {header: rendered[header] for header in CACHED_HEADERS if rendered.has_header(header)},
+        }
+        backend.set(key, entry, min(timeout, settings.RESPONSE_CACHE_REPLICA_TTL) if built_from_replica() else timeout)
+
+    if isinstance(response, SimpleTemplateResponse) and not response.is_rendered:
+        # Ответ DRF рендерится после выхода из представления: сохраняем уже готовые байты.
+        response.add_post_render_callback(store)
+    else:
+        store(response)
+    return response
+
+
+def cache_response(*namespaces: str):
+    """Декоратор метода представления (action, APIView.get): ответ кешируется до сброса namespaces."""
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            return cached_response(request, namespaces, lambda: method(view, request, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+class CachedReadMixin:
+    """Кеш ответов list/retrieve; от каких данных зависит ответ, задаёт response_cache_namespaces."""
+
+    response_cache_namespaces: tuple[str, ...] = ()
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            self.response_cache_namespaces,
+            lambda: super(CachedReadMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            self.response_cache_namespaces,
+            lambda: super(CachedReadMixin, self).retrieve(request, *args, **kwargs),
+        )
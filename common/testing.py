@@ -0,0 +1,30 @@
+from django.core.cache import caches
+
+from .response_cache import RESPONSE_CACHE_ALIAS
+
+
+class ResponseCacheTestMixin:
+    """Проверки сброса кеша ответов: ответ закеширован, после изменения (и коммита) строится заново."""
+
+    def setUp(self):
+        super().setUp()
+        caches[RESPONSE_CACHE_ALIAS].clear()
+
+    def assertCached(self, *urls: str):
+        for url in urls:
+            self.client.get(url)
+            self.assertEqual(self.client.get(url)['X-Response-Cache'], 'hit', url)
+
+    def assertInvalidatedBy(self, change, *urls: str):
+        self.assertCached(*urls)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        for url in urls:
+            self.assertEqual(self.client.get(url)['X-Response-Cache'], 'miss', url)
+
+    def assertNotInvalidatedBy(self, change, *urls: str):
+        self.assertCached(*urls)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        for url in urls:
+            self.assertEqual(self.client.get(url)['X-Response-Cache'], 'hit', url)
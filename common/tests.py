@@ -0,0 +1,45 @@
+from datetime import date
+
+from django.test import SimpleTestCase
+
+from .intervals import peak_concurrency
+
+
+class PeakConcurrencyTests(SimpleTestCase):
+    start = date(2024, 1, 1)
+    end = date(2024, 2, 1)
+
+    def peak(self, *intervals):
+        return peak_concurrency(intervals, self.start, self.end)
+
+    def test_empty(self):
+        self.assertEqual(self.peak(), 0)
+
+    def test_back_to_back_on_same_day_do_not_overlap(self):
+        self.assertEqual(self.peak((date(2024, 1, 5), date(2024, 1, 10)), (date(2024, 1, 10), date(2024, 1, 12))), 1)
+
+    def test_overlap_by_one_night(self):
+        self.assertEqual(self.peak((date(2024, 1, 5), date(2024, 1, 11)), (date(2024, 1, 10), date(2024, 1, 12))), 2)
+
+    def test_open_interval_runs_to_the_end(self):
+        self.assertEqual(self.peak((date(2023, 12, 1), None), (date(2024, 1, 31), date(2024, 2, 3))), 2)
+
+    def test_open_interval_meets_later_check_in(self):
+        self.assertEqual(self.peak((date(2024, 1, 20), None), (date(2024, 1, 25), date(2024, 1, 26))), 2)
+
+    def test_peak_not_total(self):
+        # Три проживания, но одновременно не больше двух.
+        intervals = (
+            (date(2024, 1, 1), date(2024, 1, 5)),
+            (date(2024, 1, 3), date(2024, 1, 8)),
+            (date(2024, 1, 6), date(2024, 1, 9)),
+        )
+        self.assertEqual(self.peak(*intervals), 2)
+
+    def test_intervals_outside_window_are_ignored(self):
+        intervals = ((date(2023, 12, 1), date(2024, 1, 1)), (date(2024, 2, 1), date(2024, 2, 5)))
+        self.assertEqual(self.peak(*intervals), 0)
+
+    def test_unsorted_input(self):
+        intervals = ((date(2024, 1, 10), date(2024, 1, 12)), (date(2024, 1, 1), date(2024, 1, 11)))
+        self.assertEqual(self.peak(*intervals), 2)
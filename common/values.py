@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.http import Http404
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def _decimal_formatter(field: models.DecimalField):
+    exponent = Decimal(1).scaleb(-field.decimal_places)
+    if not api_settings.COERCE_DECIMAL_TO_STRING:
+        return lambda value: None if value is None else value.quantize(exponent)
+    return lambda value: None if value is None else f'{value.quantize(exponent):f}'
+
+
+def _date_formatter(value):
+    return None if value is None else value.isoformat()
+
+
+class ValuesSerializer:
+    """Read-only сериализация строк ``.values()`` с той же формой JSON, что у ModelSerializer.
+
+    ``fields`` — ключи ответа в нужном порядке; ``sources`` — lookup для ``.values()``, если он не совпадает
+    с ключом. Для вычисляемых ключей объявляется ``get_<ключ>(row)``, а нужные им колонки — в ``extra_values``.
+    Форматирование decimal/date выбирается по полям модели один раз, при создании сериализатора.
+    """
+
+    model: type[models.Model]
+    fields: tuple[str, ...] = ()
+    sources: dict[str, str] = {}
+    extra_values: tuple[str, ...] = ()
+
+    def __init__(self):
+        self._plan = []
+        lookups = []
+        for name in self.fields:
+            getter = getattr(self, f'get_{name}', None)
+            if getter is not None:
+                self._plan.append((name, None, getter))
+                continue
+            source = self.sources.get(name, name)
+            lookups.append(source)
+            self._plan.append((name, source, self._formatter_for(source)))
+        self._lookups = tuple(dict.fromkeys([*lookups, *self.extra_values]))
+
+    def _formatter_for(self, source: str):
+        try:
+            field = self.model._meta.get_field(source)
+        except Exception:
+            return None
+        if isinstance(field, models.DecimalField):
+            return _decimal_formatter(field)
+        if isinstance(field, models.DateField) and not isinstance(field, models.DateTimeField):
+            return _date_formatter
+        return None
+
+    def value_fields(self, *extra: str) -> tuple[str, ...]:
+        return tuple(dict.fromkeys([*self._lookups, *extra]))
+
+    def prepare(self, rows: list[dict]) -> None:
+        """Точка расширения для пакетной подгрузки вложенных данных (одним запросом на страницу)."""
+
+    def serialize(self, rows) -> list[dict]:
+        rows = list(rows)
+        self.prepare(rows)
+        plan = self._plan
+        return [
+            {
+                name: (getter(row) if source is None else getter(row[source])) if getter else row[source]
+                for name, source, getter in plan
+            }
+            for row in rows
+        ]
+
+
+class ValuesReadMixin:
+    """list/retrieve через ValuesSerializer: без экземпляров моделей и полей ModelSerializer."""
+
+    values_serializer_class: type[ValuesSerializer]
+
+    def get_values_serializer(self) -> ValuesSerializer:
+        return self.values_serializer_class()
+
+    def get_values_queryset(self, serializer: ValuesSerializer, queryset=None):
+        if queryset is None:
+            queryset = self.filter_queryset(self.get_queryset())
+        ordering = [name.lstrip('-') for name in getattr(self, 'pagination_ordering', None) or ()]
+        return queryset.prefetch_related(None).values(*serializer.value_fields(*ordering))
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        queryset = self.get_values_queryset(serializer)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_values_queryset(serializer)
+        try:
+            rows = serializer.serialize(queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})[:1])
+        except (TypeError, ValueError, ValidationError):
+            rows = []
+        if not rows:
+            raise Http404(f'No {serializer.model._meta.object_name} matches the given query.')
+        return Response(rows[0])
@@ -0,0 +1,232 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_DB_ALIAS = 'replica'
+# Cookie «читать с основной БД до …» (unix-время): после записи клиент видит свои изменения и в следующих запросах.
+PRIMARY_PIN_COOKIE = 'db_primary_until'
+
+
+class RoutingState:
+    """Маршрутизация чтений в рамках одного запроса (или блока replica_reads)."""
+
+    def __init__(self, replica_allowed: bool = False):
+        self.replica_allowed = replica_allowed
+        self.wrote = False
+        self.used_replica = False
+
+
+current_routing = ContextVar('current_routing', default=None)
+
+
+class ReplicaHealth:
+    """Недоступная реплика исключается на DATABASE_REPLICA_RETRY_SECONDS, чтения тем временем идут в основную БД."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.down_until = 0.0
+
+    def mark_down(self, exc: Exception) -> None:
+        with self.lock:
+            self.down_until = time.monotonic() + settings.DATABASE_REPLICA_RETRY_SECONDS
+        logger.warning('Реплика %s недоступна, чтение идёт в основную БД: %s', REPLICA_DB_ALIAS, exc)
+
+    def available(self) -> bool:
+        if REPLICA_DB_ALIAS not in settings.DATABASES or time.monotonic() < self.down_until:
+            return False
+        try:
+            connections[REPLICA_DB_ALIAS].ensure_connection()
+        except DatabaseError as exc:
+            self.mark_down(exc)
+            return False
+        return True
+
+    def probe(self) -> bool:
+        """Проверяет реплику заново открытым подключением: уже открытое могло оборваться после ensure_connection."""
+        replica = connections[REPLICA_DB_ALIAS]
+        try:
+            replica.close()
+            with replica.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except DatabaseError as exc:
+            self.mark_down(exc)
+            return False
+        return True
+
+
+replica_health = ReplicaHealth()
+
+
+@contextmanager
+def replica_reads():
+    """Разрешает чтение с реплики вне HTTP-запроса (команды, фоновые задачи)."""
+    token = current_routing.set(RoutingState(replica_allowed=True))
+    try:
+        yield
+    finally:
+        current_routing.reset(token)
+
+
+def built_from_replica() -> bool:
+    state = current_routing.get()
+    return bool(state and state.used_replica)
+
+
+def replica_reads_allowed() -> bool:
+    state = current_routing.get()
+    return bool(state and state.replica_allowed)
+
+
+def _pinned_to_primary(request) -> bool:
+    try:
+        return int(request.COOKIES.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def fall_back_to_primary(exc: Exception) -> bool:
+    """Ошибку можно повторить на основной БД: чтение шло с реплики, записи не было, а реплика не отвечает.
+
+    Тогда реплика исключается на DATABASE_REPLICA_RETRY_SECONDS, а текущему запросу реплика больше не разрешена.
+    """
+    state = current_routing.get()
+    if not isinstance(exc, DatabaseError) or state is None or not state.used_replica or state.wrote:
+        return False
+    if replica_health.probe():
+        return False
+    state.replica_allowed = False
+    state.used_replica = False
+    return True
+
+
+def call_with_replica_fallback(func, *args, **kwargs):
+    """Выполняет чтение и, если реплика отвалилась посреди него, повторяет его на основной БД."""
+    try:
+        return func(*args, **kwargs)
+    except DatabaseError as exc:
+        if not fall_back_to_primary(exc):
+            raise
+    return func(*args, **kwargs)
+
+
+class PrimaryReplicaRouter:
+    """Отчёты, выгрузки и списки читают с реплики, всё остальное — с основной БД.
+
+    Реплика используется, только если маршрут разрешил её (REPLICA_READ_ROUTES или replica_reads()), в запросе
+    ещё не было записи и нет открытой транзакции: так запрос видит собственные изменения. После записи
+    middleware на DATABASE_REPLICA_PIN_SECONDS закрепляет клиента за основной БД, чтобы и следующие чтения
+    не отставали от его изменений.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = current_routing.get()
+        if state is None or not state.replica_allowed or state.wrote:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block or not replica_health.available():
+            return DEFAULT_DB_ALIAS
+        state.used_replica = True
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика — копия основной БД: объекты из обеих можно связывать.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_DB_ALIAS
+
+
+def _iterate_with_routing(content, state: RoutingState):
+    iterator = iter(content)
+    while True:
+        # Контекст выставляется на каждый шаг: под ASGI шаги выполняются в разных копиях контекста.
+        token = current_routing.set(state)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            current_routing.reset(token)
+        yield chunk
+
+
+class ReplicaRoutingMiddleware:
+    """Заводит состояние маршрутизации на запрос и разрешает реплику для GET/HEAD из REPLICA_READ_ROUTES."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState()
+        token = current_routing.set(state)
+        try:
+            return self._finish(request, self.get_response(request), state)
+        finally:
+            current_routing.reset(token)
+
+    async def __acall__(self, request):
+        # Состояние изменяемое: sync_to_async копирует контекст, но видит тот же объект.
+        state = RoutingState()
+        token = current_routing.set(state)
+        try:
+            return self._finish(request, await self.get_response(request), state)
+        finally:
+            current_routing.reset(token)
+
+    @staticmethod
+    def _finish(request, response, state: RoutingState):
+        # Выгрузки читают строки уже после выхода из middleware, во время отдачи тела.
+        if response.streaming and not response.is_async and state.replica_allowed:
+            response.streaming_content = _iterate_with_routing(response.streaming_content, state)
+        pin_seconds = settings.DATABASE_REPLICA_PIN_SECONDS
+        if state.wrote and pin_seconds and REPLICA_DB_ALIAS in settings.DATABASES:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                str(int(time.time()) + pin_seconds),
+                max_age=pin_seconds,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = current_routing.get()
+        match = request.resolver_match
+        if (
+            state is not None
+            and request.method in ('GET', 'HEAD')
+            and match.view_name in settings.REPLICA_READ_ROUTES
+            and not _pinned_to_primary(request)
+        ):
+            state.replica_allowed = True
+        return None
+
+    def process_exception(self, request, exception):
+        # Реплика оборвалась уже после подключения: GET без записи безопасно выполнить ещё раз на основной БД.
+        # Выгрузки, упавшие во время отдачи тела, так не спасти — ответ уже начат.
+        if not fall_back_to_primary(exception):
+            return None
+        match = request.resolver_match
+        if iscoroutinefunction(match.func):
+            return async_to_sync(match.func)(request, *match.args, **match.kwargs)
+        return match.func(request, *match.args, **match.kwargs)
@@ -0,0 +1,230 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from common.response_cache import response_cache_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                self.duration += elapsed
+                self.count += 1
+
+
+# Счётчик текущего запроса: через него учитываются и запросы из рабочих потоков (common.aio.gather_isolated).
+current_recorder: ContextVar[QueryRecorder | None] = ContextVar('current_recorder', default=None)
+
+
+@contextmanager
+def attach_query_recorder():
+    recorder = current_recorder.get()
+    with ExitStack() as stack:
+        if recorder is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+        yield
+
+
+class RouteStats:
+    def __init__(self, window: int):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+
+    def add(self, route: str, total_ms: float, db_ms: float, drf_render_ms: float, queries: int) -> None:
+        with self.lock:
+            self.samples[route].append((total_ms, db_ms, drf_render_ms, queries))
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            samples = {route: list(values) for route, values in self.samples.items()}
+        return {route: self._summarize(values) for route, values in sorted(samples.items())}
+
+    def reset(self) -> None:
+        with self.lock:
+            self.samples.clear()
+
+    @staticmethod
+    def _percentiles(values: list[float]) -> dict:
+        ordered = sorted(values)
+        last = len(ordered) - 1
+        return {
+            f'p{percent}': round(ordered[round(last * percent / 100)], 2)
+            for percent in (50, 95, 99)
+        }
+
+    def _summarize(self, values: list[tuple]) -> dict:
+        total, db, render, queries = zip(*values)
+        return {
+            'count': len(values),
+            'total_ms': self._percentiles(total),
+            'db_ms': self._percentiles(db),
+            'drf_render_ms': self._percentiles(render),
+            'queries': self._percentiles(queries),
+        }
+
+
+route_stats = RouteStats(settings.INSTRUMENTATION_WINDOW)
+
+
+class InstrumentationMiddleware:
+    """Считает SQL-запросы, время БД, рендеринга DRF и ответа; пишет Server-Timing и копит перцентили по маршрутам.
+
+    drf_render — только работа рендерера DRF над готовыми данными (кодирование в JSON); сериализаторы
+    выполняются во view и попадают в app. Ответы, не проходящие через рендерер (JsonResponse async-чтения,
+    кеш ответов), показывают 0. Тело StreamingHttpResponse (экспорты CSV/NDJSON) сервер читает уже после
+    возврата из middleware, поэтому запросы к БД при его итерации не попадают ни в счётчики, ни в бюджеты.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.INSTRUMENTATION_ENABLED:
+            return self.get_response(request)
+
+        recorder, started = self._start(request)
+        token = current_recorder.set(recorder)
+        try:
+            with ExitStack() as stack:
+                self._attach(stack, recorder)
+                response = self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        return self._finish(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        if not settings.INSTRUMENTATION_ENABLED:
+            return await self.get_response(request)
+
+        recorder, started = self._start(request)
+        token = current_recorder.set(recorder)
+        # Подключения к БД привязаны к потоку: обёртку ставим в том потоке, где sync_to_async выполняет ORM запроса.
+        stack = ExitStack()
+        try:
+            await sync_to_async(self._attach)(stack, recorder)
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            current_recorder.reset(token)
+        return self._finish(request, response, recorder, started)
+
+    @staticmethod
+    def _start(request) -> tuple[QueryRecorder, float]:
+        request._render_started = None
+        request._drf_render_ms = 0.0
+        return QueryRecorder(), time.perf_counter()
+
+    @staticmethod
+    def _attach(stack: ExitStack, recorder: QueryRecorder) -> None:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+
+    def _finish(self, request, response, recorder: QueryRecorder, started: float):
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+        drf_render_ms = request._drf_render_ms
+
+        route = self._route_name(request)
+        route_stats.add(route, total_ms, db_ms, drf_render_ms, recorder.count)
+        response['Server-Timing'] = ', '.join(
+            [
+                f'db;dur={db_ms:.1f};desc="{recorder.count} queries"',
+                f'drf_render;dur={drf_render_ms:.1f}',
+                f'app;dur={max(total_ms - db_ms - drf_render_ms, 0):.1f}',
+                f'total;dur={total_ms:.1f}',
+            ]
+        )
+        self._check_budget(route, recorder.count)
+        return response
+
+    def process_template_response(self, request, response):
+        request._render_started = time.perf_counter()
+        response.add_post_render_callback(lambda rendered: self._finish_render(request))
+        return response
+
+    @staticmethod
+    def _finish_render(request):
+        if request._render_started is not None:
+            request._drf_render_ms += (time.perf_counter() - request._render_started) * 1000
+
+    @staticmethod
+    def _route_name(request) -> str:
+        match = getattr(request, 'resolver_match', None)
+        name = match.view_name if match and match.view_name else 'unresolved'
+        return f'{request.method} {name}'
+
+    @staticmethod
+    def _check_budget(route: str, queries: int) -> None:
+        method, view_name = route.split(' ', 1)
+        if method not in ('GET', 'HEAD'):
+            return
+        budget = settings.API_QUERY_BUDGETS.get(view_name)
+        if budget is None or queries <= budget:
+            return
+        message = f'{route}: {queries} SQL-запросов при бюджете {budget}.'
+        if settings.API_QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+def _reset_allowed(request) -> bool:
+    # Эндпоинты без CSRF и без DRF-прав: сбрасывать статистику может только персонал (или кто угодно в DEBUG).
+    return settings.DEBUG or request.user.is_staff
+
+
+def _reset_forbidden() -> JsonResponse:
+    return JsonResponse({'detail': 'Сброс статистики доступен только персоналу.'}, status=403)
+
+
+@csrf_exempt
+@require_http_methods(['GET', 'DELETE'])
+def metrics_view(request):
+    if request.method == 'DELETE':
+        if not _reset_allowed(request):
+            return _reset_forbidden()
+        route_stats.reset()
+    return JsonResponse(route_stats.snapshot(), json_dumps_params={'ensure_ascii': False})
+
+
+@csrf_exempt
+@require_http_methods(['GET', 'DELETE'])
+def response_cache_metrics_view(request):
+    if request.method == 'DELETE':
+        if not _reset_allowed(request):
+            return _reset_forbidden()
+        response_cache_stats.reset()
+    return JsonResponse(response_cache_stats.snapshot(), json_dumps_params={'ensure_ascii': False})
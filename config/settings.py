@@ -48,6 +48,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'config.instrumentation.InstrumentationMiddleware',
+    'config.db_routing.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -87,6 +89,9 @@ if env('USE_SQLITE'):
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            # Параллельные писатели (воркеры отчётов, веб-процессы) ждут блокировку при входе в транзакцию,
+            # а не падают с «database is locked» при повышении блокировки посреди неё.
+            'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
         }
     }
 else:
@@ -101,6 +106,43 @@ else:
         }
     }
 
+# Реплика для чтения отчётов, выгрузок и списков (config/db_routing.py). Локально это может быть копия db.sqlite3:
+# REPLICA_DATABASE_URL=sqlite:////абсолютный/путь/replica.sqlite3. Без переменной всё читается из default.
+REPLICA_DATABASE_URL = env('REPLICA_DATABASE_URL', default='')
+if REPLICA_DATABASE_URL:
+    replica = env.db_url_config(REPLICA_DATABASE_URL)
+    if replica['ENGINE'] == 'django.db.backends.sqlite3':
+        # Файл открывается только на чтение: запись мимо основной БД невозможна, отсутствующий файл — ошибка подключения.
+        replica['NAME'] = f'file:{replica["NAME"]}?mode=ro'
+    replica['TEST'] = {'MIRROR': 'default'}
+    DATABASES['replica'] = replica
+
+DATABASE_ROUTERS = ['config.db_routing.PrimaryReplicaRouter']
+# Сколько секунд не обращаться к реплике после неудачного подключения.
+DATABASE_REPLICA_RETRY_SECONDS = env.int('DATABASE_REPLICA_RETRY_SECONDS', default=30)
+# Сколько секунд после записи клиент (cookie db_primary_until) читает только из основной БД.
+DATABASE_REPLICA_PIN_SECONDS = env.int('DATABASE_REPLICA_PIN_SECONDS', default=10)
+# Маршруты (view_name), чьи GET/HEAD читают с реплики, пока в запросе не было записи.
+REPLICA_READ_ROUTES = {
+    'room-list',
+    'room-list-async',
+    'client-list',
+    'client-list-async',
+    'client-by-city',
+    'client-export',
+    'stay-list',
+    'stay-list-async',
+    'stay-export',
+    'employee-list',
+    'employee-roster',
+    'reports-quarterly',
+    'reports-quarterly-async',
+    'reports-quarterly-export',
+    'reports-income',
+    'reports-occupancy',
+    'reports-range',
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -139,11 +181,15 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+API_PAGE_SIZE = env.int('API_PAGE_SIZE', default=50)
+API_MAX_PAGE_SIZE = env.int('API_MAX_PAGE_SIZE', default=500)
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'common.pagination.HotelPagination',
 }
 
 SPECTACULAR_SETTINGS = {
@@ -153,6 +199,63 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+# Инструментирование запросов: Server-Timing, перцентили по маршрутам на /api/metrics/.
+INSTRUMENTATION_ENABLED = env.bool('INSTRUMENTATION_ENABLED', default=True)
+INSTRUMENTATION_WINDOW = env.int('INSTRUMENTATION_WINDOW', default=1000)
+# Бюджет SQL-запросов на чтение (GET/HEAD) по имени представления (view_name);
+# при API_QUERY_BUDGET_STRICT превышение — исключение.
+API_QUERY_BUDGETS = {
+    # Бюджеты — для промаха кеша ответов; попадание обходится без SQL. Списки считаются по режиму limit/offset
+    # (им ходит админка): агрегат для ETag + COUNT + страница.
+    'room-list': 4,
+    'room-detail': 3,
+    'room-free-count': 1,
+    'room-available': 2,
+    'client-list': 3,
+    'client-by-city': 1,
+    'stay-list': 3,
+    'employee-list': 5,  # ETag учитывает и назначения уборки: два агрегата.
+    'reports-quarterly': 5,
+    'reports-income': 2,
+    'reports-occupancy': 3,
+    'reports-range': 2,
+    'room-list-async': 4,
+    'client-list-async': 3,
+    'stay-list-async': 3,
+    'reports-quarterly-async': 5,
+}
+API_QUERY_BUDGET_STRICT = env.bool('API_QUERY_BUDGET_STRICT', default=False)
+
+# Индекс «кто убирает» в памяти процесса пересобирается при смене версии расписания или по истечении срока (сек.).
+SCHEDULE_INDEX_MAX_AGE = env.int('SCHEDULE_INDEX_MAX_AGE', default=300)
+
+# Кеш ответов /api/clients/overlaps/ (сек.); сбрасывается при изменении клиентов и проживаний.
+CLIENT_OVERLAPS_CACHE_TTL = env.int('CLIENT_OVERLAPS_CACHE_TTL', default=30)
+
+# Сводка свободных номеров (/api/rooms/free-count/) кешируется на несколько секунд;
+# 0 отключает кеширование.
+ROOMS_FREE_COUNT_CACHE_TTL = env.int('ROOMS_FREE_COUNT_CACHE_TTL', default=5)
+
+# Кеш ответов чтения (см. common/response_cache.py) живёт в отдельном алиасе: по умолчанию память процесса,
+# для нескольких воркеров нужен общий бэкенд (RESPONSE_CACHE_URL=filecache:///var/tmp/hotel-responses, redis://…),
+# иначе сброс по сигналу увидит только процесс, в котором произошло изменение.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+    'responses': env.cache('RESPONSE_CACHE_URL', default='locmemcache://responses'),
+}
+# Время жизни закешированного ответа (сек.); 0 отключает кеш ответов. Кеш в памяти процесса не узнаёт о сбросах
+# в других воркерах, поэтому без общего бэкенда ответ по умолчанию живёт секунды, а не минуты.
+RESPONSE_CACHE_SHARED = not CACHES['responses']['BACKEND'].endswith('.LocMemCache')
+RESPONSE_CACHE_TTL = env.int('RESPONSE_CACHE_TTL', default=600 if RESPONSE_CACHE_SHARED else 5)
+# Ответ, прочитанный с реплики, мог отстать от сброса по сигналу, поэтому хранится не дольше ожидаемого лага.
+RESPONSE_CACHE_REPLICA_TTL = env.int('RESPONSE_CACHE_REPLICA_TTL', default=5)
+
+# Фоновые отчёты (run_report_worker): задача, которая выполняется дольше (сек.), при старте воркера
+# считается брошенной и возвращается в очередь.
+REPORT_JOB_TIMEOUT = env.int('REPORT_JOB_TIMEOUT', default=3600)
+
+# Админка на другом origin: cookie закрепления за основной БД должна ходить вместе с запросами.
+CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOWED_ORIGINS = env.list(
     'CORS_ALLOWED_ORIGINS',
     default=[
@@ -0,0 +1,179 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from clients.models import Client
+from .db_routing import (
+    PRIMARY_PIN_COOKIE,
+    REPLICA_DB_ALIAS,
+    PrimaryReplicaRouter,
+    built_from_replica,
+    call_with_replica_fallback,
+    replica_health,
+    replica_reads,
+)
+from .instrumentation import route_stats
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Реплика в тестах — снимок тестовой SQLite-базы.')
+@override_settings(RESPONSE_CACHE_TTL=0)
+class ReplicaTestCase(TransactionTestCase):
+    """Реплика — копия тестовой базы на момент snapshot_replica(): дальнейшие записи в неё не попадают."""
+
+    def setUp(self):
+        replica_health.down_until = 0.0
+        self.replica_dir = tempfile.TemporaryDirectory()
+        self.replica_path = os.path.join(self.replica_dir.name, 'replica.sqlite3')
+        replica = {**connection.settings_dict, 'NAME': f'file:{self.replica_path}?mode=ro'}
+        self.enterContext(mock.patch.dict(settings.DATABASES, {REPLICA_DB_ALIAS: replica}))
+        # Алиас добавлен после setUpClass: иначе тестовый раннер запретит к нему подключаться.
+        self.enterContext(mock.patch.object(type(self), 'databases', type(self).databases | {REPLICA_DB_ALIAS}))
+        self.addCleanup(self.replica_dir.cleanup)
+        self.addCleanup(self._drop_replica_connection)
+
+    @staticmethod
+    def _drop_replica_connection():
+        if REPLICA_DB_ALIAS in connections:
+            connections[REPLICA_DB_ALIAS].close()
+            del connections[REPLICA_DB_ALIAS]
+        replica_health.down_until = 0.0
+
+    def snapshot_replica(self):
+        connection.ensure_connection()
+        target = sqlite3.connect(self.replica_path)
+        try:
+            connection.connection.backup(target)
+        finally:
+            target.close()
+
+
+class ReadYourWritesTests(ReplicaTestCase):
+    def create_client(self):
+        return self.client.post('/api/clients/', {
+            'passport_number': 'P1', 'last_name': 'Иванов', 'first_name': 'Иван', 'city': 'Тверь',
+        }, content_type='application/json')
+
+    def test_write_pins_client_to_primary(self):
+        self.snapshot_replica()
+        response = self.create_client()
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+        # Тот же клиент сразу видит свою запись, хотя реплика отстаёт.
+        self.assertEqual(self.client.get('/api/clients/', {'city': 'Тверь', 'limit': 10}).json()['count'], 1)
+        # Остальные читают с реплики.
+        stranger = self.client_class()
+        self.assertEqual(stranger.get('/api/clients/', {'city': 'Тверь', 'limit': 10}).json()['count'], 0)
+
+    @override_settings(DATABASE_REPLICA_PIN_SECONDS=0)
+    def test_pinning_can_be_disabled(self):
+        self.snapshot_replica()
+        response = self.create_client()
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+        self.assertEqual(self.client.get('/api/clients/', {'city': 'Тверь', 'limit': 10}).json()['count'], 0)
+
+
+class PrimaryReplicaRouterTests(ReplicaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.snapshot_replica()
+        self.router = PrimaryReplicaRouter()
+
+    def test_replica_only_inside_allowed_reads(self):
+        self.assertEqual(self.router.db_for_read(Client), DEFAULT_DB_ALIAS)
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Client), REPLICA_DB_ALIAS)
+            self.assertTrue(built_from_replica())
+
+    def test_write_pins_rest_of_request_to_primary(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_write(Client), DEFAULT_DB_ALIAS)
+            self.assertEqual(self.router.db_for_read(Client), DEFAULT_DB_ALIAS)
+
+    def test_transaction_reads_primary(self):
+        with replica_reads(), transaction.atomic():
+            self.assertEqual(self.router.db_for_read(Client), DEFAULT_DB_ALIAS)
+
+    def test_replica_routes(self):
+        client = Client.objects.create(passport_number='P1', last_name='Иванов', first_name='Иван', city='Тверь')
+        # Список в REPLICA_READ_ROUTES читает снимок без новой строки, карточка — основную БД.
+        self.assertEqual(self.client.get('/api/clients/', {'limit': 10}).json()['count'], 0)
+        self.assertEqual(self.client.get(f'/api/clients/{client.pk}/').status_code, 200)
+
+    def test_unreachable_replica_is_skipped(self):
+        os.remove(self.replica_path)
+        with replica_reads(), self.assertLogs('config.db_routing', 'WARNING'):
+            self.assertEqual(self.router.db_for_read(Client), DEFAULT_DB_ALIAS)
+        self.assertGreater(replica_health.down_until, 0)
+
+
+class ReplicaFailureTests(ReplicaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.snapshot_replica()
+        Client.objects.create(passport_number='P1', last_name='Иванов', first_name='Иван', city='Тверь')
+
+    def break_open_replica(self):
+        # Подключение к реплике уже открыто, затем реплика пропадает: следующий запрос к ней падает.
+        connections[REPLICA_DB_ALIAS].ensure_connection()
+        connections[REPLICA_DB_ALIAS].connection.close()
+        os.remove(self.replica_path)
+
+    def test_request_is_retried_on_primary(self):
+        self.break_open_replica()
+        with self.assertLogs('config.db_routing', 'WARNING'):
+            response = self.client.get('/api/clients/', {'limit': 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 1)
+        self.assertGreater(replica_health.down_until, 0)
+
+    def test_async_request_is_retried_on_primary(self):
+        self.break_open_replica()
+        with self.assertLogs('config.db_routing', 'WARNING'):
+            response = async_to_sync(self.async_client.get)('/api/async/clients/', {'limit': 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_background_read_is_retried_on_primary(self):
+        self.break_open_replica()
+        with replica_reads(), self.assertLogs('config.db_routing', 'WARNING'):
+            self.assertEqual(call_with_replica_fallback(Client.objects.count), 1)
+
+
+@override_settings(DEBUG=False)
+class MetricsResetTests(TestCase):
+    urls = ('/api/metrics/', '/api/metrics/response-cache/')
+
+    def setUp(self):
+        route_stats.add('GET rooms-list', 1.0, 0.5, 0.1, 2)
+        self.addCleanup(route_stats.reset)
+
+    def test_anonymous_cannot_reset(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.delete(url).status_code, 403)
+        self.assertIn('GET rooms-list', self.client.get('/api/metrics/').json())
+
+    def test_staff_can_reset(self):
+        self.client.force_login(get_user_model().objects.create(username='admin', is_staff=True))
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.delete(url).status_code, 200)
+        self.assertNotIn('GET rooms-list', self.client.get('/api/metrics/').json())
+
+    @override_settings(DEBUG=True)
+    def test_debug_allows_reset(self):
+        self.assertEqual(self.client.delete('/api/metrics/').json(), {})
+
+    def test_server_timing_names_drf_render(self):
+        response = self.client.get('/api/rooms/')
+        self.assertIn('drf_render;dur=', response['Server-Timing'])
+        self.assertIn('drf_render_ms', self.client.get('/api/metrics/').json()['GET room-list'])
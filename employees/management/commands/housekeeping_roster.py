@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from common.exports import parse_export_format, streaming_export
+from common.utils import ensure_period
+from employees.roster import ROSTER_HEADER, build_roster
+
+
+class Command(BaseCommand):
+    help = 'Формирует график уборки: занятые номера и назначенный уборщик на каждый день периода.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', required=True, help='Дата начала (YYYY-MM-DD).')
+        parser.add_argument('--end', required=True, help='Дата окончания (YYYY-MM-DD).')
+        parser.add_argument('--export-format', default='csv', help='csv или ndjson.')
+        parser.add_argument('--output', help='Файл для результата; по умолчанию stdout.')
+
+    def handle(self, *args, **options):
+        try:
+            start, end = ensure_period(options['start'], options['end'])
+            export_format = parse_export_format(options['export_format'])
+            rows = build_roster(start, end)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        response = streaming_export(ROSTER_HEADER, rows, export_format, 'roster')
+        chunks = (chunk.decode(response.charset) for chunk in response.streaming_content)
+        if not options['output']:
+            for text in chunks:
+                self.stdout.write(text, ending='')
+            return
+        # newline='': у CSV свои \r\n, текстовый режим не должен их переводить.
+        with open(options['output'], 'w', encoding=response.charset, newline='') as output:
+            output.writelines(chunks)
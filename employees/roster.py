@@ -0,0 +1,58 @@
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db.models import Q
+
+from stays.models import Stay
+from .models import CleaningAssignment
+from .schedule import schedule_index
+
+ROSTER_MAX_DAYS = 93
+ROSTER_HEADER = ['date', 'weekday', 'room', 'room_number', 'floor', 'guests', 'employee', 'employee_name']
+
+
+def weekday_code(day: date) -> str:
+    return CleaningAssignment.WEEKDAYS[day.weekday()][0]
+
+
+def build_roster(start: date, end: date):
+    if (end - start).days + 1 > ROSTER_MAX_DAYS:
+        raise ValueError(f'Период графика уборки не может превышать {ROSTER_MAX_DAYS} дней.')
+    return _iter_roster(start, end)
+
+
+def _iter_roster(start: date, end: date):
+    stays = Stay.objects.filter(check_in__lte=end).filter(
+        Q(check_out__isnull=True) | Q(check_out__gt=start)
+    ).order_by().values_list('room_id', 'room__number', 'room__floor', 'check_in', 'check_out')
+
+    rooms = {}
+    guests = defaultdict(int)
+    for room_id, number, floor, check_in, check_out in stays:
+        rooms[room_id] = (number, floor)
+        day = max(check_in, start)
+        last = min(check_out - timedelta(days=1), end) if check_out else end
+        while day <= last:
+            guests[day, room_id] += 1
+            day += timedelta(days=1)
+
+    ordered_rooms = sorted(rooms.items(), key=lambda item: item[1][0])
+    day = start
+    while day <= end:
+        weekday = weekday_code(day)
+        for room_id, (number, floor) in ordered_rooms:
+            count = guests.get((day, room_id))
+            if not count:
+                continue
+            cleaner = schedule_index.cleaner_for(floor, weekday)
+            yield (
+                day,
+                weekday,
+                room_id,
+                number,
+                floor,
+                count,
+                cleaner['id'] if cleaner else None,
+                ' '.join(filter(None, [cleaner['last_name'], cleaner['first_name'], cleaner['middle_name']])) if cleaner else None,
+            )
+        day += timedelta(days=1)
@@ -0,0 +1,74 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Employee
+from .serializers import EmployeeSerializer
+
+SCHEDULE_VERSION_CACHE_KEY = 'employees:schedule-version'
+
+
+def current_schedule_version() -> int:
+    return cache.get_or_set(SCHEDULE_VERSION_CACHE_KEY, 1, timeout=None)
+
+
+def bump_schedule_version() -> None:
+    try:
+        cache.incr(SCHEDULE_VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(SCHEDULE_VERSION_CACHE_KEY, 2, timeout=None)
+    schedule_index.invalidate()
+
+
+class ScheduleIndex:
+    """Индекс (этаж, день недели) → активные сотрудники, живёт в памяти процесса.
+
+    Пересобирается, когда меняется версия расписания в общем кеше или истекает SCHEDULE_INDEX_MAX_AGE.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.built_at = 0.0
+        self.cleaners = {}
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.version = None
+
+    def _is_fresh(self, version: int) -> bool:
+        return self.version == version and time.monotonic() - self.built_at < settings.SCHEDULE_INDEX_MAX_AGE
+
+    def _ensure_fresh(self) -> None:
+        version = current_schedule_version()
+        if self._is_fresh(version):
+            return
+        with self.lock:
+            if self._is_fresh(version):
+                return
+            self.cleaners = self._build()
+            self.version = version
+            self.built_at = time.monotonic()
+
+    @staticmethod
+    def _build() -> dict:
+        employees = Employee.objects.filter(status=Employee.Status.ACTIVE).prefetch_related('assignments')
+        cleaners = {}
+        for employee in employees:
+            data = EmployeeSerializer(employee).data
+            for assignment in employee.assignments.all():
+                cleaners.setdefault((assignment.floor, assignment.weekday), []).append(data)
+        return cleaners
+
+    def cleaners_for(self, floor: int, weekday: str) -> list[dict]:
+        self._ensure_fresh()
+        return self.cleaners.get((floor, weekday), [])
+
+    def cleaner_for(self, floor: int, weekday: str) -> dict | None:
+        cleaners = self.cleaners_for(floor, weekday)
+        return cleaners[0] if cleaners else None
+
+
+schedule_index = ScheduleIndex()
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from common.values import ValuesSerializer
 from .models import CleaningAssignment, Employee
 
 
@@ -26,6 +27,33 @@ class EmployeeSerializer(serializers.ModelSerializer):
         ]
 
 
+class EmployeeValuesSerializer(ValuesSerializer):
+    model = Employee
+    fields = (
+        'id',
+        'last_name',
+        'first_name',
+        'middle_name',
+        'status',
+        'hire_date',
+        'termination_date',
+        'assignments',
+    )
+
+    def prepare(self, rows: list[dict]) -> None:
+        self._assignments = {row['id']: [] for row in rows}
+        assignments = (
+            CleaningAssignment.objects.filter(employee_id__in=list(self._assignments))
+            .order_by('id')
+            .values_list('employee_id', 'id', 'floor', 'weekday')
+        )
+        for employee_id, assignment_id, floor, weekday in assignments:
+            self._assignments[employee_id].append({'id': assignment_id, 'floor': floor, 'weekday': weekday})
+
+    def get_assignments(self, row: dict) -> list[dict]:
+        return self._assignments[row['id']]
+
+
 class ScheduleSerializer(serializers.Serializer):
     assignments = CleaningAssignmentSerializer(many=True)
 
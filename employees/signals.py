@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.response_cache import EMPLOYEES_RESPONSES, invalidate_responses_on_commit
+from .models import CleaningAssignment, Employee
+from .schedule import bump_schedule_version
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+@receiver(post_save, sender=CleaningAssignment)
+@receiver(post_delete, sender=CleaningAssignment)
+def reset_schedule_index(sender, **kwargs):
+    transaction.on_commit(bump_schedule_version)
+    invalidate_responses_on_commit(EMPLOYEES_RESPONSES)
@@ -1,3 +1,74 @@
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from clients.models import Client
+from common.testing import ResponseCacheTestMixin
+from rooms.models import Room
+from stays.models import Stay
+from .models import CleaningAssignment, Employee
+
+
+class EmployeeResponseInvalidationTests(ResponseCacheTestMixin, TestCase):
+    url = '/api/employees/?limit=10'
+
+    def setUp(self):
+        super().setUp()
+        self.employee = Employee.objects.create(last_name='Петрова', first_name='Анна')
+
+    def test_employee_save(self):
+        def change():
+            self.employee.status = Employee.Status.FIRED
+            self.employee.save()
+
+        self.assertInvalidatedBy(change, self.url)
+
+    def test_employee_delete(self):
+        self.assertInvalidatedBy(self.employee.delete, self.url)
+
+    def test_assignment_save(self):
+        self.assertInvalidatedBy(
+            lambda: CleaningAssignment.objects.create(employee=self.employee, floor=1, weekday='mon'), self.url
+        )
+
+    def test_assignment_delete(self):
+        assignment = CleaningAssignment.objects.create(employee=self.employee, floor=1, weekday='mon')
+        self.assertInvalidatedBy(assignment.delete, self.url)
+
+
+class HousekeepingRosterCommandTests(TestCase):
+    expected = (
+        '\ufeffdate,weekday,room,room_number,floor,guests,employee,employee_name\r\n'
+        '2024-01-01,mon,{room},101,1,1,{employee},Ёлкина Анна\r\n'
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.room = Room.objects.create(
+            number=101, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='1'
+        )
+        guest = Client.objects.create(passport_number='P1', last_name='Иванов', first_name='Иван', city='Тверь')
+        Stay.objects.create(client=guest, room=cls.room, check_in=date(2024, 1, 1), check_out=date(2024, 1, 2))
+        cls.employee = Employee.objects.create(last_name='Ёлкина', first_name='Анна')
+        CleaningAssignment.objects.create(employee=cls.employee, floor=1, weekday='mon')
+
+    def roster(self, **options):
+        return call_command('housekeeping_roster', start='2024-01-01', end='2024-01-02', **options)
+
+    def test_writes_to_command_stdout(self):
+        out = StringIO()
+        self.roster(stdout=out)
+        self.assertEqual(out.getvalue(), self.expected.format(room=self.room.pk, employee=self.employee.pk))
+
+    def test_writes_to_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'roster.csv')
+            self.roster(output=path)
+            with open(path, 'rb') as output:
+                content = output.read()
+        self.assertEqual(content.decode(), self.expected.format(room=self.room.pk, employee=self.employee.pk))
@@ -1,17 +1,39 @@
 from datetime import date
 
+from django.db import transaction
+from django.db.models import Prefetch
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from common.conditional import ConditionalGetMixin
+from common.exports import parse_export_format, streaming_export
+from common.response_cache import (
+    EMPLOYEES_RESPONSES,
+    ROOMS_RESPONSES,
+    STAYS_RESPONSES,
+    CachedReadMixin,
+    cache_response,
+    invalidate_responses_on_commit,
+)
+from common.utils import ensure_period
+from common.values import ValuesReadMixin
 from stays.models import Stay
 from .models import CleaningAssignment, Employee
-from .serializers import CleaningAssignmentSerializer, EmployeeSerializer, ScheduleSerializer
+from .roster import ROSTER_HEADER, build_roster
+from .schedule import bump_schedule_version, schedule_index
+from .serializers import CleaningAssignmentSerializer, EmployeeSerializer, EmployeeValuesSerializer, ScheduleSerializer
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
-    queryset = Employee.objects.prefetch_related('assignments')
+class EmployeeViewSet(CachedReadMixin, ConditionalGetMixin, ValuesReadMixin, viewsets.ModelViewSet):
+    queryset = Employee.objects.prefetch_related(Prefetch('assignments', queryset=CleaningAssignment.objects.order_by('id')))
     serializer_class = EmployeeSerializer
+    values_serializer_class = EmployeeValuesSerializer
+    pagination_ordering = ['last_name', 'first_name', 'id']
+    response_cache_namespaces = (EMPLOYEES_RESPONSES,)
+
+    def get_etag_querysets(self, queryset):
+        return [queryset, CleaningAssignment.objects.filter(employee__in=queryset.values('pk'))]
 
     @action(detail=True, methods=['post'], url_path='fire')
     def fire_employee(self, request, pk=None):
@@ -20,7 +42,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             return Response({'detail': 'Сотрудник уже уволен.'}, status=status.HTTP_400_BAD_REQUEST)
         employee.status = Employee.Status.FIRED
         employee.termination_date = date.today()
-        employee.save(update_fields=['status', 'termination_date'])
+        employee.save(update_fields=['status', 'termination_date', 'updated_at'])
         return Response(self.get_serializer(employee).data)
 
     @action(detail=True, methods=['put'], url_path='schedule')
@@ -28,16 +50,29 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         employee = self.get_object()
         serializer = ScheduleSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        employee.assignments.all().delete()
-        assignments = [
-            CleaningAssignment(employee=employee, **entry)
-            for entry in serializer.validated_data['assignments']
-        ]
-        CleaningAssignment.objects.bulk_create(assignments)
+        with transaction.atomic():
+            employee.assignments.all().delete()
+            assignments = [
+                CleaningAssignment(employee=employee, **entry)
+                for entry in serializer.validated_data['assignments']
+            ]
+            CleaningAssignment.objects.bulk_create(assignments)
+            transaction.on_commit(bump_schedule_version)
+            invalidate_responses_on_commit(EMPLOYEES_RESPONSES)
         employee.refresh_from_db()
         return Response(self.get_serializer(employee).data)
 
+    @staticmethod
+    def _parse_weekday(value):
+        if not value:
+            raise ValueError('Нужен параметр weekday.')
+        weekday = value.lower()
+        if weekday not in dict(CleaningAssignment.WEEKDAYS):
+            raise ValueError('Недопустимое значение weekday.')
+        return weekday
+
     @action(detail=False, methods=['get'], url_path='who-cleans')
+    @cache_response(EMPLOYEES_RESPONSES, STAYS_RESPONSES, ROOMS_RESPONSES)
     def who_cleans(self, request):
         client_id = request.query_params.get('client_id')
         weekday = request.query_params.get('weekday')
@@ -45,23 +80,55 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             return Response({'detail': 'Нужны параметры client_id и weekday.'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            weekday = weekday.lower()
-        except AttributeError:
-            return Response({'detail': 'Некорректное значение weekday.'}, status=status.HTTP_400_BAD_REQUEST)
+            weekday = self._parse_weekday(weekday)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        if weekday not in dict(CleaningAssignment.WEEKDAYS):
-            return Response({'detail': 'Недопустимое значение weekday.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        stay = Stay.objects.filter(client_id=client_id, status=Stay.Status.ACTIVE).select_related('room').first()
-        if not stay:
+        floor = Stay.objects.filter(client_id=client_id, status=Stay.Status.ACTIVE).values_list('room__floor', flat=True).first()
+        if floor is None:
             return Response({'detail': 'Для клиента нет активного проживания.'}, status=status.HTTP_404_NOT_FOUND)
 
-        assignment = CleaningAssignment.objects.select_related('employee').filter(
-            floor=stay.room.floor,
-            weekday=weekday,
-        ).first()
-
-        if not assignment:
+        cleaner = schedule_index.cleaner_for(floor, weekday)
+        if not cleaner:
             return Response({'detail': 'На указанном этаже нет назначенного сотрудника.'}, status=status.HTTP_404_NOT_FOUND)
 
-        return Response(EmployeeSerializer(assignment.employee).data)
+        return Response(cleaner)
+
+    @action(detail=False, methods=['get'], url_path='who-cleans-rooms')
+    @cache_response(EMPLOYEES_RESPONSES, STAYS_RESPONSES, ROOMS_RESPONSES)
+    def who_cleans_rooms(self, request):
+        try:
+            weekday = self._parse_weekday(request.query_params.get('weekday'))
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        rooms = (
+            Stay.objects.active()
+            .order_by('room__number')
+            .values_list('room_id', 'room__number', 'room__floor')
+            .distinct()
+        )
+        return Response([
+            {
+                'room': room_id,
+                'room_number': number,
+                'floor': floor,
+                'employee': schedule_index.cleaner_for(floor, weekday),
+            }
+            for room_id, number, floor in rooms
+        ])
+
+    @action(detail=False, methods=['get'], url_path='roster')
+    def roster(self, request):
+        export_format = request.query_params.get('export_format')
+        try:
+            start_date, end_date = ensure_period(request.query_params.get('start'), request.query_params.get('end'))
+            rows = build_roster(start_date, end_date)
+            if export_format:
+                export_format = parse_export_format(export_format)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if export_format:
+            return streaming_export(ROSTER_HEADER, rows, export_format, f'roster_{start_date}_{end_date}')
+        return Response([dict(zip(ROSTER_HEADER, row)) for row in rows])
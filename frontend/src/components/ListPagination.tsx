@@ -0,0 +1,26 @@
+import { TablePagination } from '@mui/material';
+
+import type { Pagination } from '../hooks';
+
+const rowsPerPageOptions = [25, 50, 100, 250];
+
+interface ListPaginationProps {
+  count: number | undefined;
+  pagination: Pagination;
+}
+
+export function ListPagination({ count, pagination }: ListPaginationProps) {
+  return (
+    <TablePagination
+      component="div"
+      count={count ?? 0}
+      page={pagination.page}
+      rowsPerPage={pagination.rowsPerPage}
+      rowsPerPageOptions={rowsPerPageOptions}
+      onPageChange={(_, page) => pagination.setPage(page)}
+      onRowsPerPageChange={(event) => pagination.changeRowsPerPage(Number(event.target.value))}
+      labelRowsPerPage="Строк на странице:"
+      labelDisplayedRows={({ from, to, count: total }) => `${from}–${to} из ${total}`}
+    />
+  );
+}
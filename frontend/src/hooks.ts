@@ -1,8 +1,27 @@
+import { useMemo, useState } from 'react';
 import type { TypedUseSelectorHook } from 'react-redux';
 import { useDispatch, useSelector } from 'react-redux';
 
 import type { AppDispatch, RootState } from './app/store';
+import { ADMIN_PAGE_SIZE } from './services/api';
 
 export const useAppDispatch = () => useDispatch<AppDispatch>();
 export const useAppSelector: TypedUseSelectorHook<RootState> = useSelector;
 
+export function usePagination(initialRowsPerPage = ADMIN_PAGE_SIZE) {
+  const [page, setPage] = useState(0);
+  const [rowsPerPage, setRowsPerPage] = useState(initialRowsPerPage);
+  const pageParams = useMemo(() => ({ limit: rowsPerPage, offset: page * rowsPerPage }), [page, rowsPerPage]);
+  return {
+    page,
+    rowsPerPage,
+    setPage,
+    changeRowsPerPage: (value: number) => {
+      setRowsPerPage(value);
+      setPage(0);
+    },
+    pageParams,
+  };
+}
+
+export type Pagination = ReturnType<typeof usePagination>;
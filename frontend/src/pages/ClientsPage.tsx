@@ -21,6 +21,8 @@ import { DatePicker } from '@mui/x-date-pickers';
 import dayjs, { Dayjs } from 'dayjs';
 import { useMemo, useState } from 'react';
 
+import { ListPagination } from '../components/ListPagination';
+import { usePagination } from '../hooks';
 import {
   useCheckoutStayMutation,
   useCreateClientMutation,
@@ -41,7 +43,12 @@ export function ClientsPage() {
   const [overlapStart, setOverlapStart] = useState<Dayjs | null>(dayjs().subtract(7, 'day'));
   const [overlapEnd, setOverlapEnd] = useState<Dayjs | null>(dayjs());
 
-  const { data: clients } = useGetClientsQuery(cityFilter ? { city: cityFilter } : undefined);
+  const pagination = usePagination();
+  const overlapPagination = usePagination();
+  const { data: clients } = useGetClientsQuery({
+    ...(cityFilter ? { city: cityFilter } : {}),
+    ...pagination.pageParams,
+  });
   const { data: stays } = useGetClientStaysQuery(selectedClient?.id ?? 0, {
     skip: !selectedClient,
   });
@@ -51,8 +58,9 @@ export function ClientsPage() {
       clientId: selectedClient.id,
       start: overlapStart.format('YYYY-MM-DD'),
       end: overlapEnd.format('YYYY-MM-DD'),
+      ...overlapPagination.pageParams,
     };
-  }, [selectedClient, overlapStart, overlapEnd]);
+  }, [selectedClient, overlapStart, overlapEnd, overlapPagination.pageParams]);
   const { data: overlapping } = useGetOverlappingClientsQuery(overlapParams ?? skipToken);
 
   const [createClient] = useCreateClientMutation();
@@ -101,7 +109,10 @@ export function ClientsPage() {
             <TextField
               label="Город"
               value={cityFilter}
-              onChange={(event) => setCityFilter(event.target.value)}
+              onChange={(event) => {
+                setCityFilter(event.target.value);
+                pagination.setPage(0);
+              }}
             />
             <Button variant="contained" onClick={() => setCreateDialogOpen(true)}>
               Добавить клиента
@@ -127,14 +138,20 @@ export function ClientsPage() {
                 </TableRow>
               </TableHead>
               <TableBody>
-                {clients?.map((client) => (
+                {clients?.results.map((client) => (
                   <TableRow key={client.id}>
                     <TableCell>{client.full_name}</TableCell>
                     <TableCell>{client.passport_number}</TableCell>
                     <TableCell>{client.city}</TableCell>
                     <TableCell>{client.phone ?? '—'}</TableCell>
                     <TableCell align="right">
-                      <Button size="small" onClick={() => setSelectedClient(client)}>
+                      <Button
+                        size="small"
+                        onClick={() => {
+                          setSelectedClient(client);
+                          overlapPagination.setPage(0);
+                        }}
+                      >
                         Управлять
                       </Button>
                     </TableCell>
@@ -143,6 +160,7 @@ export function ClientsPage() {
               </TableBody>
             </Table>
           </Box>
+          <ListPagination count={clients?.count} pagination={pagination} />
         </CardContent>
       </Card>
 
@@ -238,25 +256,46 @@ export function ClientsPage() {
             Совпадающие проживающие
           </Typography>
           <Stack direction={{ xs: 'column', md: 'row' }} spacing={2} my={2}>
-            <DatePicker label="С" value={overlapStart} onChange={setOverlapStart} />
-            <DatePicker label="По" value={overlapEnd} onChange={setOverlapEnd} />
+            <DatePicker
+              label="С"
+              value={overlapStart}
+              onChange={(value) => {
+                setOverlapStart(value);
+                overlapPagination.setPage(0);
+              }}
+            />
+            <DatePicker
+              label="По"
+              value={overlapEnd}
+              onChange={(value) => {
+                setOverlapEnd(value);
+                overlapPagination.setPage(0);
+              }}
+            />
           </Stack>
           <Table size="small">
             <TableHead>
               <TableRow>
                 <TableCell>Клиент</TableCell>
                 <TableCell>Город</TableCell>
+                <TableCell>Номер</TableCell>
+                <TableCell>Вместе</TableCell>
               </TableRow>
             </TableHead>
             <TableBody>
-              {overlapping?.map((client) => (
-                <TableRow key={client.id}>
-                  <TableCell>{client.full_name}</TableCell>
-                  <TableCell>{client.city}</TableCell>
+              {overlapping?.results.map((overlap) => (
+                <TableRow key={`${overlap.stay}-${overlap.other_stay}`}>
+                  <TableCell>{overlap.client.full_name}</TableCell>
+                  <TableCell>{overlap.client.city}</TableCell>
+                  <TableCell>{overlap.room_number}</TableCell>
+                  <TableCell>
+                    {overlap.overlap_start} — {overlap.overlap_end ?? 'по н.в.'}
+                  </TableCell>
                 </TableRow>
               ))}
             </TableBody>
           </Table>
+          <ListPagination count={overlapping?.count} pagination={overlapPagination} />
         </DialogContent>
         <DialogActions>
           <Button onClick={() => setSelectedClient(null)}>Закрыть</Button>
@@ -12,7 +12,8 @@ export function DashboardPage() {
     quarter,
     year,
   });
-  const { data: employees, isLoading: employeesLoading } = useGetEmployeesQuery();
+  // Для карточки нужен только count: страница из одной строки.
+  const { data: employees, isLoading: employeesLoading } = useGetEmployeesQuery({ limit: 1 });
 
   const cards = [
     {
@@ -31,7 +32,7 @@ export function DashboardPage() {
     },
     {
       title: 'Сотрудники уборки',
-      value: employees?.length ?? '—',
+      value: employees?.count ?? '—',
       loading: employeesLoading,
       description: 'Количество активных сотрудников',
     },
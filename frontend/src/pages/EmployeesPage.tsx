@@ -22,6 +22,8 @@ import {
 import DeleteIcon from '@mui/icons-material/Delete';
 import { useState } from 'react';
 
+import { ListPagination } from '../components/ListPagination';
+import { usePagination } from '../hooks';
 import {
   useCreateEmployeeMutation,
   useFireEmployeeMutation,
@@ -42,7 +44,8 @@ const weekdayOptions = [
 ];
 
 export function EmployeesPage() {
-  const { data: employees } = useGetEmployeesQuery();
+  const pagination = usePagination();
+  const { data: employees } = useGetEmployeesQuery(pagination.pageParams);
   const [createDialogOpen, setCreateDialogOpen] = useState(false);
   const [scheduleDialog, setScheduleDialog] = useState<Employee | null>(null);
   const [assignments, setAssignments] = useState<CleaningAssignment[]>([]);
@@ -157,7 +160,7 @@ export function EmployeesPage() {
               </TableRow>
             </TableHead>
             <TableBody>
-              {employees?.map((employee) => (
+              {employees?.results.map((employee) => (
                 <TableRow key={employee.id}>
                   <TableCell>{`${employee.last_name} ${employee.first_name}`}</TableCell>
                   <TableCell>{employee.status === 'active' ? 'Работает' : 'Уволен'}</TableCell>
@@ -190,6 +193,7 @@ export function EmployeesPage() {
               ))}
             </TableBody>
           </Table>
+          <ListPagination count={employees?.count} pagination={pagination} />
         </CardContent>
       </Card>
 
@@ -21,6 +21,8 @@ import { DatePicker } from '@mui/x-date-pickers';
 import dayjs, { Dayjs } from 'dayjs';
 import { useMemo, useState } from 'react';
 
+import { ListPagination } from '../components/ListPagination';
+import { usePagination } from '../hooks';
 import {
   useGetFreeRoomsQuery,
   useGetRoomClientsQuery,
@@ -40,9 +42,11 @@ export function RoomsPage() {
   const [startDate, setStartDate] = useState<Dayjs | null>(dayjs().subtract(7, 'day'));
   const [endDate, setEndDate] = useState<Dayjs | null>(dayjs());
 
+  const pagination = usePagination();
   const { data: rooms } = useGetRoomsQuery({
     room_type: roomType || undefined,
     floor: floor ? Number(floor) : undefined,
+    ...pagination.pageParams,
   });
   const { data: freeSummary } = useGetFreeRoomsQuery();
 
@@ -59,11 +63,6 @@ export function RoomsPage() {
 
   const { data: roomHistory } = useGetRoomClientsQuery(roomHistoryParams ?? skipToken);
 
-  const floorsOptions = useMemo(() => {
-    const unique = new Set((rooms ?? []).map((room) => room.floor));
-    return Array.from(unique.values()).sort((a, b) => a - b);
-  }, [rooms]);
-
   return (
     <Stack spacing={3}>
       <Card>
@@ -81,7 +80,10 @@ export function RoomsPage() {
               select
               fullWidth
               value={roomType}
-              onChange={(event) => setRoomType(event.target.value)}
+              onChange={(event) => {
+                setRoomType(event.target.value);
+                pagination.setPage(0);
+              }}
             >
               <MenuItem value="">Любой</MenuItem>
               {Object.entries(roomTypeLabels).map(([value, label]) => (
@@ -90,20 +92,18 @@ export function RoomsPage() {
                 </MenuItem>
               ))}
             </TextField>
+            {/* Этажи не выводятся из загруженных строк: на странице видна только часть номеров. */}
             <TextField
               label="Этаж"
-              select
+              type="number"
               fullWidth
               value={floor}
-              onChange={(event) => setFloor(event.target.value)}
-            >
-              <MenuItem value="">Любой</MenuItem>
-              {floorsOptions.map((value) => (
-                <MenuItem key={value} value={value}>
-                  {value}
-                </MenuItem>
-              ))}
-            </TextField>
+              onChange={(event) => {
+                setFloor(event.target.value);
+                pagination.setPage(0);
+              }}
+              slotProps={{ htmlInput: { min: 1 } }}
+            />
           </Stack>
         </CardContent>
       </Card>
@@ -130,7 +130,7 @@ export function RoomsPage() {
                 </TableRow>
               </TableHead>
               <TableBody>
-                {rooms?.map((room) => (
+                {rooms?.results.map((room) => (
                   <TableRow key={room.id}>
                     <TableCell>{room.number}</TableCell>
                     <TableCell>{room.floor}</TableCell>
@@ -148,6 +148,7 @@ export function RoomsPage() {
               </TableBody>
             </Table>
           </Box>
+          <ListPagination count={rooms?.count} pagination={pagination} />
         </CardContent>
       </Card>
 
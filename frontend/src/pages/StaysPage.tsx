@@ -13,11 +13,14 @@ import {
 } from '@mui/material';
 import { useState } from 'react';
 
+import { ListPagination } from '../components/ListPagination';
+import { usePagination } from '../hooks';
 import { useGetStaysQuery } from '../services/api';
 
 export function StaysPage() {
   const [status, setStatus] = useState('');
-  const { data: stays } = useGetStaysQuery(status ? { status } : undefined);
+  const pagination = usePagination();
+  const { data: stays } = useGetStaysQuery({ ...(status ? { status } : {}), ...pagination.pageParams });
 
   return (
     <Stack spacing={3}>
@@ -27,7 +30,10 @@ export function StaysPage() {
             select
             label="Статус"
             value={status}
-            onChange={(event) => setStatus(event.target.value)}
+            onChange={(event) => {
+              setStatus(event.target.value);
+              pagination.setPage(0);
+            }}
             sx={{ width: 240 }}
           >
             <MenuItem value="">Все</MenuItem>
@@ -54,7 +60,7 @@ export function StaysPage() {
               </TableRow>
             </TableHead>
             <TableBody>
-              {stays?.map((stay) => (
+              {stays?.results.map((stay) => (
                 <TableRow key={stay.id}>
                   <TableCell>{stay.client}</TableCell>
                   <TableCell>{stay.room}</TableCell>
@@ -66,6 +72,7 @@ export function StaysPage() {
               ))}
             </TableBody>
           </Table>
+          <ListPagination count={stays?.count} pagination={pagination} />
         </CardContent>
       </Card>
     </Stack>
@@ -5,6 +5,7 @@ import type {
   Client,
   Employee,
   FreeRoomsSummary,
+  OverlappingStay,
   QuarterlyReport,
   Room,
   RoomStay,
@@ -14,24 +15,49 @@ import type {
 const baseUrl = import.meta.env.VITE_API_BASE_URL ?? 'http://127.0.0.1:8000/api';
 
 interface PaginatedResponse<T> {
+  count?: number;
   results?: T[];
   next?: string | null;
   previous?: string | null;
 }
 
+export interface ListPage<T> {
+  count: number;
+  results: T[];
+}
+
+export interface PageParams {
+  limit?: number;
+  offset?: number;
+}
+
+// Списки на бэкенде пагинируются; админка листает их в offset-режиме (?limit=&offset=) и показывает count.
+export const ADMIN_PAGE_SIZE = 50;
+
+const toPage = <T,>(response: PaginatedResponse<T> | T[]): ListPage<T> => {
+  if (Array.isArray(response)) {
+    return { count: response.length, results: response };
+  }
+  const results = response.results ?? [];
+  return { count: response.count ?? results.length, results };
+};
+
 export const api = createApi({
   reducerPath: 'api',
   baseQuery: fetchBaseQuery({
     baseUrl,
+    // Cookie db_primary_until: после записи бэкенд какое-то время читает для админки только из основной БД.
+    credentials: 'include',
   }),
   tagTypes: ['Rooms', 'Clients', 'Employees', 'Stays', 'Reports'],
   endpoints: (builder) => ({
-    getRooms: builder.query<Room[], { room_type?: string; floor?: number } | void>({
+    getRooms: builder.query<ListPage<Room>, ({ room_type?: string; floor?: number } & PageParams) | void>({
       query: (params) => ({
         url: '/rooms/',
-        params: params ?? undefined,
+        params: { limit: ADMIN_PAGE_SIZE, ...(params ?? {}) },
       }),
       providesTags: ['Rooms'],
+      transformResponse: toPage<Room>,
     }),
     getFreeRooms: builder.query<FreeRoomsSummary, void>({
       query: () => '/rooms/free-count/',
@@ -47,25 +73,21 @@ export const api = createApi({
       }),
       providesTags: ['Stays'],
     }),
-    getClients: builder.query<Client[], { city?: string } | void>({
+    getClients: builder.query<ListPage<Client>, ({ city?: string } & PageParams) | void>({
       query: (params) => ({
         url: '/clients/',
-        params: params ?? undefined,
+        params: { limit: ADMIN_PAGE_SIZE, ...(params ?? {}) },
       }),
       providesTags: ['Clients'],
-      transformResponse: (response: PaginatedResponse<Client> | Client[]) => {
-        if (Array.isArray(response)) {
-          return response;
-        }
-        return response.results ?? [];
-      },
-    }),
-    getStays: builder.query<Stay[], { status?: string } | void>({
+      transformResponse: toPage<Client>,
+    }),
+    getStays: builder.query<ListPage<Stay>, ({ status?: string } & PageParams) | void>({
       query: (params) => ({
         url: '/stays/',
-        params: params ?? undefined,
+        params: { limit: ADMIN_PAGE_SIZE, ...(params ?? {}) },
       }),
       providesTags: ['Stays'],
+      transformResponse: toPage<Stay>,
     }),
     createClient: builder.mutation<Client, Partial<Client>>({
       query: (body) => ({
@@ -80,13 +102,14 @@ export const api = createApi({
       providesTags: ['Stays'],
     }),
     getOverlappingClients: builder.query<
-      Client[],
-      { clientId: number; start: string; end: string }
+      ListPage<OverlappingStay>,
+      { clientId: number; start: string; end: string } & PageParams
     >({
-      query: ({ clientId, start, end }) => ({
+      query: ({ clientId, start, end, limit = ADMIN_PAGE_SIZE, offset }) => ({
         url: `/clients/${clientId}/overlaps/`,
-        params: { start, end },
+        params: { start, end, limit, offset },
       }),
+      transformResponse: toPage<OverlappingStay>,
     }),
     createStay: builder.mutation<Stay, Partial<Stay>>({
       query: (body) => ({
@@ -107,9 +130,13 @@ export const api = createApi({
       }),
       invalidatesTags: ['Stays', 'Rooms', 'Reports'],
     }),
-    getEmployees: builder.query<Employee[], void>({
-      query: () => '/employees/',
+    getEmployees: builder.query<ListPage<Employee>, PageParams | void>({
+      query: (params) => ({
+        url: '/employees/',
+        params: { limit: ADMIN_PAGE_SIZE, ...(params ?? {}) },
+      }),
       providesTags: ['Employees'],
+      transformResponse: toPage<Employee>,
     }),
     createEmployee: builder.mutation<Employee, Partial<Employee>>({
       query: (body) => ({
@@ -10,6 +10,8 @@ export interface Room {
   phone_number: string;
   is_active: boolean;
   occupied_places: number;
+  free_places: number;
+  is_full: boolean;
 }
 
 export interface Client {
@@ -48,6 +50,21 @@ export interface RoomStay {
   total_cost: string;
 }
 
+export interface OverlappingStay {
+  source_client: number;
+  client: {
+    id: number;
+    full_name: string;
+    city: string;
+  };
+  room: number;
+  room_number: number;
+  stay: number;
+  other_stay: number;
+  overlap_start: string;
+  overlap_end?: string | null;
+}
+
 export interface Employee {
   id: number;
   last_name: string;
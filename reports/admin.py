@@ -1,3 +1,30 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import QuarterlyFloorStat, QuarterlyReportSnapshot, QuarterlyRoomStat, ReportJob
+
+
+class QuarterlyRoomStatInline(admin.TabularInline):
+    model = QuarterlyRoomStat
+    extra = 0
+    readonly_fields = ('room', 'room_number', 'client_count', 'total_income')
+
+
+class QuarterlyFloorStatInline(admin.TabularInline):
+    model = QuarterlyFloorStat
+    extra = 0
+    readonly_fields = ('floor', 'room_count')
+
+
+@admin.register(QuarterlyReportSnapshot)
+class QuarterlyReportSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('year', 'quarter', 'total_income', 'refreshed_at')
+    list_filter = ('year', 'quarter')
+    readonly_fields = ('year', 'quarter', 'total_income', 'refreshed_at')
+    inlines = [QuarterlyRoomStatInline, QuarterlyFloorStatInline]
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'created_at', 'started_at', 'finished_at')
+    list_filter = ('kind', 'status')
+    readonly_fields = ('kind', 'params', 'status', 'result', 'error', 'created_at', 'started_at', 'finished_at')
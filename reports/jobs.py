@@ -0,0 +1,105 @@
+import json
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from common.utils import ensure_period
+from config.db_routing import call_with_replica_fallback, replica_reads
+from .models import ReportJob
+from .occupancy import occupancy_report, parse_occupancy_params
+from .ranges import compute_range_report, parse_range_params
+from .services import (
+    REPORT_EXPORT_HEADER,
+    compute_income,
+    get_quarterly_report,
+    iter_quarterly_rows,
+    parse_quarter_params,
+    parse_year_range,
+    year_range_quarters,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_period(params) -> dict:
+    start, end = ensure_period(params.get('start'), params.get('end'))
+    return {'start': start, 'end': end}
+
+
+def _parse_quarter(params) -> dict:
+    year, quarter = parse_quarter_params(params)
+    return {'year': year, 'quarter': quarter}
+
+
+def _parse_year_range(params) -> dict:
+    start_year, end_year = parse_year_range(params)
+    return {'start_year': start_year, 'end_year': end_year}
+
+
+def _quarterly_range(start_year: int, end_year: int) -> dict:
+    # Табличный результат скачивается и как CSV/NDJSON; суммы — строками, как в синхронной выгрузке.
+    rows = iter_quarterly_rows(year_range_quarters(start_year, end_year))
+    return {
+        'header': REPORT_EXPORT_HEADER,
+        'rows': [[str(value) if isinstance(value, Decimal) else value for value in row] for row in rows],
+    }
+
+
+# Вид отчёта -> (разбор параметров, расчёт). Параметры те же, что у синхронных эндпоинтов.
+REPORT_JOBS = {
+    ReportJob.Kind.QUARTERLY: (_parse_quarter, get_quarterly_report),
+    ReportJob.Kind.QUARTERLY_RANGE: (_parse_year_range, _quarterly_range),
+    ReportJob.Kind.INCOME: (_parse_period, compute_income),
+    ReportJob.Kind.OCCUPANCY: (parse_occupancy_params, occupancy_report),
+    ReportJob.Kind.RANGE: (parse_range_params, compute_range_report),
+}
+
+
+def parse_job_params(kind: str, params: dict) -> dict:
+    parse, _ = REPORT_JOBS[kind]
+    return parse(params)
+
+
+def claim_report_jobs(limit: int) -> list[int]:
+    """Забирает до limit задач из очереди. Условный UPDATE не даст двум воркерам взять одну задачу."""
+    claimed = []
+    pending = ReportJob.objects.filter(status=ReportJob.Status.PENDING).order_by('created_at', 'id')
+    for job_id in pending.values_list('pk', flat=True)[:limit]:
+        taken = ReportJob.objects.filter(pk=job_id, status=ReportJob.Status.PENDING).update(
+            status=ReportJob.Status.RUNNING, started_at=timezone.now(),
+        )
+        if taken:
+            claimed.append(job_id)
+    return claimed
+
+
+def requeue_stale_report_jobs(timeout: int) -> int:
+    """Возвращает в очередь задачи, чей воркер пропал, не закончив их за timeout секунд."""
+    return ReportJob.objects.filter(
+        status=ReportJob.Status.RUNNING, started_at__lt=timezone.now() - timedelta(seconds=timeout),
+    ).update(status=ReportJob.Status.PENDING, started_at=None)
+
+
+def fail_report_job(job_id: int, error: str) -> None:
+    ReportJob.objects.filter(pk=job_id).update(status=ReportJob.Status.FAILED, error=error, finished_at=timezone.now())
+
+
+def run_report_job(job_id: int) -> str:
+    job = ReportJob.objects.get(pk=job_id)
+    parse, compute = REPORT_JOBS[job.kind]
+    try:
+        with replica_reads():
+            result = call_with_replica_fallback(compute, **parse(job.params))
+    except Exception as exc:
+        logger.exception('Фоновый отчёт #%s завершился ошибкой', job_id)
+        fail_report_job(job_id, str(exc) or exc.__class__.__name__)
+        return ReportJob.Status.FAILED
+    # Тот же рендерер, что у синхронных эндпоинтов: decimal и даты в результате выглядят так же.
+    job.result = json.loads(JSONRenderer().render(result))
+    job.status = ReportJob.Status.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=['result', 'status', 'finished_at'])
+    return ReportJob.Status.DONE
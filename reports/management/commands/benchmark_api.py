@@ -0,0 +1,108 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client as HttpClient
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from employees.models import CleaningAssignment
+from reports.services import quarter_of
+from stays.models import Stay
+
+
+class Command(BaseCommand):
+    help = 'Замеряет время и число SQL-запросов основных эндпоинтов API и сохраняет результат в JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Сколько раз вызывать каждый эндпоинт.')
+        parser.add_argument('--output', help='Куда сохранить результат (JSON).')
+        parser.add_argument('--compare', help='JSON с базовой линией для сравнения.')
+        parser.add_argument('--tolerance', type=float, default=1.25, help='Допустимый рост медианы относительно базовой линии.')
+
+    def handle(self, *args, **options):
+        endpoints = self._endpoints()
+        if not endpoints:
+            raise CommandError('В базе нет проживаний: сначала выполните seed_hotel.')
+
+        http = HttpClient()
+        results = {}
+        # Замеряется работа эндпоинтов, а не кешей: все кеши чтения отключены.
+        with override_settings(
+            ROOMS_FREE_COUNT_CACHE_TTL=0,
+            CLIENT_OVERLAPS_CACHE_TTL=0,
+            RESPONSE_CACHE_TTL=0,
+            API_QUERY_BUDGET_STRICT=False,
+        ):
+            for name, url in endpoints.items():
+                durations = []
+                queries = 0
+                status_code = None
+                for _ in range(options['repeat']):
+                    with CaptureQueriesContext(connection) as ctx:
+                        started = time.perf_counter()
+                        response = http.get(url)
+                        if response.streaming:
+                            b''.join(response.streaming_content)
+                        durations.append((time.perf_counter() - started) * 1000)
+                    queries = len(ctx.captured_queries)
+                    status_code = response.status_code
+                results[name] = {
+                    'url': url,
+                    'status': status_code,
+                    'queries': queries,
+                    'median_ms': round(statistics.median(durations), 2),
+                    'max_ms': round(max(durations), 2),
+                }
+                self.stdout.write(
+                    f'{name:<24} {status_code} {queries:>5} запросов  median {results[name]["median_ms"]:>9.2f} мс'
+                )
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+            self.stdout.write(f'Результат сохранён в {options["output"]}.')
+        if options['compare']:
+            self._compare(results, json.loads(Path(options['compare']).read_text(encoding='utf-8')), options['tolerance'])
+
+    def _endpoints(self) -> dict[str, str]:
+        active = Stay.objects.active().select_related('room').order_by('id').first()
+        sample = active or Stay.objects.select_related('room').order_by('-check_in').first()
+        if not sample:
+            return {}
+        year, quarter = quarter_of(timezone.localdate())
+        year, quarter = (year - 1, 4) if quarter == 1 else (year, quarter - 1)
+        start = sample.check_in.isoformat()
+        end = (sample.check_out or timezone.localdate()).isoformat()
+        weekday = CleaningAssignment.WEEKDAYS[sample.check_in.weekday()][0]
+        return {
+            'rooms_list': '/api/rooms/',
+            'rooms_free_count': '/api/rooms/free-count/',
+            'rooms_available': f'/api/rooms/available/?start={start}&end={end}',
+            'room_clients': f'/api/rooms/{sample.room_id}/clients/?start={start}&end={end}',
+            'clients_list': '/api/clients/',
+            'client_overlaps': f'/api/clients/{sample.client_id}/overlaps/?start={start}&end={end}',
+            'stays_list': '/api/stays/',
+            'quarterly_report': f'/api/reports/quarterly/?quarter={quarter}&year={year}',
+            'employees_who_cleans': f'/api/employees/who-cleans/?client_id={sample.client_id}&weekday={weekday}',
+        }
+
+    def _compare(self, results: dict, baseline: dict, tolerance: float):
+        regressions = []
+        for name, current in results.items():
+            previous = baseline.get(name)
+            if not previous:
+                continue
+            ratio = current['median_ms'] / previous['median_ms'] if previous['median_ms'] else 1
+            line = (
+                f'{name:<24} {previous["median_ms"]:>9.2f} → {current["median_ms"]:>9.2f} мс (x{ratio:.2f}), '
+                f'запросы {previous["queries"]} → {current["queries"]}'
+            )
+            if ratio > tolerance or current['queries'] > previous['queries']:
+                regressions.append(line)
+                line += '  РЕГРЕССИЯ'
+            self.stdout.write(line)
+        if regressions:
+            raise CommandError(f'Обнаружены регрессии: {len(regressions)}.')
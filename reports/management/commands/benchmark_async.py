@@ -0,0 +1,113 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from config.asgi import application
+from reports.services import quarter_of
+from rooms.models import Room
+from stays.models import Stay
+
+
+async def _asgi_get(host: str, url: str) -> int:
+    """Один GET через ASGI-приложение целиком (middleware, ThreadSensitiveContext), без сети."""
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': parts.path,
+        'raw_path': parts.path.encode(),
+        'query_string': parts.query.encode(),
+        'root_path': '',
+        'headers': [(b'host', host.encode())],
+        'server': (host, 80),
+        'client': ('127.0.0.1', 50000),
+    }
+    body_sent = False
+    status = None
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    return status
+
+
+class Command(BaseCommand):
+    help = 'Нагрузочное сравнение синхронных и async-эндпоинтов через ASGI при заданном числе одновременных соединений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=200, help='Одновременных соединений.')
+        parser.add_argument('--requests', type=int, default=1000, help='Запросов на эндпоинт.')
+
+    def handle(self, *args, **options):
+        if not Stay.objects.exists():
+            raise CommandError('В базе нет проживаний: сначала выполните seed_hotel.')
+        year, quarter = quarter_of(timezone.localdate())
+        pairs = {
+            'rooms list': '/api/rooms/',
+            'rooms detail': f'/api/rooms/{Room.objects.order_by("pk").values_list("pk", flat=True).first()}/',
+            'clients list': '/api/clients/',
+            'stays list': '/api/stays/?status=active',
+            'free count': '/api/rooms/free-count/',
+            'quarterly report': f'/api/reports/quarterly/?year={year}&quarter={quarter}',
+        }
+        host = next((item for item in settings.ALLOWED_HOSTS if item != '*' and not item.startswith('.')), 'localhost')
+        concurrency, total = options['concurrency'], options['requests']
+        self.stdout.write(f'{concurrency} соединений, {total} запросов на эндпоинт')
+        # Замеряется работа эндпоинтов, а не кешей: все кеши чтения отключены.
+        with override_settings(
+            ROOMS_FREE_COUNT_CACHE_TTL=0,
+            CLIENT_OVERLAPS_CACHE_TTL=0,
+            RESPONSE_CACHE_TTL=0,
+            API_QUERY_BUDGET_STRICT=False,
+        ):
+            for name, url in pairs.items():
+                sync = asyncio.run(self._load(host, url, concurrency, total))
+                async_ = asyncio.run(self._load(host, url.replace('/api/', '/api/async/', 1), concurrency, total))
+                self.stdout.write(
+                    f'{name:<17} sync {sync["rps"]:>8.1f} rps p95 {sync["p95_ms"]:>8.1f} мс | '
+                    f'async {async_["rps"]:>8.1f} rps p95 {async_["p95_ms"]:>8.1f} мс | x{async_["rps"] / sync["rps"]:.2f}'
+                    + ('' if sync['errors'] == async_['errors'] == 0 else f'  ошибок: {sync["errors"]}/{async_["errors"]}')
+                )
+
+    @staticmethod
+    async def _load(host: str, url: str, concurrency: int, total: int) -> dict:
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        errors = 0
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                status = await _asgi_get(host, url)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if status != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+        return {
+            'rps': total / elapsed,
+            'p95_ms': statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0],
+            'errors': errors,
+        }
@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from clients.serializers import ClientSerializer, ClientValuesSerializer
+from clients.views import ClientViewSet
+from employees.serializers import EmployeeSerializer, EmployeeValuesSerializer
+from employees.views import EmployeeViewSet
+from rooms.serializers import RoomSerializer, RoomValuesSerializer
+from rooms.views import RoomViewSet
+from stays.serializers import StaySerializer, StayValuesSerializer
+from stays.views import StayViewSet
+
+RESOURCES = {
+    'stays': (StayViewSet, StaySerializer, StayValuesSerializer),
+    'clients': (ClientViewSet, ClientSerializer, ClientValuesSerializer),
+    'rooms': (RoomViewSet, RoomSerializer, RoomValuesSerializer),
+    'employees': (EmployeeViewSet, EmployeeSerializer, EmployeeValuesSerializer),
+}
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает скорость ModelSerializer и сериализации из .values() (строк в секунду) на данных из базы.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help='Сколько строк брать на ресурс.')
+        parser.add_argument('--repeat', type=int, default=3, help='Лучший из N прогонов.')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        renderer = JSONRenderer()
+        measured = 0
+        for name, (viewset, model_serializer, values_serializer) in RESOURCES.items():
+            ordering = viewset.pagination_ordering
+            queryset = viewset.queryset.order_by(*ordering)
+            if not queryset.exists():
+                continue
+            ids = list(queryset.values_list('pk', flat=True)[:rows])
+
+            def run_model():
+                return model_serializer(queryset.filter(pk__in=ids), many=True).data
+
+            def run_values():
+                reader = values_serializer()
+                fields = reader.value_fields(*(item.lstrip('-') for item in ordering))
+                return reader.serialize(queryset.prefetch_related(None).filter(pk__in=ids).values(*fields))
+
+            before, before_data = self._best(run_model, repeat)
+            after, after_data = self._best(run_values, repeat)
+            same = renderer.render(before_data) == renderer.render(after_data)
+            self.stdout.write(
+                f'{name:<10} {len(ids):>6} строк  ModelSerializer {len(ids) / before:>10.0f} строк/с  '
+                f'.values() {len(ids) / after:>10.0f} строк/с  x{before / after:.1f}  '
+                f'{"JSON совпадает" if same else "JSON ОТЛИЧАЕТСЯ"}'
+            )
+            if not same:
+                raise CommandError(f'{name}: ответы сериализаторов различаются.')
+            measured += 1
+        if not measured:
+            raise CommandError('База пуста: сначала выполните seed_hotel.')
+
+    @staticmethod
+    def _best(run, repeat: int) -> tuple[float, list]:
+        best, data = None, None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            data = run()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, data
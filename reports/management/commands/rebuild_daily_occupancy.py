@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from common.utils import parse_date_param
+from reports.occupancy import rebuild_daily_occupancy
+from stays.models import Stay
+
+
+class Command(BaseCommand):
+    help = 'Полностью пересчитывает таблицу загрузки по дням (проход по заселениям и выездам).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='Первый день (YYYY-MM-DD); по умолчанию — первое заселение.')
+        parser.add_argument('--end', help='Последний день (YYYY-MM-DD); по умолчанию — сегодня.')
+
+    def handle(self, *args, **options):
+        try:
+            start = parse_date_param(options['start'], 'start') if options['start'] else None
+            end = parse_date_param(options['end'], 'end') if options['end'] else timezone.localdate()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if start is None:
+            start = Stay.objects.aggregate(first=Min('check_in'))['first']
+            if not start:
+                self.stdout.write('Проживаний нет — пересчитывать нечего.')
+                return
+        if start > end:
+            raise CommandError('Дата начала должна быть не позже даты окончания.')
+
+        rows = rebuild_daily_occupancy(start, end)
+        self.stdout.write(self.style.SUCCESS(f'Готово: {start} — {end}, строк: {rows}.'))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from reports.services import is_closed_quarter, quarter_boundaries, quarters_between, refresh_quarterly_snapshot
+from stays.models import Stay
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает снимки квартальных отчётов за закрытые кварталы.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='Год; по умолчанию — все годы с проживаниями.')
+        parser.add_argument('--quarter', type=int, help='Квартал (1-4); требует --year.')
+
+    def handle(self, *args, **options):
+        year = options['year']
+        quarter = options['quarter']
+        if quarter and not year:
+            raise CommandError('Параметр --quarter требует --year.')
+
+        if year and quarter:
+            try:
+                quarter_boundaries(year, quarter)
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            quarters = [(year, quarter)]
+        elif year:
+            quarters = [(year, item) for item in range(1, 5)]
+        else:
+            first = Stay.objects.aggregate(first=Min('check_in'))['first']
+            if not first:
+                self.stdout.write('Проживаний нет — пересчитывать нечего.')
+                return
+            quarters = quarters_between(first, max(first, timezone.localdate()))
+
+        refreshed = 0
+        for item_year, item_quarter in quarters:
+            if not is_closed_quarter(item_year, item_quarter):
+                continue
+            refresh_quarterly_snapshot(item_year, item_quarter)
+            refreshed += 1
+            self.stdout.write(f'{item_year} Q{item_quarter}: снимок обновлён.')
+
+        self.stdout.write(self.style.SUCCESS(f'Готово, обновлено снимков: {refreshed}.'))
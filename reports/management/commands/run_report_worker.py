@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from reports.jobs import claim_report_jobs, fail_report_job, requeue_stale_report_jobs
+from reports.models import ReportJob
+from reports.worker import execute_report_job, setup_worker_process
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые отчёты из очереди ReportJob в пуле процессов (по задаче на ядро).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='Размер пула процессов.')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Пауза между опросами очереди, сек.')
+        parser.add_argument('--once', action='store_true', help='Выполнить очередь и завершиться.')
+
+    def handle(self, *args, **options):
+        processes = max(options['processes'], 1)
+        requeued = requeue_stale_report_jobs(settings.REPORT_JOB_TIMEOUT)
+        if requeued:
+            self.stdout.write(f'Возвращено в очередь зависших задач: {requeued}.')
+        self.stdout.write(f'Воркер отчётов: {processes} процессов.')
+        try:
+            while not self._serve(processes, options['poll_interval'], options['once']):
+                self.stdout.write(self.style.WARNING('Пул процессов упал, перезапускаем.'))
+        except KeyboardInterrupt:
+            self.stdout.write('Остановлено.')
+
+    def _serve(self, processes: int, poll_interval: float, once: bool) -> bool:
+        """Крутит пул, пока есть работа; False — пул сломался и его нужно пересоздать."""
+        # Дочерним процессам не должны достаться открытые подключения родителя.
+        connections.close_all()
+        pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=setup_worker_process,
+        )
+        running = {}
+        try:
+            while True:
+                for job_id in claim_report_jobs(processes - len(running)):
+                    running[pool.submit(execute_report_job, job_id)] = job_id
+                    self.stdout.write(f'#{job_id}: запущен.')
+                if not running:
+                    if once:
+                        return True
+                    time.sleep(poll_interval)
+                    continue
+                done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        outcome = future.result()
+                    except BrokenProcessPool as exc:
+                        fail_report_job(job_id, f'Процесс воркера завершился аварийно: {exc}')
+                        self.stdout.write(self.style.ERROR(f'#{job_id}: процесс воркера упал.'))
+                        for other_job_id in running.values():
+                            fail_report_job(other_job_id, 'Процесс воркера завершился аварийно.')
+                        return False
+                    except Exception as exc:
+                        fail_report_job(job_id, str(exc) or exc.__class__.__name__)
+                        outcome = ReportJob.Status.FAILED
+                    self.stdout.write(f'#{job_id}: {outcome}.')
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -1,10 +1,11 @@
 from datetime import date
 from decimal import Decimal
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 from clients.models import Client
 from employees.models import CleaningAssignment, Employee
+from reports.synthetic import SyntheticHotelGenerator
 from rooms.models import Room
 from stays.models import Stay
 
@@ -12,7 +13,36 @@ from stays.models import Stay
 class Command(BaseCommand):
     help = 'Наполняет базу демонстрационными данными гостиницы.'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, help='Сгенерировать указанное число номеров (синтетический режим).')
+        parser.add_argument('--clients', type=int, help='Сгенерировать указанное число клиентов (синтетический режим).')
+        parser.add_argument('--years', type=int, default=3, help='Глубина истории проживаний в годах.')
+        parser.add_argument('--seed', type=int, default=42, help='Зерно генератора случайных чисел.')
+        parser.add_argument('--occupancy', type=float, default=0.7, help='Средняя загрузка номеров (0..1).')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--clear', action='store_true', help='Удалить номера, клиентов, проживания и сотрудников перед генерацией.')
+
     def handle(self, *args, **options):
+        if options['rooms'] or options['clients']:
+            generator = SyntheticHotelGenerator(
+                rooms=options['rooms'] or 100,
+                clients=options['clients'] or 10000,
+                years=options['years'],
+                seed=options['seed'],
+                occupancy=options['occupancy'],
+                batch_size=options['batch_size'],
+                stdout=self.stdout,
+            )
+            if options['clear']:
+                generator.clear()
+            elif Room.objects.exists():
+                raise CommandError('В базе уже есть номера: используйте --clear для синтетической генерации.')
+            generator.run()
+            self.stdout.write(self.style.SUCCESS('Синтетические данные сгенерированы.'))
+            return
+        self.seed_demo()
+
+    def seed_demo(self):
         self.stdout.write('Создаю номера...')
         rooms = [
             {'number': 101, 'floor': 1, 'room_type': Room.RoomType.SINGLE, 'daily_rate': Decimal('3500'), 'phone_number': '1001'},
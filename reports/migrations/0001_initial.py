@@ -0,0 +1,65 @@
+# Generated by Django 5.1.1 on 2026-10-18 13:55
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('rooms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuarterlyReportSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('quarter', models.PositiveSmallIntegerField()),
+                ('total_income', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Снимок квартального отчёта',
+                'verbose_name_plural': 'Снимки квартальных отчётов',
+                'ordering': ['-year', '-quarter'],
+                'constraints': [models.UniqueConstraint(fields=('year', 'quarter'), name='unique_report_snapshot_per_quarter')],
+            },
+        ),
+        migrations.CreateModel(
+            name='QuarterlyFloorStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('floor', models.PositiveSmallIntegerField()),
+                ('room_count', models.PositiveIntegerField(default=0)),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='floor_stats', to='reports.quarterlyreportsnapshot')),
+            ],
+            options={
+                'verbose_name': 'Показатели этажа за квартал',
+                'verbose_name_plural': 'Показатели этажей за квартал',
+                'ordering': ['floor'],
+                'constraints': [models.UniqueConstraint(fields=('snapshot', 'floor'), name='unique_floor_stat_per_snapshot')],
+            },
+        ),
+        migrations.CreateModel(
+            name='QuarterlyRoomStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room_number', models.PositiveIntegerField()),
+                ('client_count', models.PositiveIntegerField(default=0)),
+                ('total_income', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quarterly_stats', to='rooms.room')),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='room_stats', to='reports.quarterlyreportsnapshot')),
+            ],
+            options={
+                'verbose_name': 'Показатели номера за квартал',
+                'verbose_name_plural': 'Показатели номеров за квартал',
+                'ordering': ['room_number'],
+                'constraints': [models.UniqueConstraint(fields=('snapshot', 'room'), name='unique_room_stat_per_snapshot')],
+            },
+        ),
+    ]
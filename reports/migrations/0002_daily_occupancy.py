@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-18 14:09
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('floor', models.PositiveSmallIntegerField()),
+                ('room_type', models.CharField(max_length=16)),
+                ('rooms_total', models.PositiveIntegerField(default=0)),
+                ('places_total', models.PositiveIntegerField(default=0)),
+                ('rooms_occupied', models.PositiveIntegerField(default=0)),
+                ('guests', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14)),
+                ('revenue_nights', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Загрузка за день',
+                'verbose_name_plural': 'Загрузка по дням',
+                'ordering': ['date', 'floor', 'room_type'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'floor', 'room_type'), name='unique_daily_occupancy_slice')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_report_jobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reportjob',
+            name='kind',
+            field=models.CharField(choices=[('quarterly', 'Квартальный отчёт'), ('quarterly_range', 'Квартальные отчёты за годы'), ('income', 'Выручка за период'), ('occupancy', 'Загрузка за период'), ('range', 'Клиенты, ночи и выручка по интервалам')], max_length=32),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def reset_quarterly_snapshots(apps, schema_editor):
+    # Снимки закрытых кварталов считали выручку по дате выезда; после перехода на журнал выручки по ночам
+    # они пересоберутся при первом запросе отчёта.
+    QuarterlyReportSnapshot = apps.get_model('reports', 'QuarterlyReportSnapshot')
+    QuarterlyReportSnapshot.objects.using(schema_editor.connection.alias).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_report_job_range_kind'),
+        ('stays', '0003_revenue_ledger'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_quarterly_snapshots, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,110 @@
+from decimal import Decimal
+
 from django.db import models
 
-# Create your models here.
+
+class QuarterlyReportSnapshot(models.Model):
+    year = models.PositiveSmallIntegerField()
+    quarter = models.PositiveSmallIntegerField()
+    total_income = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0'))
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-year', '-quarter']
+        verbose_name = 'Снимок квартального отчёта'
+        verbose_name_plural = 'Снимки квартальных отчётов'
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'quarter'], name='unique_report_snapshot_per_quarter'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.year} Q{self.quarter}'
+
+
+class QuarterlyRoomStat(models.Model):
+    snapshot = models.ForeignKey(QuarterlyReportSnapshot, related_name='room_stats', on_delete=models.CASCADE)
+    room = models.ForeignKey('rooms.Room', related_name='quarterly_stats', on_delete=models.CASCADE)
+    room_number = models.PositiveIntegerField()
+    client_count = models.PositiveIntegerField(default=0)
+    total_income = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+
+    class Meta:
+        ordering = ['room_number']
+        verbose_name = 'Показатели номера за квартал'
+        verbose_name_plural = 'Показатели номеров за квартал'
+        constraints = [
+            models.UniqueConstraint(fields=['snapshot', 'room'], name='unique_room_stat_per_snapshot'),
+        ]
+
+
+class QuarterlyFloorStat(models.Model):
+    snapshot = models.ForeignKey(QuarterlyReportSnapshot, related_name='floor_stats', on_delete=models.CASCADE)
+    floor = models.PositiveSmallIntegerField()
+    room_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['floor']
+        verbose_name = 'Показатели этажа за квартал'
+        verbose_name_plural = 'Показатели этажей за квартал'
+        constraints = [
+            models.UniqueConstraint(fields=['snapshot', 'floor'], name='unique_floor_stat_per_snapshot'),
+        ]
+
+
+class DailyOccupancy(models.Model):
+    """Загрузка за день в разрезе этажа и типа номера; заполняется проходом по заселениям и выездам."""
+
+    date = models.DateField()
+    floor = models.PositiveSmallIntegerField()
+    room_type = models.CharField(max_length=16)
+    rooms_total = models.PositiveIntegerField(default=0)
+    places_total = models.PositiveIntegerField(default=0)
+    rooms_occupied = models.PositiveIntegerField(default=0)
+    guests = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0'))
+    revenue_nights = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['date', 'floor', 'room_type']
+        verbose_name = 'Загрузка за день'
+        verbose_name_plural = 'Загрузка по дням'
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'floor', 'room_type'], name='unique_daily_occupancy_slice'),
+        ]
+
+
+class ReportJob(models.Model):
+    """Отчёт, который считает фоновый воркер (run_report_worker), а не HTTP-запрос."""
+
+    class Kind(models.TextChoices):
+        QUARTERLY = 'quarterly', 'Квартальный отчёт'
+        QUARTERLY_RANGE = 'quarterly_range', 'Квартальные отчёты за годы'
+        INCOME = 'income', 'Выручка за период'
+        OCCUPANCY = 'occupancy', 'Загрузка за период'
+        RANGE = 'range', 'Клиенты, ночи и выручка по интервалам'
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Готов'
+        FAILED = 'failed', 'Ошибка'
+
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        verbose_name = 'Фоновый отчёт'
+        verbose_name_plural = 'Фоновые отчёты'
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='report_job_queue_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.get_kind_display()} #{self.pk} ({self.get_status_display()})'
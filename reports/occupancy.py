@@ -0,0 +1,224 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth, TruncQuarter, TruncWeek
+from django.utils import timezone
+
+from common.utils import ensure_period
+from rooms.models import Room
+from stays.models import RevenueEntry, Stay
+from .models import DailyOccupancy
+
+OCCUPANCY_MAX_DAYS = 1830
+OCCUPANCY_BUCKETS = ('day', 'week', 'month')
+# Поля номера, из которых складываются строки DailyOccupancy; изменение остальных таблицу не трогает.
+OCCUPANCY_ROOM_FIELDS = ('floor', 'room_type', 'capacity')
+BUCKET_TRUNC = {
+    'day': F('date'),
+    'week': TruncWeek('date'),
+    'month': TruncMonth('date'),
+    'quarter': TruncQuarter('date'),
+}
+
+
+def parse_bucket(value: str | None) -> str:
+    bucket = (value or 'day').lower()
+    if bucket not in OCCUPANCY_BUCKETS:
+        raise ValueError(f'Параметр bucket должен быть одним из: {", ".join(OCCUPANCY_BUCKETS)}.')
+    return bucket
+
+
+def parse_occupancy_params(params) -> dict:
+    start, end = ensure_period(params.get('start'), params.get('end'))
+    if (end - start).days >= OCCUPANCY_MAX_DAYS:
+        raise ValueError(f'Период не должен превышать {OCCUPANCY_MAX_DAYS} дней.')
+    room_type = params.get('room_type') or None
+    if room_type and room_type not in Room.RoomType.values:
+        raise ValueError('Неизвестный тип номера.')
+    return {
+        'start': start,
+        'end': end,
+        'bucket': parse_bucket(params.get('bucket')),
+        'floor': int(params['floor']) if params.get('floor') else None,
+        'room_type': room_type,
+    }
+
+
+def _stay_end(check_in: date, check_out: date | None, today: date) -> date:
+    # Открытое проживание занимает номер по сегодняшний день включительно.
+    return check_out or max(check_in, today) + timedelta(days=1)
+
+
+def build_daily_occupancy(start: date, end: date) -> list[DailyOccupancy]:
+    """Считает загрузку за [start, end] одним проходом по заселениям/выездам, без запроса на каждый день.
+
+    Истории номерного фонда нет: rooms_total и places_total за любой день — по текущему составу номеров,
+    поэтому после добавления номера или смены вместимости прошлые дни пересчитываются по новому фонду.
+    """
+    today = timezone.localdate()
+    days = (end - start).days + 1
+    rooms = {}
+    totals = {}
+    for room_id, floor, room_type, capacity in Room.objects.values_list('id', *OCCUPANCY_ROOM_FIELDS):
+        key = (floor, room_type)
+        rooms[room_id] = key
+        rooms_total, places_total = totals.get(key, (0, 0))
+        totals[key] = (rooms_total + 1, places_total + capacity)
+
+    guests = {key: [0] * (days + 1) for key in totals}
+    occupied = {key: [0] * (days + 1) for key in totals}
+    stays = (
+        Stay.objects.filter(check_in__lte=end)
+        .filter(Q(check_out__isnull=True) | Q(check_out__gt=start))
+        .order_by('room_id', 'check_in')
+        .values_list('room_id', 'check_in', 'check_out')
+    )
+    current_room, segment_start, segment_end = None, 0, 0
+
+    def close_segment():
+        if current_room is not None and segment_end > segment_start:
+            occupied[rooms[current_room]][segment_start] += 1
+            occupied[rooms[current_room]][segment_end] -= 1
+
+    for room_id, check_in, check_out in stays:
+        first = max((check_in - start).days, 0)
+        last = min((_stay_end(check_in, check_out, today) - start).days, days)
+        if first >= last:
+            continue
+        key = rooms[room_id]
+        guests[key][first] += 1
+        guests[key][last] -= 1
+        # Номер занят, если в нём есть хотя бы один гость: склеиваем пересекающиеся проживания в отрезки.
+        if room_id == current_room and first <= segment_end:
+            segment_end = max(segment_end, last)
+            continue
+        close_segment()
+        current_room, segment_start, segment_end = room_id, first, last
+    close_segment()
+
+    revenue = {
+        (row['date'], row['room__floor'], row['room__room_type']): (row['amount'], row['nights'])
+        for row in RevenueEntry.objects.between(start, end)
+        .values('date', 'room__floor', 'room__room_type')
+        .annotate(amount=Sum('amount'), nights=Sum('nights'))
+        .order_by()
+    }
+
+    result = []
+    for key, (rooms_total, places_total) in sorted(totals.items()):
+        floor, room_type = key
+        guest_count = occupied_count = 0
+        for index in range(days):
+            guest_count += guests[key][index]
+            occupied_count += occupied[key][index]
+            day = start + timedelta(days=index)
+            amount, nights = revenue.get((day, floor, room_type), (Decimal('0'), 0))
+            result.append(
+                DailyOccupancy(
+                    date=day,
+                    floor=floor,
+                    room_type=room_type,
+                    rooms_total=rooms_total,
+                    places_total=places_total,
+                    rooms_occupied=occupied_count,
+                    guests=guest_count,
+                    revenue=amount,
+                    revenue_nights=nights,
+                )
+            )
+    return result
+
+
+@transaction.atomic
+def rebuild_daily_occupancy(start: date, end: date, batch_size: int = 2000) -> int:
+    rows = build_daily_occupancy(start, end)
+    DailyOccupancy.objects.filter(date__range=(start, end)).delete()
+    DailyOccupancy.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def materialized_range() -> tuple[date | None, date | None]:
+    bounds = DailyOccupancy.objects.aggregate(first=Min('date'), last=Max('date'))
+    return bounds['first'], bounds['last']
+
+
+def ensure_daily_occupancy(start: date, end: date) -> None:
+    """Досчитывает недостающие дни по краям уже построенного диапазона, чтобы в таблице не было дыр."""
+    first, last = materialized_range()
+    if first is None:
+        rebuild_daily_occupancy(start, end)
+        return
+    if start < first:
+        rebuild_daily_occupancy(start, first - timedelta(days=1))
+    if end > last:
+        rebuild_daily_occupancy(last + timedelta(days=1), end)
+
+
+def refresh_daily_occupancy(start: date, end: date) -> None:
+    """Пересчитывает изменившийся период, но только в пределах уже построенной таблицы (и до сегодня)."""
+    first, last = materialized_range()
+    if first is None:
+        return
+    start = max(start, first)
+    end = min(end, timezone.localdate())
+    if end > last:
+        start = min(start, last + timedelta(days=1))
+    if start <= end:
+        rebuild_daily_occupancy(start, end)
+
+
+def rebuild_materialized_occupancy() -> None:
+    first, last = materialized_range()
+    if first is not None:
+        rebuild_daily_occupancy(first, last)
+
+
+def _percent(part, whole) -> float:
+    return round(part * 100 / whole, 2) if whole else 0.0
+
+
+def occupancy_series(start: date, end: date, bucket: str, floor: int | None = None, room_type: str | None = None) -> list[dict]:
+    qs = DailyOccupancy.objects.filter(date__range=(start, end))
+    if floor is not None:
+        qs = qs.filter(floor=floor)
+    if room_type:
+        qs = qs.filter(room_type=room_type)
+    rows = (
+        qs.annotate(bucket=BUCKET_TRUNC[bucket])
+        .values('bucket')
+        .annotate(
+            first_day=Min('date'),
+            last_day=Max('date'),
+            rooms_total=Sum('rooms_total'),
+            places_total=Sum('places_total'),
+            rooms_occupied=Sum('rooms_occupied'),
+            guests=Sum('guests'),
+            revenue=Sum('revenue'),
+            revenue_nights=Sum('revenue_nights'),
+        )
+        .order_by('bucket')
+    )
+    return [
+        {
+            'start': row['first_day'],
+            'end': row['last_day'],
+            'occupancy': _percent(row['rooms_occupied'], row['rooms_total']),
+            'guest_occupancy': _percent(row['guests'], row['places_total']),
+            'room_nights': row['rooms_occupied'],
+            'guest_nights': row['guests'],
+            'revenue': row['revenue'],
+            'adr': round(row['revenue'] / row['revenue_nights'], 2) if row['revenue_nights'] else None,
+        }
+        for row in rows
+    ]
+
+
+def occupancy_report(start: date, end: date, bucket: str, floor: int | None = None, room_type: str | None = None) -> dict:
+    end = min(end, timezone.localdate())
+    series = []
+    if start <= end:
+        ensure_daily_occupancy(start, end)
+        series = occupancy_series(start, end, bucket, floor=floor, room_type=room_type)
+    return {'period': {'start': start, 'end': end}, 'bucket': bucket, 'series': series}
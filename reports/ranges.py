@@ -0,0 +1,150 @@
+from array import array
+from bisect import bisect_right
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import accumulate, groupby
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from common.utils import ensure_period
+from stays.models import RevenueEntry, Stay
+from .occupancy import BUCKET_TRUNC
+
+RANGE_BUCKETS = ('day', 'week', 'month', 'quarter')
+RANGE_REPORT_MAX_DAYS = 3660
+
+
+def parse_range_params(params) -> dict:
+    start, end = ensure_period(params.get('start'), params.get('end'))
+    if (end - start).days >= RANGE_REPORT_MAX_DAYS:
+        raise ValueError(f'Период не должен превышать {RANGE_REPORT_MAX_DAYS} дней.')
+    bucket = (params.get('bucket') or 'month').lower()
+    if bucket not in RANGE_BUCKETS:
+        raise ValueError(f'Параметр bucket должен быть одним из: {", ".join(RANGE_BUCKETS)}.')
+    return {'start': start, 'end': end, 'bucket': bucket}
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """Начало интервала, как его возвращают TruncWeek/TruncMonth/TruncQuarter."""
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    if bucket == 'quarter':
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    return day
+
+
+def _next_bucket(day: date, bucket: str) -> date:
+    if bucket == 'day':
+        return day + timedelta(days=1)
+    if bucket == 'week':
+        return day + timedelta(days=7)
+    months = 3 if bucket == 'quarter' else 1
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def bucket_edges(start: date, end: date, bucket: str) -> list[date]:
+    """Границы интервалов: edges[i] — первый день i-го интервала, последняя граница — end + 1 день.
+
+    Крайние интервалы обрезаются по периоду.
+    """
+    edges = [start]
+    cursor = _next_bucket(bucket_start(start, bucket), bucket)
+    while cursor <= end:
+        edges.append(cursor)
+        cursor = _next_bucket(cursor, bucket)
+    edges.append(end + timedelta(days=1))
+    return edges
+
+
+def compute_range_report(start: date, end: date, bucket: str) -> dict:
+    """Клиенты, ночи и выручка по интервалам произвольного периода: один запрос проживаний и один — журнала выручки.
+
+    Проживания номера раскладываются по дням разностным массивом, ночи в интервале — разность префиксных сумм
+    на его границах. Клиенты считаются по тому же правилу пересечения, что и в квартальном отчёте, поэтому
+    интервал-квартал совпадает с /reports/quarterly/.
+    """
+    edges = bucket_edges(start, end, bucket)
+    origin = start.toordinal()
+    offsets = array('l', (edge.toordinal() - origin for edge in edges))
+    days = offsets[-1]
+    buckets = len(edges) - 1
+    # Открытое проживание занимает номер по сегодняшний день включительно.
+    open_end = (timezone.localdate() - start).days + 1
+
+    income = {
+        (row['bucket'], row['room_id']): row['total_income']
+        for row in RevenueEntry.objects.between(start, end)
+        .annotate(bucket=BUCKET_TRUNC[bucket])
+        .values('bucket', 'room_id')
+        .annotate(total_income=Sum('amount'))
+        .order_by()
+    }
+    keys = [bucket_start(edge, bucket) for edge in edges[:-1]]
+    bucket_income = dict.fromkeys(keys, Decimal('0'))
+    for (key, _), amount in income.items():
+        bucket_income[key] += amount
+
+    hotel_clients = [set() for _ in range(buckets)]
+    hotel_nights = array('l', [0]) * buckets
+    rooms_by_bucket = [[] for _ in range(buckets)]
+    stays = (
+        Stay.objects.in_period(start, end)
+        .order_by('room__number', 'room_id')
+        .values_list('room_id', 'room__number', 'client_id', 'check_in', 'check_out')
+    )
+    for (room_id, room_number), rows in groupby(stays, key=lambda row: (row[0], row[1])):
+        diff = array('l', [0]) * (days + 1)
+        clients = [None] * buckets
+        for _, _, client_id, check_in, check_out in rows:
+            first = check_in.toordinal() - origin
+            last = check_out.toordinal() - origin if check_out else days - 1
+            low = bisect_right(offsets, max(first, 0)) - 1
+            high = bisect_right(offsets, min(last, days - 1)) - 1
+            for index in range(low, high + 1):
+                if clients[index] is None:
+                    clients[index] = set()
+                clients[index].add(client_id)
+                hotel_clients[index].add(client_id)
+            nights_from = max(first, 0)
+            nights_to = min(last if check_out else max(first + 1, open_end), days)
+            if nights_from < nights_to:
+                diff[nights_from] += 1
+                diff[nights_to] -= 1
+
+        prefix = array('l', [0])
+        prefix.extend(accumulate(accumulate(diff[:days])))
+        for index in range(buckets):
+            nights = prefix[offsets[index + 1]] - prefix[offsets[index]]
+            hotel_nights[index] += nights
+            if clients[index] is None:
+                continue
+            rooms_by_bucket[index].append({
+                'room__id': room_id,
+                'room__number': room_number,
+                'client_count': len(clients[index]),
+                'nights': nights,
+                'total_income': income.get((keys[index], room_id), Decimal('0')),
+            })
+
+    series = [
+        {
+            'start': edges[index],
+            'end': edges[index + 1] - timedelta(days=1),
+            'client_count': len(hotel_clients[index]),
+            'nights': hotel_nights[index],
+            'total_income': bucket_income[keys[index]],
+            'rooms': rooms_by_bucket[index],
+        }
+        for index in range(buckets)
+    ]
+    return {
+        'period': {'start': start, 'end': end},
+        'bucket': bucket,
+        'total_income': sum((item['total_income'] for item in series), Decimal('0')),
+        'nights': sum(hotel_nights),
+        'series': series,
+    }
@@ -0,0 +1,30 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from .jobs import parse_job_params
+from .models import ReportJob
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    params = serializers.DictField(required=False, default=dict)
+    result_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = ['id', 'kind', 'params', 'status', 'error', 'created_at', 'started_at', 'finished_at', 'result_url']
+        read_only_fields = ['status', 'error', 'created_at', 'started_at', 'finished_at']
+
+    def validate(self, attrs):
+        # Параметры принимаются в том же виде, что query-параметры синхронного отчёта.
+        params = {key: str(value) for key, value in attrs.get('params', {}).items() if value is not None}
+        try:
+            parse_job_params(attrs['kind'], params)
+        except ValueError as exc:
+            raise serializers.ValidationError({'params': str(exc)})
+        attrs['params'] = params
+        return attrs
+
+    def get_result_url(self, obj: ReportJob) -> str | None:
+        if obj.status != ReportJob.Status.DONE:
+            return None
+        return reverse('reports-job-result', args=[obj.pk])
@@ -0,0 +1,266 @@
+from datetime import date
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Count, Prefetch, Sum
+from django.utils import timezone
+
+from common.aio import gather_isolated
+from common.conditional import queryset_fingerprint
+from common.response_cache import REPORTS_RESPONSES, invalidate_responses_on_commit
+from rooms.models import Room
+from stays.models import RevenueEntry, Stay
+from .models import QuarterlyFloorStat, QuarterlyReportSnapshot, QuarterlyRoomStat
+
+
+def quarter_boundaries(year: int, quarter: int) -> tuple[date, date]:
+    if quarter not in {1, 2, 3, 4}:
+        raise ValueError('Квартал должен быть числом от 1 до 4.')
+    start_month = (quarter - 1) * 3 + 1
+    start = date(year, start_month, 1)
+    if quarter == 4:
+        end = date(year + 1, 1, 1) - date.resolution
+    else:
+        end_month = start_month + 3
+        end = date(year, end_month, 1) - date.resolution
+    return start, end
+
+
+def parse_quarter_params(params) -> tuple[int, int]:
+    quarter = params.get('quarter')
+    year = params.get('year')
+    if not quarter or not year:
+        raise ValueError('Нужно указать quarter и year.')
+    return int(year), int(quarter)
+
+
+def parse_year_range(params) -> tuple[int, int]:
+    start_year = params.get('start_year')
+    if not start_year:
+        raise ValueError('Нужно указать start_year.')
+    start_year = int(start_year)
+    end_year = int(params.get('end_year') or start_year)
+    quarter_boundaries(start_year, 1)
+    quarter_boundaries(end_year, 4)
+    if start_year > end_year:
+        raise ValueError('start_year должен быть не больше end_year.')
+    return start_year, end_year
+
+
+def quarter_of(day: date) -> tuple[int, int]:
+    return day.year, (day.month - 1) // 3 + 1
+
+
+def quarters_between(start: date, end: date) -> list[tuple[int, int]]:
+    year, quarter = quarter_of(start)
+    last = quarter_of(end)
+    result = []
+    while (year, quarter) <= last:
+        result.append((year, quarter))
+        year, quarter = (year + 1, 1) if quarter == 4 else (year, quarter + 1)
+    return result
+
+
+def is_closed_quarter(year: int, quarter: int) -> bool:
+    _, end = quarter_boundaries(year, quarter)
+    return end < timezone.localdate()
+
+
+def _period(year: int, quarter: int) -> dict:
+    start, end = quarter_boundaries(year, quarter)
+    return {'quarter': quarter, 'year': year, 'start': start, 'end': end}
+
+
+def _quarter_querysets(year: int, quarter: int) -> tuple:
+    start, end = quarter_boundaries(year, quarter)
+    stays_in_period = Stay.objects.in_period(start, end)
+
+    clients_per_room = stays_in_period.values('room__id', 'room__number').annotate(
+        client_count=Count('client', distinct=True),
+    ).order_by('room__number')
+
+    rooms_per_floor = Room.objects.values('floor').annotate(room_count=Count('id')).order_by('floor')
+
+    return clients_per_room, rooms_per_floor, _income_per_room(start, end)
+
+
+def _collect_quarter_rows(year: int, quarter: int) -> tuple[list, list, list]:
+    clients_per_room, rooms_per_floor, income_per_room = _quarter_querysets(year, quarter)
+    return list(clients_per_room), list(rooms_per_floor), list(income_per_room)
+
+
+def _income_per_room(start: date, end: date):
+    return (
+        RevenueEntry.objects.between(start, end)
+        .values('room__id', 'room__number')
+        .annotate(total_income=Sum('amount'))
+        .order_by('room__number')
+    )
+
+
+def compute_income(start: date, end: date) -> dict:
+    totals = RevenueEntry.objects.between(start, end).aggregate(total_income=Sum('amount'), nights=Sum('nights'))
+    return {
+        'period': {'start': start, 'end': end},
+        'total_income': totals['total_income'] or 0,
+        'nights': totals['nights'] or 0,
+        'income_per_room': list(_income_per_room(start, end)),
+    }
+
+
+def _report(year: int, quarter: int, clients_per_room: list, rooms_per_floor: list, income_per_room: list) -> dict:
+    return {
+        'period': _period(year, quarter),
+        'clients_per_room': clients_per_room,
+        'rooms_per_floor': rooms_per_floor,
+        'income_per_room': income_per_room,
+        'total_income': sum(item['total_income'] or 0 for item in income_per_room),
+    }
+
+
+def compute_quarterly_report(year: int, quarter: int) -> dict:
+    return _report(year, quarter, *_collect_quarter_rows(year, quarter))
+
+
+async def acompute_quarterly_report(year: int, quarter: int) -> dict:
+    """Как compute_quarterly_report, но три независимых агрегата выполняются одновременно."""
+    rows = await gather_isolated(*(partial(list, queryset) for queryset in _quarter_querysets(year, quarter)))
+    return _report(year, quarter, *rows)
+
+
+@transaction.atomic
+def refresh_quarterly_snapshot(year: int, quarter: int) -> QuarterlyReportSnapshot:
+    clients_per_room, rooms_per_floor, income_per_room = _collect_quarter_rows(year, quarter)
+    income_by_room = {item['room__id']: item['total_income'] for item in income_per_room}
+
+    snapshot, _ = QuarterlyReportSnapshot.objects.select_for_update().get_or_create(year=year, quarter=quarter)
+    snapshot.total_income = sum(item['total_income'] or 0 for item in income_per_room)
+    snapshot.save()
+
+    snapshot.room_stats.all().delete()
+    snapshot.floor_stats.all().delete()
+    QuarterlyRoomStat.objects.bulk_create(
+        QuarterlyRoomStat(
+            snapshot=snapshot,
+            room_id=item['room__id'],
+            room_number=item['room__number'],
+            client_count=item['client_count'],
+            total_income=income_by_room.get(item['room__id']),
+        )
+        for item in clients_per_room
+    )
+    QuarterlyFloorStat.objects.bulk_create(
+        QuarterlyFloorStat(snapshot=snapshot, floor=item['floor'], room_count=item['room_count'])
+        for item in rooms_per_floor
+    )
+    return snapshot
+
+
+def refresh_snapshots_for_period(start: date, end: date) -> None:
+    existing = QuarterlyReportSnapshot.objects.filter(
+        year__gte=start.year, year__lte=end.year,
+    ).values_list('year', 'quarter')
+    wanted = set(quarters_between(start, end))
+    for year, quarter in existing:
+        if (year, quarter) in wanted:
+            refresh_quarterly_snapshot(year, quarter)
+
+
+def refresh_floor_stats() -> None:
+    rooms_per_floor = list(Room.objects.values('floor').annotate(room_count=Count('id')).order_by('floor'))
+    snapshot_ids = list(QuarterlyReportSnapshot.objects.values_list('id', flat=True))
+    with transaction.atomic():
+        QuarterlyFloorStat.objects.all().delete()
+        QuarterlyFloorStat.objects.bulk_create(
+            QuarterlyFloorStat(snapshot_id=snapshot_id, floor=item['floor'], room_count=item['room_count'])
+            for snapshot_id in snapshot_ids
+            for item in rooms_per_floor
+        )
+        QuarterlyReportSnapshot.objects.filter(id__in=snapshot_ids).update(refreshed_at=timezone.now())
+
+
+def snapshot_to_report(snapshot: QuarterlyReportSnapshot) -> dict:
+    room_stats = snapshot.room_stats.all()
+    income_per_room = [
+        {'room__id': stat.room_id, 'room__number': stat.room_number, 'total_income': stat.total_income}
+        for stat in room_stats
+        if stat.total_income is not None
+    ]
+    return {
+        'period': _period(snapshot.year, snapshot.quarter),
+        'clients_per_room': [
+            {'room__id': stat.room_id, 'room__number': stat.room_number, 'client_count': stat.client_count}
+            for stat in room_stats
+        ],
+        'rooms_per_floor': [
+            {'floor': stat.floor, 'room_count': stat.room_count}
+            for stat in snapshot.floor_stats.all()
+        ],
+        'income_per_room': income_per_room,
+        'total_income': snapshot.total_income if income_per_room else 0,
+    }
+
+
+def quarterly_report_validators(year: int, quarter: int) -> list | None:
+    """Валидаторы для условного GET: снимок закрытого квартала или состояние проживаний и номеров."""
+    quarter_boundaries(year, quarter)
+    if is_closed_quarter(year, quarter):
+        refreshed_at = (
+            QuarterlyReportSnapshot.objects.filter(year=year, quarter=quarter)
+            .values_list('refreshed_at', flat=True)
+            .first()
+        )
+        if refreshed_at is None:
+            return None
+        return [(refreshed_at, refreshed_at.isoformat())]
+    return [queryset_fingerprint(Stay.objects.all()), queryset_fingerprint(Room.objects.all())]
+
+
+def get_quarterly_report(year: int, quarter: int) -> dict:
+    quarter_boundaries(year, quarter)
+    if not is_closed_quarter(year, quarter):
+        return compute_quarterly_report(year, quarter)
+    snapshot = (
+        QuarterlyReportSnapshot.objects.filter(year=year, quarter=quarter)
+        .prefetch_related(
+            Prefetch('room_stats', queryset=QuarterlyRoomStat.objects.order_by('room_number')),
+            Prefetch('floor_stats', queryset=QuarterlyFloorStat.objects.order_by('floor')),
+        )
+        .first()
+    )
+    if snapshot is None:
+        snapshot = refresh_quarterly_snapshot(year, quarter)
+        # Ответ до материализации отдаётся без ETag: следующий запрос должен пересобрать его уже с валидаторами.
+        invalidate_responses_on_commit(REPORTS_RESPONSES)
+    return snapshot_to_report(snapshot)
+
+
+async def aget_quarterly_report(year: int, quarter: int) -> dict:
+    quarter_boundaries(year, quarter)
+    if not is_closed_quarter(year, quarter):
+        return await acompute_quarterly_report(year, quarter)
+    # Снимок читается двумя запросами по индексу — параллелить нечего.
+    return await sync_to_async(get_quarterly_report)(year, quarter)
+
+
+REPORT_EXPORT_HEADER = ['year', 'quarter', 'room_id', 'room_number', 'client_count', 'total_income']
+
+
+def iter_quarterly_rows(quarters: list[tuple[int, int]]):
+    for year, quarter in quarters:
+        report = get_quarterly_report(year, quarter)
+        income_by_room = {item['room__id']: item['total_income'] for item in report['income_per_room']}
+        for item in report['clients_per_room']:
+            yield (
+                year,
+                quarter,
+                item['room__id'],
+                item['room__number'],
+                item['client_count'],
+                income_by_room.get(item['room__id']),
+            )
+
+
+def year_range_quarters(start_year: int, end_year: int) -> list[tuple[int, int]]:
+    return [(year, quarter) for year in range(start_year, end_year + 1) for quarter in range(1, 5)]
@@ -0,0 +1,78 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from common.response_cache import REPORTS_RESPONSES, invalidate_responses, invalidate_responses_on_commit
+from rooms.models import Room
+from stays.models import Stay
+from stays.signals import stays_bulk_changed
+from .occupancy import OCCUPANCY_ROOM_FIELDS, rebuild_materialized_occupancy, refresh_daily_occupancy
+from .services import refresh_floor_stats, refresh_snapshots_for_period
+
+
+def _stay_period(check_in, check_out):
+    return check_in, check_out or max(check_in, timezone.localdate())
+
+
+@receiver(pre_save, sender=Stay)
+def remember_previous_stay_period(sender, instance, **kwargs):
+    instance._report_previous_period = None
+    if instance.pk:
+        previous = Stay.objects.filter(pk=instance.pk).values_list('check_in', 'check_out').first()
+        if previous:
+            instance._report_previous_period = _stay_period(*previous)
+
+
+@receiver(post_save, sender=Stay)
+@receiver(post_delete, sender=Stay)
+def refresh_report_snapshots(sender, instance, **kwargs):
+    periods = {_stay_period(instance.check_in, instance.check_out)}
+    previous = getattr(instance, '_report_previous_period', None)
+    if previous:
+        periods.add(previous)
+    for start, end in periods:
+        transaction.on_commit(partial(refresh_snapshots_for_period, start, end))
+        transaction.on_commit(partial(refresh_daily_occupancy, start, end))
+    # Сброс после пересчёта снимков: иначе в кеш мог бы попасть ещё старый снимок под новой версией.
+    invalidate_responses_on_commit(REPORTS_RESPONSES)
+
+
+@receiver(stays_bulk_changed, sender=Stay)
+def refresh_report_snapshots_after_bulk(sender, stays, **kwargs):
+    if not stays:
+        return
+    today = timezone.localdate()
+    start = min(stay.check_in for stay in stays)
+    end = max(max(stay.check_out or today, today) for stay in stays)
+    refresh_snapshots_for_period(start, end)
+    refresh_daily_occupancy(start, end)
+    invalidate_responses(REPORTS_RESPONSES)
+
+
+@receiver(pre_save, sender=Room)
+def remember_previous_room_inventory(sender, instance, **kwargs):
+    instance._report_previous_inventory = None
+    if instance.pk:
+        instance._report_previous_inventory = Room.objects.filter(pk=instance.pk).values(*OCCUPANCY_ROOM_FIELDS).first()
+
+
+@receiver(post_save, sender=Room)
+def refresh_reports_after_room_save(sender, instance, **kwargs):
+    # Полный пересчёт загрузки — только если изменился номерной фонд, а не, скажем, телефон номера.
+    previous = getattr(instance, '_report_previous_inventory', None)
+    current = {field: getattr(instance, field) for field in OCCUPANCY_ROOM_FIELDS}
+    if previous is None or previous['floor'] != current['floor']:
+        transaction.on_commit(refresh_floor_stats)
+    if previous != current:
+        transaction.on_commit(rebuild_materialized_occupancy)
+    invalidate_responses_on_commit(REPORTS_RESPONSES)
+
+
+@receiver(post_delete, sender=Room)
+def refresh_reports_after_room_delete(sender, **kwargs):
+    transaction.on_commit(refresh_floor_stats)
+    transaction.on_commit(rebuild_materialized_occupancy)
+    invalidate_responses_on_commit(REPORTS_RESPONSES)
@@ -0,0 +1,189 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from clients.counters import rebuild_city_counters
+from clients.models import Client
+from employees.models import CleaningAssignment, Employee
+from rooms.models import Room
+from stays.models import RevenueEntry, Stay
+
+ROOMS_PER_FLOOR = 50
+ROOM_TYPE_WEIGHTS = {
+    Room.RoomType.SINGLE: 3,
+    Room.RoomType.DOUBLE: 5,
+    Room.RoomType.TRIPLE: 2,
+}
+BASE_RATES = {
+    Room.RoomType.SINGLE: 3500,
+    Room.RoomType.DOUBLE: 5200,
+    Room.RoomType.TRIPLE: 7200,
+}
+# Длительность проживания в ночах и её относительная частота: в основном короткие поездки.
+STAY_LENGTH_WEIGHTS = {1: 18, 2: 20, 3: 16, 4: 12, 5: 9, 6: 6, 7: 8, 10: 5, 14: 4, 21: 2}
+# Сезонность: летом и в декабре загрузка выше, в феврале и ноябре ниже.
+SEASONAL_DEMAND = {1: 0.8, 2: 0.7, 3: 0.85, 4: 0.9, 5: 1.05, 6: 1.25, 7: 1.35, 8: 1.3, 9: 1.0, 10: 0.9, 11: 0.75, 12: 1.1}
+CITY_WEIGHTS = {
+    'Москва': 30,
+    'Санкт-Петербург': 18,
+    'Казань': 8,
+    'Новосибирск': 7,
+    'Екатеринбург': 7,
+    'Нижний Новгород': 6,
+    'Самара': 5,
+    'Краснодар': 5,
+    'Владивосток': 3,
+    'Калининград': 3,
+    'Томск': 2,
+    'Ярославль': 2,
+}
+LAST_NAMES = ['Иванов', 'Петров', 'Смирнов', 'Кузнецов', 'Попов', 'Соколов', 'Лебедев', 'Козлов', 'Новиков', 'Морозов', 'Волков', 'Фёдоров']
+FIRST_NAMES = ['Алексей', 'Дмитрий', 'Иван', 'Сергей', 'Андрей', 'Мария', 'Елена', 'Ольга', 'Наталья', 'Анна', 'Пётр', 'Юлия']
+MIDDLE_NAMES = ['Петрович', 'Игоревич', 'Олегович', 'Андреевич', 'Сергеевна', 'Викторовна', '']
+
+
+class SyntheticHotelGenerator:
+    def __init__(self, rooms: int, clients: int, years: int, seed: int, occupancy: float, batch_size: int, stdout):
+        self.rooms = rooms
+        self.clients = clients
+        self.years = years
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.occupancy = min(max(occupancy, 0.05), 0.98)
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.today = timezone.localdate()
+        self.first_day = self.today - timedelta(days=365 * years)
+        self.lengths = list(STAY_LENGTH_WEIGHTS)
+        self.length_weights = list(STAY_LENGTH_WEIGHTS.values())
+        mean_length = sum(k * v for k, v in STAY_LENGTH_WEIGHTS.items()) / sum(self.length_weights)
+        self.mean_gap = mean_length * (1 - self.occupancy) / self.occupancy
+
+    def clear(self):
+        self.stdout.write('Удаляю существующие данные...')
+        with transaction.atomic():
+            RevenueEntry.objects.all().delete()
+            Stay.objects.all().delete()
+            Client.objects.all().delete()
+            CleaningAssignment.objects.all().delete()
+            Employee.objects.all().delete()
+            Room.objects.all().delete()
+
+    def run(self):
+        with transaction.atomic():
+            rooms = self._create_rooms()
+            self._create_employees(rooms)
+        client_ids = self._create_clients()
+        self._create_stays(rooms, client_ids)
+
+    def _create_rooms(self) -> list[Room]:
+        self.stdout.write(f'Создаю номера: {self.rooms}...')
+        room_types = self.rng.choices(list(ROOM_TYPE_WEIGHTS), weights=list(ROOM_TYPE_WEIGHTS.values()), k=self.rooms)
+        rooms = []
+        for index, room_type in enumerate(room_types):
+            floor = index // ROOMS_PER_FLOOR + 1
+            rate = BASE_RATES[room_type] * (1 + 0.05 * min(floor, 10)) * self.rng.uniform(0.9, 1.1)
+            rooms.append(
+                Room(
+                    number=floor * 1000 + index % ROOMS_PER_FLOOR + 1,
+                    floor=floor,
+                    room_type=room_type,
+                    capacity=Room.ROOM_TYPE_CAPACITY[room_type],
+                    daily_rate=Decimal(round(rate, -1)),
+                    phone_number=f'{floor:02d}{index % ROOMS_PER_FLOOR + 1:02d}',
+                )
+            )
+        return Room.objects.bulk_create(rooms, batch_size=self.batch_size)
+
+    def _create_employees(self, rooms: list[Room]):
+        floors = sorted({room.floor for room in rooms})
+        self.stdout.write(f'Создаю сотрудников для этажей: {len(floors)}...')
+        weekdays = [code for code, _ in CleaningAssignment.WEEKDAYS]
+        employees = Employee.objects.bulk_create(
+            Employee(
+                last_name=self.rng.choice(LAST_NAMES),
+                first_name=self.rng.choice(FIRST_NAMES),
+                middle_name=f'Уборка {index + 1}',
+            )
+            for index in range((len(floors) + 1) // 2)
+        )
+        assignments = [
+            CleaningAssignment(employee=employees[position // 2], floor=floor, weekday=weekday)
+            for position, floor in enumerate(floors)
+            for weekday in weekdays
+        ]
+        CleaningAssignment.objects.bulk_create(assignments, batch_size=self.batch_size)
+
+    def _create_clients(self) -> list[int]:
+        self.stdout.write(f'Создаю клиентов: {self.clients}...')
+        cities = list(CITY_WEIGHTS)
+        city_weights = list(CITY_WEIGHTS.values())
+        client_ids = []
+        for offset in range(0, self.clients, self.batch_size):
+            size = min(self.batch_size, self.clients - offset)
+            batch_cities = self.rng.choices(cities, weights=city_weights, k=size)
+            batch = [
+                Client(
+                    passport_number=f'S{self.seed:02d} {offset + index:08d}',
+                    last_name=self.rng.choice(LAST_NAMES),
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    middle_name=self.rng.choice(MIDDLE_NAMES),
+                    city=batch_cities[index],
+                    phone=f'+7 9{self.rng.randrange(10**9):09d}',
+                )
+                for index in range(size)
+            ]
+            for client in batch:
+                client.fill_search_fields()
+            client_ids.extend(client.pk for client in Client.objects.bulk_create(batch))
+        rebuild_city_counters()
+        return client_ids
+
+    def _next_gap(self, day: date) -> int:
+        mean = self.mean_gap / SEASONAL_DEMAND[day.month]
+        return int(self.rng.expovariate(1 / mean)) if mean > 0 else 0
+
+    def _create_stays(self, rooms: list[Room], client_ids: list[int]):
+        self.stdout.write(f'Создаю проживания за {self.years} г....')
+        free_for_active = client_ids[:]
+        self.rng.shuffle(free_for_active)
+        pending = []
+        total = 0
+        for room in rooms:
+            day = self.first_day + timedelta(days=self._next_gap(self.first_day))
+            while day <= self.today:
+                nights = self.rng.choices(self.lengths, weights=self.length_weights)[0]
+                check_out = day + timedelta(days=nights)
+                guests = self.rng.randint(1, room.capacity) if self.rng.random() < 0.6 else 1
+                is_active = check_out > self.today
+                for _ in range(guests):
+                    if is_active:
+                        if not free_for_active:
+                            break
+                        client_id = free_for_active.pop()
+                    else:
+                        client_id = self.rng.choice(client_ids)
+                    pending.append(
+                        Stay(
+                            client_id=client_id,
+                            room=room,
+                            check_in=day,
+                            check_out=None if is_active else check_out,
+                            status=Stay.Status.ACTIVE if is_active else Stay.Status.COMPLETED,
+                            total_cost=Decimal('0') if is_active else room.daily_rate * nights,
+                        )
+                    )
+                day = check_out + timedelta(days=self._next_gap(check_out))
+                if len(pending) >= self.batch_size:
+                    total += self._flush(pending)
+                    pending = []
+        total += self._flush(pending)
+        self.stdout.write(f'Создано проживаний: {total}.')
+
+    def _flush(self, stays: list[Stay]) -> int:
+        Stay.objects.bulk_create(stays, batch_size=self.batch_size)
+        RevenueEntry.objects.bulk_create(RevenueEntry.objects.build_for(stays), batch_size=self.batch_size)
+        return len(stays)
@@ -1,3 +1,145 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from clients.models import Client
+from rooms.models import Room
+from stays.models import Stay
+from .models import DailyOccupancy
+from .occupancy import rebuild_daily_occupancy
+from .ranges import compute_range_report
+
+
+class RoomOccupancyRebuildTests(TestCase):
+    """Правка номера пересчитывает таблицу загрузки только при смене номерного фонда."""
+
+    def setUp(self):
+        self.room = Room.objects.create(
+            number=101, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='1'
+        )
+        rebuild_daily_occupancy(date(2024, 1, 1), date(2024, 1, 3))
+
+    def save_room(self, **changes):
+        for field, value in changes.items():
+            setattr(self.room, field, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.save()
+
+    def places_total(self):
+        return set(DailyOccupancy.objects.values_list('places_total', flat=True))
+
+    def test_unrelated_field_does_not_rebuild(self):
+        before = set(DailyOccupancy.objects.values_list('pk', flat=True))
+        with self.assertNumQueries(2):
+            # pre_save читает прежний фонд, затем UPDATE; пересчёта на коммите нет.
+            self.save_room(phone_number='2', daily_rate=Decimal('1500'), is_active=False)
+        self.assertEqual(set(DailyOccupancy.objects.values_list('pk', flat=True)), before)
+
+    def test_capacity_change_rebuilds(self):
+        self.save_room(capacity=3)
+        self.assertEqual(self.places_total(), {3})
+
+    def test_room_type_change_rebuilds(self):
+        self.save_room(room_type='single')
+        self.assertEqual(set(DailyOccupancy.objects.values_list('room_type', flat=True)), {'single'})
+
+    def test_new_room_counts_for_past_days(self):
+        # Истории фонда нет: новый номер попадает и в уже прошедшие дни.
+        with self.captureOnCommitCallbacks(execute=True):
+            Room.objects.create(
+                number=102, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='2'
+            )
+        self.assertEqual(self.places_total(), {4})
+        self.assertEqual(DailyOccupancy.objects.filter(date=date(2024, 1, 1)).get().rooms_total, 2)
+
+    def test_delete_rebuilds(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.delete()
+        self.assertFalse(DailyOccupancy.objects.exists())
+
+
+class RangeReportTests(TestCase):
+    """compute_range_report: ночи и выручка по интервалам, обрезка крайних интервалов, совпадение с квартальным."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = Room.objects.create(
+            number=101, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='1'
+        )
+        cls.second = Room.objects.create(
+            number=201, floor=2, room_type='single', capacity=1, daily_rate=Decimal('2000'), phone_number='2'
+        )
+        guests = [
+            Client.objects.create(passport_number=f'P{index}', last_name=f'L{index}', first_name='F', city='Тверь')
+            for index in range(4)
+        ]
+        # В номере 101 второй гость заезжает в день выезда первого; первое проживание на стыке кварталов.
+        cls.stay(guests[0], cls.first, date(2024, 3, 28), date(2024, 4, 2))
+        cls.stay(guests[1], cls.first, date(2024, 4, 2), date(2024, 4, 5))
+        cls.stay(guests[2], cls.second, date(2024, 2, 20), date(2024, 2, 22))
+        cls.stay(guests[3], cls.second, date(2024, 5, 10))
+
+    @staticmethod
+    def stay(guest, room, check_in, check_out=None):
+        stay = Stay(client=guest, room=room, check_in=check_in)
+        if check_out:
+            stay.close(check_out)
+        stay.save()
+
+    def column(self, report, field):
+        return [item[field] for item in report['series']]
+
+    def test_back_to_back_stays_by_day(self):
+        report = compute_range_report(date(2024, 3, 30), date(2024, 4, 3), 'day')
+        self.assertEqual(self.column(report, 'start'), [
+            date(2024, 3, 30), date(2024, 3, 31), date(2024, 4, 1), date(2024, 4, 2), date(2024, 4, 3),
+        ])
+        self.assertEqual(self.column(report, 'nights'), [1, 1, 1, 1, 1])
+        # Выехавший 2 апреля гость в этот день ещё учитывается клиентом — как в квартальном отчёте.
+        self.assertEqual(self.column(report, 'client_count'), [1, 1, 1, 2, 1])
+        self.assertEqual(self.column(report, 'total_income'), [Decimal('1000')] * 5)
+
+    def test_edge_buckets_are_clipped(self):
+        report = compute_range_report(date(2024, 2, 15), date(2024, 5, 12), 'month')
+        self.assertEqual(
+            [(item['start'], item['end']) for item in report['series']],
+            [
+                (date(2024, 2, 15), date(2024, 2, 29)),
+                (date(2024, 3, 1), date(2024, 3, 31)),
+                (date(2024, 4, 1), date(2024, 4, 30)),
+                (date(2024, 5, 1), date(2024, 5, 12)),
+            ],
+        )
+        # Открытое проживание с 10 мая обрезается концом периода: 10, 11 и 12 мая.
+        self.assertEqual(self.column(report, 'nights'), [2, 4, 4, 3])
+        self.assertEqual(self.column(report, 'total_income'), [Decimal('4000'), Decimal('4000'), Decimal('4000'), 0])
+        self.assertEqual(report['nights'], 13)
+        self.assertEqual(report['total_income'], Decimal('12000'))
+        april = report['series'][2]['rooms']
+        self.assertEqual([(room['room__number'], room['client_count'], room['nights']) for room in april], [(101, 2, 4)])
+
+    def test_open_stay_counts_nights_through_today(self):
+        with mock.patch('reports.ranges.timezone.localdate', return_value=date(2024, 5, 11)):
+            report = compute_range_report(date(2024, 5, 1), date(2024, 6, 30), 'month')
+        self.assertEqual(self.column(report, 'nights'), [2, 0])
+        self.assertEqual(report['series'][0]['rooms'][0]['room__number'], 201)
+
+    def test_quarter_bucket_matches_quarterly_report(self):
+        series = self.client.get(
+            '/api/reports/range/', {'start': '2024-01-01', 'end': '2024-06-30', 'bucket': 'quarter'}
+        ).json()['series']
+        self.assertEqual(len(series), 2)
+        for quarter, bucket in zip((1, 2), series):
+            with self.subTest(quarter=quarter):
+                report = self.client.get('/api/reports/quarterly/', {'year': 2024, 'quarter': quarter}).json()
+                self.assertEqual(bucket['total_income'], report['total_income'])
+                self.assertEqual(
+                    [(room['room__id'], room['room__number'], room['client_count']) for room in bucket['rooms']],
+                    [(room['room__id'], room['room__number'], room['client_count']) for room in report['clients_per_room']],
+                )
+                self.assertEqual(
+                    {room['room__id']: room['total_income'] for room in bucket['rooms'] if Decimal(room['total_income'])},
+                    {room['room__id']: room['total_income'] for room in report['income_per_room']},
+                )
@@ -1,8 +1,25 @@
 from django.urls import path
 
-from .views import QuarterlyReportView
+from .views import (
+    AsyncQuarterlyReportView,
+    IncomeReportView,
+    OccupancyReportView,
+    QuarterlyReportExportView,
+    QuarterlyReportView,
+    RangeReportView,
+    ReportJobDetailView,
+    ReportJobListView,
+    ReportJobResultView,
+)
 
 urlpatterns = [
     path('reports/quarterly/', QuarterlyReportView.as_view(), name='reports-quarterly'),
+    path('async/reports/quarterly/', AsyncQuarterlyReportView.as_view(), name='reports-quarterly-async'),
+    path('reports/income/', IncomeReportView.as_view(), name='reports-income'),
+    path('reports/occupancy/', OccupancyReportView.as_view(), name='reports-occupancy'),
+    path('reports/range/', RangeReportView.as_view(), name='reports-range'),
+    path('reports/quarterly/export/', QuarterlyReportExportView.as_view(), name='reports-quarterly-export'),
+    path('reports/jobs/', ReportJobListView.as_view(), name='reports-job-list'),
+    path('reports/jobs/<int:pk>/', ReportJobDetailView.as_view(), name='reports-job-detail'),
+    path('reports/jobs/<int:pk>/result/', ReportJobResultView.as_view(), name='reports-job-result'),
 ]
-
@@ -1,67 +1,133 @@
-from datetime import date
-
-from django.db.models import Count, Sum, Q
+from asgiref.sync import sync_to_async
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views import View
 from rest_framework import status, views
 from rest_framework.response import Response
 
-from rooms.models import Room
-from stays.models import Stay
+from common.aio import json_response
+from common.conditional import aconditional_response, conditional_response
+from common.exports import parse_export_format, streaming_export
+from common.response_cache import REPORTS_RESPONSES, cache_response
+from common.utils import ensure_period
+from .models import ReportJob
+from .occupancy import occupancy_report, parse_occupancy_params
+from .ranges import compute_range_report, parse_range_params
+from .serializers import ReportJobSerializer
+from .services import (
+    REPORT_EXPORT_HEADER,
+    aget_quarterly_report,
+    compute_income,
+    get_quarterly_report,
+    iter_quarterly_rows,
+    parse_quarter_params,
+    parse_year_range,
+    quarterly_report_validators,
+    year_range_quarters,
+)
 
 
-def quarter_boundaries(year: int, quarter: int) -> tuple[date, date]:
-    if quarter not in {1, 2, 3, 4}:
-        raise ValueError('Квартал должен быть числом от 1 до 4.')
-    start_month = (quarter - 1) * 3 + 1
-    start = date(year, start_month, 1)
-    if quarter == 4:
-        end = date(year + 1, 1, 1) - date.resolution
-    else:
-        end_month = start_month + 3
-        end = date(year, end_month, 1) - date.resolution
-    return start, end
+class QuarterlyReportView(views.APIView):
+    @cache_response(REPORTS_RESPONSES)
+    def get(self, request):
+        try:
+            year, quarter = parse_quarter_params(request.query_params)
+            validators = quarterly_report_validators(year, quarter)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
+        if validators is None:
+            return Response(get_quarterly_report(year, quarter))
+        return conditional_response(request, validators, lambda: Response(get_quarterly_report(year, quarter)))
 
-class QuarterlyReportView(views.APIView):
+
+class AsyncQuarterlyReportView(View):
+    http_method_names = ['get', 'head', 'options']
+
+    async def get(self, request):
+        try:
+            year, quarter = parse_quarter_params(request.GET)
+            validators = await sync_to_async(quarterly_report_validators)(year, quarter)
+        except ValueError as exc:
+            return json_response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        async def build():
+            return json_response(await aget_quarterly_report(year, quarter))
+
+        if validators is None:
+            return await build()
+        return await aconditional_response(request, validators, build)
+
+
+class IncomeReportView(views.APIView):
     def get(self, request):
-        quarter = request.query_params.get('quarter')
-        year = request.query_params.get('year')
-        if not quarter or not year:
-            return Response({'detail': 'Нужно указать quarter и year.'}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            quarter = int(quarter)
-            year = int(year)
-            start, end = quarter_boundaries(year, quarter)
+            start, end = ensure_period(request.query_params.get('start'), request.query_params.get('end'))
         except ValueError as exc:
             return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(compute_income(start, end))
+
+
+class OccupancyReportView(views.APIView):
+    def get(self, request):
+        try:
+            params = parse_occupancy_params(request.query_params)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(occupancy_report(**params))
+
 
-        stays_in_period = Stay.objects.filter(
-            check_in__lte=end,
-        ).filter(
-            Q(check_out__isnull=True) | Q(check_out__gte=start)
-        )
-
-        clients_per_room = stays_in_period.values('room__id', 'room__number').annotate(
-            client_count=Count('client', distinct=True),
-        ).order_by('room__number')
-
-        rooms_per_floor = Room.objects.values('floor').annotate(room_count=Count('id')).order_by('floor')
-
-        income_qs = Stay.objects.filter(
-            status=Stay.Status.COMPLETED,
-            check_out__range=(start, end),
-        ).values('room__id', 'room__number').annotate(total_income=Sum('total_cost')).order_by('room__number')
-        total_income = sum(item['total_income'] or 0 for item in income_qs)
-
-        response = {
-            'period': {
-                'quarter': quarter,
-                'year': year,
-                'start': start,
-                'end': end,
-            },
-            'clients_per_room': list(clients_per_room),
-            'rooms_per_floor': list(rooms_per_floor),
-            'income_per_room': list(income_qs),
-            'total_income': total_income,
-        }
-        return Response(response)
+class RangeReportView(views.APIView):
+    @cache_response(REPORTS_RESPONSES)
+    def get(self, request):
+        try:
+            params = parse_range_params(request.query_params)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(compute_range_report(**params))
+
+
+class QuarterlyReportExportView(views.APIView):
+    def get(self, request):
+        try:
+            start_year, end_year = parse_year_range(request.query_params)
+            export_format = parse_export_format(request.query_params.get('export_format'))
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        quarters = year_range_quarters(start_year, end_year)
+        filename = f'quarterly_{start_year}_{end_year}'
+        return streaming_export(REPORT_EXPORT_HEADER, iter_quarterly_rows(quarters), export_format, filename)
+
+
+class ReportJobListView(views.APIView):
+    def post(self, request):
+        serializer = ReportJobSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save()
+        headers = {'Location': reverse('reports-job-detail', args=[job.pk])}
+        return Response(ReportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED, headers=headers)
+
+
+class ReportJobDetailView(views.APIView):
+    def get(self, request, pk):
+        return Response(ReportJobSerializer(get_object_or_404(ReportJob, pk=pk)).data)
+
+
+class ReportJobResultView(views.APIView):
+    def get(self, request, pk):
+        job = get_object_or_404(ReportJob, pk=pk)
+        if job.status != ReportJob.Status.DONE:
+            detail = job.error if job.status == ReportJob.Status.FAILED else 'Отчёт ещё не готов.'
+            return Response({'detail': detail, 'status': job.status}, status=status.HTTP_409_CONFLICT)
+
+        export_format = request.query_params.get('export_format')
+        if not export_format:
+            return Response(job.result, headers={'Content-Disposition': f'attachment; filename="report_{job.pk}.json"'})
+        try:
+            export_format = parse_export_format(export_format)
+            if not isinstance(job.result, dict) or 'rows' not in job.result:
+                raise ValueError('Этот отчёт выгружается только в JSON.')
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return streaming_export(job.result['header'], job.result['rows'], export_format, f'report_{job.pk}')
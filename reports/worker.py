@@ -0,0 +1,16 @@
+"""Точки входа процессов пула run_report_worker.
+
+Процессы запускаются через spawn, поэтому модуль импортируется до настройки Django и не должен тянуть модели.
+"""
+
+
+def setup_worker_process() -> None:
+    import django
+
+    django.setup()
+
+
+def execute_report_job(job_id: int) -> str:
+    from .jobs import run_report_job
+
+    return run_report_job(job_id)
@@ -5,6 +5,17 @@ from .models import Room
 
 @admin.register(Room)
 class RoomAdmin(admin.ModelAdmin):
-    list_display = ('number', 'floor', 'room_type', 'capacity', 'daily_rate', 'is_active')
+    list_display = ('number', 'floor', 'room_type', 'capacity', 'occupied_places', 'free_places', 'daily_rate', 'is_active')
     list_filter = ('room_type', 'floor', 'is_active')
     search_fields = ('number',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_occupancy()
+
+    @admin.display(description='Занято мест', ordering='occupied_places')
+    def occupied_places(self, obj: Room) -> int:
+        return obj.occupied_places
+
+    @admin.display(description='Свободно мест', ordering='free_places')
+    def free_places(self, obj: Room) -> int:
+        return obj.free_places
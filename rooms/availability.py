@@ -0,0 +1,43 @@
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db.models import Q
+
+from common.intervals import peak_concurrency
+from stays.models import Stay
+from .models import Room
+
+
+def booking_window(start: date, end: date) -> tuple[date, date]:
+    if end == start:
+        end = start + timedelta(days=1)
+    return start, end
+
+
+def room_stays_between(rooms, start: date, end: date):
+    stays = Stay.objects.filter(room__in=rooms.values('id'), check_in__lt=end).filter(
+        Q(check_out__isnull=True) | Q(check_out__gt=start)
+    )
+    return stays.order_by().values_list('room_id', 'check_in', 'check_out')
+
+
+def load_room_intervals(rooms, start: date, end: date) -> dict[int, list[tuple[date, date | None]]]:
+    intervals = defaultdict(list)
+    for room_id, check_in, check_out in room_stays_between(rooms, start, end):
+        intervals[room_id].append((check_in, check_out))
+    return intervals
+
+
+def find_available_rooms(start: date, end: date, room_type: str | None = None) -> list[dict]:
+    start, end = booking_window(start, end)
+    rooms = Room.objects.filter(is_active=True)
+    if room_type:
+        rooms = rooms.filter(room_type=room_type)
+    intervals = load_room_intervals(rooms, start, end)
+
+    available = []
+    for room in rooms.values('id', 'number', 'floor', 'room_type', 'capacity', 'daily_rate'):
+        peak = peak_concurrency(intervals.get(room['id'], ()), start, end)
+        if peak < room['capacity']:
+            available.append({**room, 'peak_occupancy': peak, 'free_places': room['capacity'] - peak})
+    return available
@@ -0,0 +1,96 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+
+from clients.models import Client
+from rooms.availability import find_available_rooms
+from rooms.models import Room
+from stays.models import Stay
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает поиск свободных номеров (sweep line) с наивным подсчётом по каждому номеру на синтетических данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, default=1000)
+        parser.add_argument('--stays', type=int, default=100000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write('Синтетические данные откатены.')
+
+    def _run(self, options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        base_number = (Room.objects.order_by('-number').values_list('number', flat=True).first() or 0) + 1
+        room_types = list(Room.RoomType)
+        rooms = Room.objects.bulk_create(
+            [
+                Room(
+                    number=base_number + index,
+                    floor=index // 50 + 1,
+                    room_type=room_type,
+                    capacity=Room.ROOM_TYPE_CAPACITY[room_type],
+                    daily_rate=Decimal('4000'),
+                    phone_number='0000',
+                )
+                for index, room_type in enumerate(rng.choice(room_types) for _ in range(options['rooms']))
+            ],
+            batch_size=batch_size,
+        )
+        client = Client.objects.create(passport_number=f'bench-{time.time_ns()}', last_name='Bench', first_name='Bench', city='Bench')
+        first_day = date(2020, 1, 1)
+        stays = []
+        for _ in range(options['stays']):
+            check_in = first_day + timedelta(days=rng.randint(0, 5 * 365))
+            stays.append(
+                Stay(
+                    client=client,
+                    room=rng.choice(rooms),
+                    check_in=check_in,
+                    check_out=check_in + timedelta(days=rng.randint(1, 14)),
+                    status=Stay.Status.COMPLETED,
+                )
+            )
+        Stay.objects.bulk_create(stays, batch_size=batch_size)
+        self.stdout.write(f'Создано номеров: {len(rooms)}, проживаний: {len(stays)}.')
+
+        start = first_day + timedelta(days=2 * 365)
+        end = start + timedelta(days=7)
+
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            swept = find_available_rooms(start, end)
+            sweep_seconds = time.perf_counter() - started
+        sweep_queries = len(ctx.captured_queries)
+
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            naive = 0
+            for room in Room.objects.filter(is_active=True):
+                overlapping = Stay.objects.filter(room=room, check_in__lt=end).filter(
+                    Q(check_out__isnull=True) | Q(check_out__gt=start)
+                ).count()
+                if overlapping < room.capacity:
+                    naive += 1
+            naive_seconds = time.perf_counter() - started
+        naive_queries = len(ctx.captured_queries)
+
+        self.stdout.write(f'sweep line: {len(swept)} номеров, {sweep_queries} запросов, {sweep_seconds * 1000:.1f} мс')
+        self.stdout.write(f'по номерам: {naive} номеров, {naive_queries} запросов, {naive_seconds * 1000:.1f} мс')
@@ -1,4 +1,30 @@
 from django.db import models
+from django.db.models.functions import Coalesce
+
+from stays.models import Stay
+
+
+class RoomQuerySet(models.QuerySet):
+    def with_occupancy(self):
+        active_stays = (
+            Stay.objects.filter(room=models.OuterRef('pk'), status=Stay.Status.ACTIVE)
+            .order_by()
+            .values('room')
+            .annotate(total=models.Count('id'))
+            .values('total')
+        )
+        return self.annotate(
+            occupied_places=Coalesce(models.Subquery(active_stays, output_field=models.IntegerField()), 0),
+        ).annotate(
+            free_places=models.ExpressionWrapper(
+                models.F('capacity') - models.F('occupied_places'),
+                output_field=models.IntegerField(),
+            ),
+            is_full=models.ExpressionWrapper(
+                models.Q(occupied_places__gte=models.F('capacity')),
+                output_field=models.BooleanField(),
+            ),
+        )
 
 
 class Room(models.Model):
@@ -18,6 +44,8 @@ class Room(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = RoomQuerySet.as_manager()
+
     ROOM_TYPE_CAPACITY = {
         RoomType.SINGLE: 1,
         RoomType.DOUBLE: 2,
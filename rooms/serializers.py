@@ -1,11 +1,14 @@
 from rest_framework import serializers
 
+from common.values import ValuesSerializer
 from stays.models import Stay
 from .models import Room
 
 
 class RoomSerializer(serializers.ModelSerializer):
     occupied_places = serializers.SerializerMethodField()
+    free_places = serializers.SerializerMethodField()
+    is_full = serializers.SerializerMethodField()
 
     class Meta:
         model = Room
@@ -19,10 +22,47 @@ class RoomSerializer(serializers.ModelSerializer):
             'phone_number',
             'is_active',
             'occupied_places',
+            'free_places',
+            'is_full',
         ]
 
     def get_occupied_places(self, obj: Room) -> int:
-        return obj.stays.filter(status=Stay.Status.ACTIVE).count()
+        occupied = getattr(obj, 'occupied_places', None)
+        if occupied is None:
+            # Только что созданный/изменённый номер приходит без аннотации with_occupancy().
+            occupied = obj.stays.filter(status=Stay.Status.ACTIVE).count()
+            obj.occupied_places = occupied
+        return occupied
+
+    def get_free_places(self, obj: Room) -> int:
+        return obj.capacity - self.get_occupied_places(obj)
+
+    def get_is_full(self, obj: Room) -> bool:
+        return self.get_free_places(obj) <= 0
+
+
+class RoomValuesSerializer(ValuesSerializer):
+    """Требует выборку с with_occupancy(): занятость берётся из аннотаций."""
+
+    model = Room
+    fields = (
+        'id',
+        'number',
+        'floor',
+        'room_type',
+        'capacity',
+        'daily_rate',
+        'phone_number',
+        'is_active',
+        'occupied_places',
+        'free_places',
+        'is_full',
+    )
+    extra_values = ('is_full',)
+
+    @staticmethod
+    def get_is_full(row: dict) -> bool:
+        return bool(row['is_full'])
 
 
 class RoomStaySerializer(serializers.ModelSerializer):
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Room
+
+FREE_ROOMS_SUMMARY_CACHE_KEY = 'rooms:free-summary'
+
+
+def _free_rooms_by_type():
+    return (
+        Room.objects.filter(is_active=True)
+        .with_occupancy()
+        .filter(is_full=False)
+        .order_by()
+        .values('room_type')
+        .annotate(count=Count('id'))
+        .order_by('room_type')
+    )
+
+
+def _summarize(rows) -> dict:
+    by_type = [
+        {
+            'room_type': row['room_type'],
+            'label': Room.RoomType(row['room_type']).label if row['room_type'] in Room.RoomType.values else row['room_type'],
+            'count': row['count'],
+        }
+        for row in rows
+    ]
+    return {
+        'total_free_rooms': sum(item['count'] for item in by_type),
+        'by_type': by_type,
+    }
+
+
+def build_free_rooms_summary() -> dict:
+    return _summarize(_free_rooms_by_type())
+
+
+async def abuild_free_rooms_summary() -> dict:
+    return _summarize([row async for row in _free_rooms_by_type()])
+
+
+def get_free_rooms_summary() -> dict:
+    timeout = settings.ROOMS_FREE_COUNT_CACHE_TTL
+    if not timeout:
+        return build_free_rooms_summary()
+    summary = cache.get(FREE_ROOMS_SUMMARY_CACHE_KEY)
+    if summary is None:
+        summary = build_free_rooms_summary()
+        cache.set(FREE_ROOMS_SUMMARY_CACHE_KEY, summary, timeout)
+    return summary
+
+
+async def aget_free_rooms_summary() -> dict:
+    timeout = settings.ROOMS_FREE_COUNT_CACHE_TTL
+    if not timeout:
+        return await abuild_free_rooms_summary()
+    summary = await cache.aget(FREE_ROOMS_SUMMARY_CACHE_KEY)
+    if summary is None:
+        summary = await abuild_free_rooms_summary()
+        await cache.aset(FREE_ROOMS_SUMMARY_CACHE_KEY, summary, timeout)
+    return summary
+
+
+def invalidate_free_rooms_summary() -> None:
+    cache.delete(FREE_ROOMS_SUMMARY_CACHE_KEY)
@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.response_cache import ROOMS_RESPONSES, invalidate_responses_on_commit
+from stays.models import Stay
+from stays.signals import stays_bulk_changed
+from .models import Room
+from .services import invalidate_free_rooms_summary
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+@receiver(post_save, sender=Stay)
+@receiver(post_delete, sender=Stay)
+@receiver(stays_bulk_changed, sender=Stay)
+def reset_free_rooms_summary(sender, **kwargs):
+    transaction.on_commit(invalidate_free_rooms_summary)
+
+
+# Список и карточка номера показывают занятость, поэтому их ответы зависят и от проживаний.
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+@receiver(post_save, sender=Stay)
+@receiver(post_delete, sender=Stay)
+@receiver(stays_bulk_changed, sender=Stay)
+def reset_room_responses(sender, **kwargs):
+    invalidate_responses_on_commit(ROOMS_RESPONSES)
@@ -1,3 +1,89 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from common.response_cache import RESPONSE_CACHE_ALIAS
+from common.testing import ResponseCacheTestMixin
+from .models import Room
+
+
+class AsyncReadErrorTests(TestCase):
+    """Ошибки async-чтения должны совпадать с синхронными: тот же код, тело и заголовки."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Room.objects.create(
+            number=101, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='1'
+        )
+
+    def assertSameError(self, sync_url: str, async_url: str, status_code: int):
+        sync_response = self.client.get(sync_url)
+        async_response = async_to_sync(self.async_client.get)(async_url)
+        self.assertEqual(sync_response.status_code, status_code)
+        self.assertEqual(async_response.status_code, status_code)
+        self.assertEqual(async_response.json(), sync_response.json())
+        self.assertIsInstance(async_response.json(), dict)
+
+    def test_invalid_cursor(self):
+        self.assertSameError('/api/rooms/?cursor=zzz', '/api/async/rooms/?cursor=zzz', 404)
+
+    def test_missing_room(self):
+        self.assertSameError('/api/rooms/999999/', '/api/async/rooms/999999/', 404)
+
+    def test_invalid_filter(self):
+        self.assertSameError('/api/rooms/?floor=abc', '/api/async/rooms/?floor=abc', 400)
+
+
+@override_settings(ALLOWED_HOSTS=['direct.example', 'proxy.example'])
+class ResponseCacheKeyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for number in (101, 102):
+            Room.objects.create(
+                number=number, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='1'
+            )
+
+    def setUp(self):
+        caches[RESPONSE_CACHE_ALIAS].clear()
+
+    def test_absolute_links_are_not_shared_between_hosts(self):
+        first = self.client.get('/api/rooms/', {'limit': 1}, HTTP_HOST='direct.example')
+        second = self.client.get('/api/rooms/', {'limit': 1}, HTTP_HOST='proxy.example')
+        self.assertEqual(second['X-Response-Cache'], 'miss')
+        self.assertTrue(first.json()['next'].startswith('http://direct.example/'))
+        self.assertTrue(second.json()['next'].startswith('http://proxy.example/'))
+
+        again = self.client.get('/api/rooms/', {'limit': 1}, HTTP_HOST='proxy.example')
+        self.assertEqual(again['X-Response-Cache'], 'hit')
+        self.assertEqual(again.json(), second.json())
+
+    def test_scheme_is_part_of_the_key(self):
+        self.client.get('/api/rooms/', {'limit': 1}, HTTP_HOST='direct.example')
+        secure = self.client.get('/api/rooms/', {'limit': 1}, HTTP_HOST='direct.example', secure=True)
+        self.assertEqual(secure['X-Response-Cache'], 'miss')
+        self.assertTrue(secure.json()['next'].startswith('https://direct.example/'))
+
+
+class RoomResponseInvalidationTests(ResponseCacheTestMixin, TestCase):
+    urls = ('/api/rooms/?limit=10', '/api/rooms/free-count/', '/api/reports/quarterly/?year=2024&quarter=1')
+
+    def setUp(self):
+        super().setUp()
+        self.room = Room.objects.create(
+            number=101, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='1'
+        )
+
+    def test_room_save(self):
+        def change():
+            self.room.phone_number = '2'
+            self.room.save()
+
+        self.assertInvalidatedBy(change, *self.urls)
+
+    def test_room_delete(self):
+        self.assertInvalidatedBy(self.room.delete, *self.urls)
+
+    def test_room_change_keeps_client_responses(self):
+        self.assertNotInvalidatedBy(lambda: self.room.save(), '/api/clients/?limit=10')
@@ -1,9 +1,14 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import RoomViewSet
+from .views import AsyncFreeRoomsCountView, AsyncRoomReadView, RoomViewSet
 
 router = DefaultRouter()
 router.register(r'rooms', RoomViewSet, basename='room')
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path('async/rooms/', AsyncRoomReadView.as_view(), name='room-list-async'),
+    path('async/rooms/<int:pk>/', AsyncRoomReadView.as_view(), name='room-detail-async'),
+    path('async/rooms/free-count/', AsyncFreeRoomsCountView.as_view(), name='room-free-count-async'),
+]
 
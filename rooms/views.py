@@ -1,22 +1,33 @@
-from collections import defaultdict
-
-from django.db.models import Q
+from django.views import View
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from common.aio import AsyncReadView, json_response
+from common.conditional import ConditionalGetMixin
+from common.response_cache import ROOMS_RESPONSES, CachedReadMixin, cache_response
 from common.utils import ensure_period
+from common.values import ValuesReadMixin
 from stays.models import Stay
+from .availability import find_available_rooms
 from .models import Room
-from .serializers import RoomSerializer, RoomStaySerializer
+from .serializers import RoomSerializer, RoomStaySerializer, RoomValuesSerializer
+from .services import aget_free_rooms_summary, get_free_rooms_summary
 
 
-class RoomViewSet(viewsets.ModelViewSet):
-    queryset = Room.objects.prefetch_related('stays')
+class RoomViewSet(CachedReadMixin, ConditionalGetMixin, ValuesReadMixin, viewsets.ModelViewSet):
+    queryset = Room.objects.with_occupancy()
     serializer_class = RoomSerializer
+    values_serializer_class = RoomValuesSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['room_type', 'floor', 'is_active']
+    pagination_ordering = ['number']
+    response_cache_namespaces = (ROOMS_RESPONSES,)
+
+    def get_etag_querysets(self, queryset):
+        # Занятость номера берётся из проживаний, поэтому их изменения тоже меняют ответ.
+        return [queryset, Stay.objects.filter(room__in=queryset.values('pk'))]
 
     @action(detail=True, methods=['get'])
     def clients(self, request, pk=None):
@@ -28,33 +39,32 @@ class RoomViewSet(viewsets.ModelViewSet):
         except ValueError as exc:
             return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        stays = Stay.objects.filter(room=room).filter(
-            Q(check_out__isnull=True) | Q(check_out__gte=start_date)
-        ).filter(check_in__lte=end_date)
-
-        serializer = RoomStaySerializer(stays, many=True)
+        serializer = RoomStaySerializer(room.stays.in_period(start_date, end_date), many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='free-count')
+    @cache_response(ROOMS_RESPONSES)
     def free_count(self, request):
-        data = defaultdict(int)
-        total_free = 0
-        rooms = Room.objects.filter(is_active=True).prefetch_related('stays')
-        for room in rooms:
-            occupied = room.stays.filter(status=Stay.Status.ACTIVE).count()
-            free_places = room.capacity - occupied
-            if free_places > 0:
-                data[room.room_type] += 1
-                total_free += 1
-        response = {
-            'total_free_rooms': total_free,
-            'by_type': [
-                {
-                    'room_type': room_type,
-                    'label': Room.RoomType(room_type).label if room_type in Room.RoomType.values else room_type,
-                    'count': count,
-                }
-                for room_type, count in data.items()
-            ],
-        }
-        return Response(response)
+        return Response(get_free_rooms_summary())
+
+    @action(detail=False, methods=['get'], url_path='available')
+    def available(self, request):
+        room_type = request.query_params.get('room_type')
+        try:
+            start_date, end_date = ensure_period(request.query_params.get('start'), request.query_params.get('end'))
+            if room_type and room_type not in Room.RoomType.values:
+                raise ValueError('Недопустимое значение room_type.')
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(find_available_rooms(start_date, end_date, room_type))
+
+
+class AsyncRoomReadView(AsyncReadView):
+    viewset_class = RoomViewSet
+
+
+class AsyncFreeRoomsCountView(View):
+    http_method_names = ['get', 'head', 'options']
+
+    async def get(self, request):
+        return json_response(await aget_free_rooms_summary())
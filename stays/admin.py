@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Stay
+from .models import RevenueEntry, Stay
 
 
 @admin.register(Stay)
@@ -8,3 +8,11 @@ class StayAdmin(admin.ModelAdmin):
     list_display = ('client', 'room', 'check_in', 'check_out', 'status', 'total_cost')
     list_filter = ('status', 'room__room_type')
     search_fields = ('client__last_name', 'room__number')
+
+
+@admin.register(RevenueEntry)
+class RevenueEntryAdmin(admin.ModelAdmin):
+    list_display = ('date', 'room', 'stay', 'amount', 'nights')
+    list_filter = ('room__floor',)
+    date_hierarchy = 'date'
+    raw_id_fields = ('stay', 'room')
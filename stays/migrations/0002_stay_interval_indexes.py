@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0001_initial'),
+        ('rooms', '0001_initial'),
+        ('stays', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='stay',
+            index=models.Index(fields=['room', 'check_in'], name='stay_room_check_in_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stay',
+            index=models.Index(fields=['room', 'check_out'], name='stay_room_check_out_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stay',
+            index=models.Index(condition=models.Q(('check_out__isnull', True)), fields=['room', 'check_in'], name='stay_open_room_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stay',
+            index=models.Index(fields=['status', 'check_out'], name='stay_status_check_out_idx'),
+        ),
+    ]
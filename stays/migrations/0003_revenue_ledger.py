@@ -0,0 +1,62 @@
+# Generated by Django 5.1.1 on 2026-10-18 14:07
+
+from datetime import timedelta
+from decimal import ROUND_DOWN, Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_revenue_ledger(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    Stay = apps.get_model('stays', 'Stay')
+    RevenueEntry = apps.get_model('stays', 'RevenueEntry')
+    completed = (
+        Stay.objects.using(alias)
+        .filter(status='completed', check_out__isnull=False)
+        .values_list('id', 'room_id', 'check_in', 'check_out', 'total_cost')
+        .iterator(chunk_size=2000)
+    )
+    batch = []
+    for stay_id, room_id, check_in, check_out, total_cost in completed:
+        nights = max((check_out - check_in).days, 1)
+        per_night = (total_cost / nights).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
+        for index in range(nights):
+            amount = per_night if index < nights - 1 else total_cost - per_night * (nights - 1)
+            batch.append(
+                RevenueEntry(stay_id=stay_id, room_id=room_id, date=check_in + timedelta(days=index), amount=amount)
+            )
+        if len(batch) >= 5000:
+            RevenueEntry.objects.using(alias).bulk_create(batch)
+            batch = []
+    RevenueEntry.objects.using(alias).bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0001_initial'),
+        ('stays', '0002_stay_interval_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevenueEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('nights', models.PositiveSmallIntegerField(default=1)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revenue_entries', to='rooms.room')),
+                ('stay', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revenue_entries', to='stays.stay')),
+            ],
+            options={
+                'verbose_name': 'Запись журнала выручки',
+                'verbose_name_plural': 'Журнал выручки',
+                'ordering': ['date', 'room'],
+                'indexes': [models.Index(fields=['date', 'room'], name='revenue_date_room_idx')],
+                'constraints': [models.UniqueConstraint(fields=('stay', 'date'), name='unique_revenue_entry_per_night')],
+            },
+        ),
+        migrations.RunPython(fill_revenue_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-18 14:58
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stays', '0003_revenue_ledger'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='stay',
+            name='stay_status_check_out_idx',
+        ),
+    ]
@@ -1,14 +1,23 @@
-from datetime import date
-from decimal import Decimal
+from datetime import date, timedelta
+from decimal import ROUND_DOWN, Decimal
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+
+from common.intervals import peak_concurrency
+
+# Поля, от которых зависят записи журнала выручки.
+REVENUE_FIELDS = frozenset({'room', 'room_id', 'check_in', 'check_out', 'status', 'total_cost'})
 
 
 class StayQuerySet(models.QuerySet):
     def active(self):
         return self.filter(status=Stay.Status.ACTIVE)
 
+    def in_period(self, start: date, end: date):
+        """Проживания, задевающие [start, end] включительно: выезд в день start тоже считается."""
+        return self.filter(check_in__lte=end).filter(models.Q(check_out__isnull=True) | models.Q(check_out__gte=start))
+
 
 class Stay(models.Model):
     class Status(models.TextChoices):
@@ -37,25 +46,53 @@ class Stay(models.Model):
                 name='unique_active_stay_per_client',
             )
         ]
+        indexes = [
+            models.Index(fields=['room', 'check_in'], name='stay_room_check_in_idx'),
+            models.Index(fields=['room', 'check_out'], name='stay_room_check_out_idx'),
+            models.Index(
+                fields=['room', 'check_in'],
+                condition=models.Q(check_out__isnull=True),
+                name='stay_open_room_idx',
+            ),
+        ]
 
     def __str__(self) -> str:
         return f'{self.client.full_name} — {self.room.number}'
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not REVENUE_FIELDS.intersection(update_fields):
+            return super().save(*args, **kwargs)
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if self.status == self.Status.COMPLETED or not adding:
+                RevenueEntry.objects.rewrite_for([self])
+
     def clean(self):
         if self.check_out and self.check_out <= self.check_in:
             raise ValidationError('Дата выезда должна быть позже даты заселения.')
         if self.room_id:
-            overlapping = self._count_overlapping_stays()
-            if overlapping >= self.room.capacity:
+            room = self._lock_room()
+            if self._peak_occupancy() >= room.capacity:
                 raise ValidationError('В выбранном номере нет свободных мест на указанные даты.')
 
-    def _count_overlapping_stays(self) -> int:
-        end_date = self.check_out or date.max
-        qs = Stay.objects.filter(room=self.room).exclude(pk=self.pk)
+    def _lock_room(self):
+        # Внутри транзакции блокируем строку номера, чтобы параллельные заселения проверялись по очереди.
+        if not transaction.get_connection().in_atomic_block:
+            return self.room
+        room_model = self._meta.get_field('room').related_model
+        return room_model.objects.select_for_update().get(pk=self.room_id)
+
+    def _overlapping_stays(self):
+        qs = Stay.objects.filter(room_id=self.room_id).exclude(pk=self.pk)
         qs = qs.filter(
             models.Q(check_out__isnull=True) | models.Q(check_out__gt=self.check_in)
-        ).filter(check_in__lt=end_date)
-        return qs.count()
+        ).filter(check_in__lt=self.check_out or date.max)
+        return qs.order_by('check_in').values_list('check_in', 'check_out')
+
+    def _peak_occupancy(self) -> int:
+        return peak_concurrency(self._overlapping_stays(), self.check_in, self.check_out or date.max)
 
     @property
     def nights(self) -> int:
@@ -71,3 +108,52 @@ class Stay(models.Model):
         nights = (checkout_date - self.check_in).days
         nights = max(nights, 1)
         self.total_cost = Decimal(nights) * self.room.daily_rate
+
+    def revenue_by_night(self) -> list[tuple[date, Decimal]]:
+        """Раскладывает стоимость закрытого проживания по ночам; остаток от округления — на последнюю ночь."""
+        if self.status != self.Status.COMPLETED or not self.check_out:
+            return []
+        nights = max(self.nights, 1)
+        per_night = (self.total_cost / nights).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
+        amounts = [per_night] * nights
+        amounts[-1] = self.total_cost - per_night * (nights - 1)
+        return [(self.check_in + timedelta(days=index), amount) for index, amount in enumerate(amounts)]
+
+
+class RevenueEntryQuerySet(models.QuerySet):
+    def between(self, start: date, end: date):
+        return self.filter(date__range=(start, end))
+
+    def build_for(self, stays):
+        for stay in stays:
+            for day, amount in stay.revenue_by_night():
+                yield RevenueEntry(stay_id=stay.pk, room_id=stay.room_id, date=day, amount=amount)
+
+    def rewrite_for(self, stays, batch_size: int | None = None) -> None:
+        stays = list(stays)
+        with transaction.atomic():
+            self.filter(stay_id__in=[stay.pk for stay in stays]).delete()
+            self.bulk_create(self.build_for(stays), batch_size=batch_size)
+
+
+class RevenueEntry(models.Model):
+    """Журнал выручки: доля стоимости проживания, приходящаяся на одну ночь."""
+
+    stay = models.ForeignKey(Stay, related_name='revenue_entries', on_delete=models.CASCADE)
+    room = models.ForeignKey('rooms.Room', related_name='revenue_entries', on_delete=models.CASCADE)
+    date = models.DateField()
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    nights = models.PositiveSmallIntegerField(default=1)
+
+    objects = RevenueEntryQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['date', 'room']
+        verbose_name = 'Запись журнала выручки'
+        verbose_name_plural = 'Журнал выручки'
+        constraints = [
+            models.UniqueConstraint(fields=['stay', 'date'], name='unique_revenue_entry_per_night'),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'room'], name='revenue_date_room_idx'),
+        ]
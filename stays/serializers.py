@@ -1,9 +1,16 @@
+from datetime import date
+
 from django.core.exceptions import ValidationError
-from rest_framework import serializers
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import exceptions, serializers, status
 
 from clients.models import Client
+from common.intervals import peak_concurrency
+from common.values import ValuesSerializer
 from rooms.models import Room
-from .models import Stay
+from .models import RevenueEntry, Stay
 
 
 class StaySerializer(serializers.ModelSerializer):
@@ -24,6 +31,137 @@ class StaySerializer(serializers.ModelSerializer):
         try:
             instance.clean()
         except ValidationError as exc:
-            raise serializers.ValidationError(exc.message_dict or exc.messages)
+            raise serializers.ValidationError(exc.message_dict if hasattr(exc, 'error_dict') else exc.messages)
         return attrs
 
+
+class StayValuesSerializer(ValuesSerializer):
+    model = Stay
+    fields = ('id', 'client', 'room', 'check_in', 'check_out', 'status', 'total_cost')
+    sources = {'client': 'client_id', 'room': 'room_id'}
+
+
+BULK_MAX_ITEMS = 500
+
+
+class BulkCheckInConflict(exceptions.APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Заселение не выполнено: у одного из клиентов уже появилось активное проживание. Повторите запрос.'
+    default_code = 'conflict'
+
+
+class BulkCheckInItemSerializer(serializers.Serializer):
+    client = serializers.IntegerField(min_value=1)
+    room = serializers.IntegerField(min_value=1)
+    check_in = serializers.DateField()
+    check_out = serializers.DateField(required=False, allow_null=True)
+
+
+class BulkCheckInSerializer(serializers.Serializer):
+    stays = BulkCheckInItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+    def validate_stays(self, items):
+        client_ids = {item['client'] for item in items}
+        room_ids = {item['room'] for item in items}
+        known_clients = set(Client.objects.filter(id__in=client_ids).values_list('id', flat=True))
+        busy_clients = set(
+            Stay.objects.active().filter(client_id__in=client_ids).values_list('client_id', flat=True)
+        )
+        rooms = Room.objects.select_for_update().in_bulk(room_ids)
+
+        window_start = min(item['check_in'] for item in items)
+        window_end = max((item.get('check_out') or date.max) for item in items)
+        existing = {room_id: [] for room_id in room_ids}
+        overlapping_qs = Stay.objects.filter(room_id__in=room_ids, check_in__lt=window_end).filter(
+            Q(check_out__isnull=True) | Q(check_out__gt=window_start)
+        )
+        for room_id, check_in, check_out in overlapping_qs.values_list('room_id', 'check_in', 'check_out'):
+            existing[room_id].append((check_in, check_out))
+
+        errors = []
+        seen_clients = set()
+        for item in items:
+            item_errors = {}
+            check_in, check_out = item['check_in'], item.get('check_out')
+            room = rooms.get(item['room'])
+            if item['client'] not in known_clients:
+                item_errors['client'] = ['Клиент не найден.']
+            elif item['client'] in busy_clients or item['client'] in seen_clients:
+                item_errors['client'] = ['У клиента уже есть активное проживание.']
+            if room is None:
+                item_errors['room'] = ['Номер не найден.']
+            if check_out and check_out <= check_in:
+                item_errors['check_out'] = ['Дата выезда должна быть позже даты заселения.']
+            if not item_errors:
+                if peak_concurrency(existing[room.id], check_in, check_out or date.max) >= room.capacity:
+                    item_errors['room'] = ['В выбранном номере нет свободных мест на указанные даты.']
+            if not item_errors:
+                existing[room.id].append((check_in, check_out))
+                seen_clients.add(item['client'])
+            errors.append(item_errors)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    def create(self, validated_data):
+        stays = [
+            Stay(
+                client_id=item['client'],
+                room_id=item['room'],
+                check_in=item['check_in'],
+                check_out=item.get('check_out'),
+                status=Stay.Status.ACTIVE,
+            )
+            for item in validated_data['stays']
+        ]
+        # Проверка занятости клиентов не блокирует их строки: параллельное заселение того же клиента
+        # между проверкой и вставкой ловит только ограничение unique_active_stay_per_client.
+        try:
+            with transaction.atomic():
+                return Stay.objects.bulk_create(stays)
+        except IntegrityError:
+            raise BulkCheckInConflict()
+
+
+class BulkCheckoutItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+    check_out = serializers.DateField()
+
+
+class BulkCheckoutSerializer(serializers.Serializer):
+    stays = BulkCheckoutItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+    def validate_stays(self, items):
+        stays = Stay.objects.select_for_update().select_related('room').in_bulk({item['id'] for item in items})
+        errors = []
+        seen = set()
+        for item in items:
+            stay = stays.get(item['id'])
+            if stay is None:
+                errors.append({'id': ['Проживание не найдено.']})
+            elif item['id'] in seen:
+                errors.append({'id': ['Проживание указано несколько раз.']})
+            elif stay.status != Stay.Status.ACTIVE:
+                errors.append({'id': ['Проживание уже закрыто.']})
+            elif item['check_out'] <= stay.check_in:
+                errors.append({'check_out': ['Дата выезда должна быть позже заселения.']})
+            else:
+                errors.append({})
+            seen.add(item['id'])
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        self._stays = stays
+        return items
+
+    def create(self, validated_data):
+        now = timezone.now()
+        stays = []
+        for item in validated_data['stays']:
+            stay = self._stays[item['id']]
+            stay.close(item['check_out'])
+            stay.updated_at = now
+            stays.append(stay)
+        Stay.objects.bulk_update(stays, ['check_out', 'status', 'total_cost', 'updated_at'])
+        RevenueEntry.objects.rewrite_for(stays)
+        return stays
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from common.response_cache import STAYS_RESPONSES, invalidate_responses_on_commit
+from .models import Stay
+
+# Отправляется после массовых операций (bulk_create/bulk_update), которые не вызывают post_save.
+# Аргумент stays — список затронутых проживаний.
+stays_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Stay)
+@receiver(post_delete, sender=Stay)
+@receiver(stays_bulk_changed, sender=Stay)
+def reset_stay_responses(sender, **kwargs):
+    invalidate_responses_on_commit(STAYS_RESPONSES)
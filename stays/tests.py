@@ -1,3 +1,200 @@
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from clients.models import Client
+from common.testing import ResponseCacheTestMixin
+from reports.services import _income_per_room
+from rooms.availability import room_stays_between
+from rooms.models import Room
+from .models import Stay
+from .serializers import BulkCheckInSerializer
+from .signals import stays_bulk_changed
+
+
+@unittest.skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'Планы проверяются для SQLite и PostgreSQL.')
+class StayIntervalIndexPlanTests(TestCase):
+    """Запросы пересечения проживаний по номеру должны идти по составным индексам, а не по индексу FK.
+
+    Запросы строятся тем же кодом, что и в приложении, а не копиями фильтров.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.room = Room.objects.create(
+            number=101, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='1'
+        )
+        other = Room.objects.create(
+            number=102, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='2'
+        )
+        start = date(2024, 1, 1)
+        stays = []
+        for index in range(40):
+            client = Client.objects.create(
+                passport_number=f'P{index}', last_name=f'L{index}', first_name=f'F{index}', city='Москва'
+            )
+            check_in = start + timedelta(days=index * 3)
+            stays.append(Stay(
+                client=client,
+                room=cls.room if index % 2 else other,
+                check_in=check_in,
+                check_out=check_in + timedelta(days=2) if index < 39 else None,
+                status=Stay.Status.COMPLETED if index < 39 else Stay.Status.ACTIVE,
+            ))
+        Stay.objects.bulk_create(stays)
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # На нескольких десятках строк PostgreSQL честно выберет seq scan; проверяем, что индекс пригоден.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_capacity_check_uses_room_check_in_index(self):
+        for check_out in (date(2024, 3, 1), None):
+            with self.subTest(check_out=check_out):
+                stay = Stay(room=self.room, check_in=date(2024, 2, 1), check_out=check_out)
+                self.assertUsesIndex(stay._overlapping_stays(), 'stay_room_check_in_idx')
+
+    def test_availability_uses_room_check_in_index(self):
+        rooms = Room.objects.filter(is_active=True)
+        self.assertUsesIndex(room_stays_between(rooms, date(2024, 2, 1), date(2024, 2, 5)), 'stay_room_check_in_idx')
+
+    def test_room_clients_use_room_check_in_index(self):
+        # Как в RoomViewSet.clients.
+        self.assertUsesIndex(self.room.stays.in_period(date(2024, 2, 1), date(2024, 3, 1)), 'stay_room_check_in_idx')
+
+    def test_income_uses_revenue_date_index(self):
+        # Выручка за период (compute_income, квартальный отчёт) читается из журнала, а не из проживаний.
+        self.assertUsesIndex(_income_per_room(date(2024, 2, 1), date(2024, 3, 1)), 'revenue_date_room_idx')
+
+
+class StayPeakOccupancyTests(TestCase):
+    """Проверка свободных мест при заселении (Stay.clean → _peak_occupancy) на двухместном номере."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.room = Room.objects.create(
+            number=101, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='1'
+        )
+        cls.guests = [
+            Client.objects.create(passport_number=f'P{index}', last_name=f'L{index}', first_name='F', city='Тверь')
+            for index in range(4)
+        ]
+
+    def stay(self, guest, check_in, check_out=None):
+        status = Stay.Status.COMPLETED if check_out else Stay.Status.ACTIVE
+        return Stay(client=self.guests[guest], room=self.room, check_in=check_in, check_out=check_out, status=status)
+
+    def book(self, *args):
+        stay = self.stay(*args)
+        stay.full_clean()
+        stay.save()
+        return stay
+
+    def test_back_to_back_stays_on_same_day_fit(self):
+        self.book(0, date(2024, 1, 1), date(2024, 1, 10))
+        self.book(1, date(2024, 1, 1), date(2024, 1, 10))
+        # Номер полон до 10-го, но в день выезда уже можно заселить двоих.
+        second = self.stay(2, date(2024, 1, 10), date(2024, 1, 12))
+        self.assertEqual(second._peak_occupancy(), 0)
+        second.full_clean()
+
+    def test_full_room_rejects_overlap(self):
+        self.book(0, date(2024, 1, 1), date(2024, 1, 10))
+        self.book(1, date(2024, 1, 5), date(2024, 1, 15))
+        third = self.stay(2, date(2024, 1, 9), date(2024, 1, 11))
+        self.assertEqual(third._peak_occupancy(), 2)
+        with self.assertRaises(ValidationError):
+            third.full_clean()
+
+    def test_counts_peak_not_every_overlapping_stay(self):
+        # Два проживания пересекаются с новым, но не друг с другом: одно место свободно весь период.
+        self.book(0, date(2024, 1, 1), date(2024, 1, 5))
+        self.book(1, date(2024, 1, 5), date(2024, 1, 10))
+        third = self.stay(2, date(2024, 1, 3), date(2024, 1, 8))
+        self.assertEqual(third._peak_occupancy(), 1)
+        third.full_clean()
+
+    def test_open_stay_occupies_place_indefinitely(self):
+        self.book(0, date(2024, 1, 1))
+        self.book(1, date(2024, 1, 1), date(2024, 1, 10))
+        later = self.stay(2, date(2025, 6, 1), date(2025, 6, 3))
+        self.assertEqual(later._peak_occupancy(), 1)
+        overlapping = self.stay(2, date(2024, 1, 5), date(2024, 1, 6))
+        self.assertEqual(overlapping._peak_occupancy(), 2)
+
+    def test_new_open_stay_sees_future_bookings(self):
+        self.book(0, date(2024, 1, 1), date(2024, 1, 3))
+        self.book(1, date(2024, 3, 1), date(2024, 3, 5))
+        self.book(2, date(2024, 3, 2), date(2024, 3, 4))
+        self.assertEqual(self.stay(3, date(2024, 2, 1))._peak_occupancy(), 2)
+
+    def test_edited_stay_does_not_count_itself(self):
+        stay = self.book(0, date(2024, 1, 1), date(2024, 1, 10))
+        self.book(1, date(2024, 1, 1), date(2024, 1, 10))
+        stay.check_out = date(2024, 1, 12)
+        self.assertEqual(stay._peak_occupancy(), 1)
+        stay.full_clean()
+
+
+class BulkCheckInConflictTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.room = Room.objects.create(
+            number=101, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='1'
+        )
+        cls.guest = Client.objects.create(passport_number='P1', last_name='Иванов', first_name='Иван', city='Тверь')
+
+    def test_concurrent_check_in_returns_conflict(self):
+        payload = {'stays': [{'client': self.guest.pk, 'room': self.room.pk, 'check_in': '2024-01-10'}]}
+        original = BulkCheckInSerializer.validate_stays
+
+        def validate_then_race(serializer, items):
+            items = original(serializer, items)
+            # Параллельный запрос успел заселить того же клиента после проверки.
+            Stay.objects.create(client=self.guest, room=self.room, check_in=date(2024, 1, 9))
+            return items
+
+        with mock.patch.object(BulkCheckInSerializer, 'validate_stays', validate_then_race):
+            response = self.client.post('/api/stays/bulk-check-in/', payload, content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('detail', response.json())
+        self.assertFalse(Stay.objects.filter(check_in=date(2024, 1, 10)).exists())
+
+
+class StayResponseInvalidationTests(ResponseCacheTestMixin, TestCase):
+    urls = ('/api/stays/?limit=10', '/api/rooms/?limit=10', '/api/reports/quarterly/?year=2024&quarter=1')
+
+    def setUp(self):
+        super().setUp()
+        self.room = Room.objects.create(
+            number=101, floor=1, room_type='double', capacity=2, daily_rate=Decimal('1000'), phone_number='1'
+        )
+        self.guest = Client.objects.create(passport_number='P1', last_name='Иванов', first_name='Иван', city='Тверь')
+
+    def create_stay(self):
+        return Stay.objects.create(client=self.guest, room=self.room, check_in=date(2024, 1, 10))
+
+    def test_stay_save(self):
+        self.assertInvalidatedBy(self.create_stay, *self.urls)
+
+    def test_stay_delete(self):
+        stay = self.create_stay()
+        self.assertInvalidatedBy(stay.delete, *self.urls)
+
+    def test_bulk_change(self):
+        # bulk_create не шлёт post_save: сброс держится только на stays_bulk_changed.
+        def change():
+            stays = Stay.objects.bulk_create([Stay(client=self.guest, room=self.room, check_in=date(2024, 1, 10))])
+            stays_bulk_changed.send(sender=Stay, stays=stays)
+
+        self.assertInvalidatedBy(change, *self.urls)
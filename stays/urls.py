@@ -1,9 +1,13 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import StayViewSet
+from .views import AsyncStayReadView, StayViewSet
 
 router = DefaultRouter()
 router.register(r'stays', StayViewSet, basename='stay')
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path('async/stays/', AsyncStayReadView.as_view(), name='stay-list-async'),
+    path('async/stays/<int:pk>/', AsyncStayReadView.as_view(), name='stay-detail-async'),
+]
 
@@ -1,18 +1,29 @@
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from common.aio import AsyncReadView
+from common.conditional import ConditionalGetMixin
+from common.exports import EXPORT_CHUNK_SIZE, parse_export_format, streaming_export
+from common.response_cache import ROOMS_RESPONSES, STAYS_RESPONSES, CachedReadMixin
 from common.utils import parse_date_param
+from common.values import ValuesReadMixin
 from .models import Stay
-from .serializers import StaySerializer
+from .serializers import BulkCheckInSerializer, BulkCheckoutSerializer, StaySerializer, StayValuesSerializer
+from .signals import stays_bulk_changed
 
 
-class StayViewSet(viewsets.ModelViewSet):
+class StayViewSet(CachedReadMixin, ConditionalGetMixin, ValuesReadMixin, viewsets.ModelViewSet):
     queryset = Stay.objects.select_related('client', 'room')
     serializer_class = StaySerializer
+    values_serializer_class = StayValuesSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['client', 'room', 'status']
+    pagination_ordering = ['-check_in', 'id']
+    # Фильтр room_number зависит от номеров комнат.
+    response_cache_namespaces = (STAYS_RESPONSES, ROOMS_RESPONSES)
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -21,10 +32,33 @@ class StayViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(room__number=room_number)
         return queryset
 
+    EXPORT_FIELDS = ['id', 'client_id', 'room_id', 'room__number', 'check_in', 'check_out', 'status', 'total_cost']
+    EXPORT_HEADER = ['id', 'client', 'room', 'room_number', 'check_in', 'check_out', 'status', 'total_cost']
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        try:
+            export_format = parse_export_format(request.query_params.get('export_format'))
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .order_by(*self.pagination_ordering)
+            .values_list(*self.EXPORT_FIELDS)
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        return streaming_export(self.EXPORT_HEADER, rows, export_format, 'stays')
+
+    @transaction.atomic
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
     def perform_create(self, serializer):
-        instance = serializer.save()
-        instance.status = Stay.Status.ACTIVE
-        instance.save()
+        serializer.save(status=Stay.Status.ACTIVE)
 
     @action(detail=True, methods=['post'], url_path='checkout')
     def checkout(self, request, pk=None):
@@ -40,3 +74,22 @@ class StayViewSet(viewsets.ModelViewSet):
         stay.close(checkout_date)
         stay.save()
         return Response(self.get_serializer(stay).data)
+
+    @action(detail=False, methods=['post'], url_path='bulk-check-in')
+    def bulk_check_in(self, request):
+        return self._bulk_write(BulkCheckInSerializer(data=request.data), status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='bulk-checkout')
+    def bulk_checkout(self, request):
+        return self._bulk_write(BulkCheckoutSerializer(data=request.data), status.HTTP_200_OK)
+
+    def _bulk_write(self, serializer, response_status):
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            stays = serializer.save()
+            transaction.on_commit(lambda: stays_bulk_changed.send(sender=Stay, stays=stays))
+        return Response(StaySerializer(stays, many=True).data, status=response_status)
+
+
+class AsyncStayReadView(AsyncReadView):
+    viewset_class = StayViewSet